@@ -0,0 +1,198 @@
+import json
+import os
+import threading
+import time
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+except ImportError:
+    pa = None
+
+
+class AlmacenCompartido:
+    """
+    Almacén de solo lectura de la tabla maestra en archivos Arrow IPC mapeados en memoria.
+
+    Un proceso publica la tabla maestra en un archivo Arrow IPC sin compresión y los
+    demás (otras sesiones, otros procesos de Streamlit, procesos trabajadores) la abren
+    con pa.memory_map. Las columnas se exponen como pd.ArrowDtype apuntando directamente
+    a las páginas del archivo, así que abrirla no analiza ni copia los datos y el sistema
+    operativo comparte esas páginas entre todos los procesos.
+
+    Cada versión se escribe en un archivo propio cuyo nombre incluye la clave de los datos;
+    la publicación es atómica: primero se escribe un archivo temporal que se renombra, y
+    luego se reemplaza el puntero JSON que indica la versión vigente. Quien abre el
+    almacén ve siempre una versión completa, y las versiones anteriores siguen siendo
+    válidas para quien ya las tiene abiertas.
+
+    Atributos
+    ----------
+    directorio : str
+        Carpeta del almacén.
+
+    Métodos
+    -------
+    publicar(df, clave, metadatos=None, nombre="snies")
+        Escribe una nueva versión de la tabla y la marca como vigente.
+    leer_puntero(nombre="snies")
+        Devuelve los metadatos de la versión vigente.
+    abrir(nombre="snies")
+        Abre la versión vigente sin copiar los datos.
+    purgar(nombre="snies", conservar=1)
+        Elimina las versiones anteriores.
+    """
+
+    EXTENSION = ".arrow"
+
+    # Tablas abiertas en este proceso: {ruta: DataFrame}; todas las sesiones reutilizan la misma
+    _abiertas = {}
+    _lock = threading.Lock()
+
+    def __init__(self, directorio="../docs/compartido"):
+        """
+        Inicializa el almacén y crea su directorio si no existe.
+
+        Parámetros
+        ----------
+        directorio : str, opcional
+            Carpeta del almacén (por defecto es "../docs/compartido").
+
+        Lanza
+        -----
+        ImportError
+            Si pyarrow no está instalado.
+        """
+        if pa is None:
+            raise ImportError("El almacén compartido requiere pyarrow.")
+        self.directorio = directorio
+        os.makedirs(self.directorio, exist_ok=True)
+
+    def _ruta_puntero(self, nombre):
+        return os.path.join(self.directorio, nombre + ".json")
+
+    def _ruta_datos(self, nombre, clave):
+        return os.path.join(self.directorio, f"{nombre}-{clave[:16]}{self.EXTENSION}")
+
+    @staticmethod
+    def _escribir_atomico(ruta, escribir):
+        ruta_temporal = f"{ruta}.{os.getpid()}.tmp"
+        try:
+            escribir(ruta_temporal)
+            os.replace(ruta_temporal, ruta)
+        finally:
+            if os.path.exists(ruta_temporal):
+                os.remove(ruta_temporal)
+
+    def publicar(self, df, clave, metadatos=None, nombre="snies"):
+        """
+        Escribe una nueva versión de la tabla y la marca como vigente.
+
+        Si ya existe el archivo de esa clave (por ejemplo, porque otro proceso publicó los
+        mismos datos) no se vuelve a escribir.
+
+        Parámetros
+        ----------
+        df : DataFrame
+            Tabla a publicar.
+        clave : str
+            Hash que identifica el contenido (forma parte del nombre del archivo).
+        metadatos : dict, opcional
+            Datos adicionales serializables en JSON que se guardan en el puntero.
+        nombre : str, opcional
+            Nombre de la tabla en el almacén (por defecto es "snies").
+
+        Devuelve
+        -------
+        str
+            Ruta del archivo publicado.
+        """
+        ruta = self._ruta_datos(nombre, clave)
+        if not os.path.exists(ruta):
+            tabla = pa.Table.from_pandas(df, preserve_index=False)
+
+            def escribir_tabla(destino):
+                with pa.OSFile(destino, "wb") as archivo, ipc.new_file(archivo, tabla.schema) as escritor:
+                    escritor.write_table(tabla)
+
+            self._escribir_atomico(ruta, escribir_tabla)
+
+        puntero = {
+            "archivo": os.path.basename(ruta),
+            "clave": clave,
+            "filas": len(df),
+            "publicado": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "metadatos": metadatos or {},
+        }
+
+        def escribir_puntero(destino):
+            with open(destino, "w", encoding="utf-8") as archivo:
+                json.dump(puntero, archivo, ensure_ascii=False, indent=2)
+
+        self._escribir_atomico(self._ruta_puntero(nombre), escribir_puntero)
+        return ruta
+
+    def leer_puntero(self, nombre="snies"):
+        """
+        Devuelve los metadatos de la versión vigente, o None si no hay ninguna.
+        """
+        try:
+            with open(self._ruta_puntero(nombre), encoding="utf-8") as archivo:
+                return json.load(archivo)
+        except (OSError, ValueError):
+            return None
+
+    def abrir(self, nombre="snies"):
+        """
+        Abre la versión vigente de la tabla sin copiar los datos.
+
+        Devuelve
+        -------
+        tuple
+            (DataFrame con columnas pd.ArrowDtype respaldadas por el archivo mapeado,
+            puntero con los metadatos de la versión), o (None, None) si no hay ninguna.
+        """
+        puntero = self.leer_puntero(nombre)
+        if puntero is None:
+            return None, None
+        ruta = os.path.join(self.directorio, puntero["archivo"])
+        with self._lock:
+            df = self._abiertas.get(ruta)
+            if df is None:
+                if not os.path.exists(ruta):
+                    return None, None
+                tabla = ipc.open_file(pa.memory_map(ruta, "r")).read_all()
+                df = tabla.to_pandas(types_mapper=pd.ArrowDtype)
+                self._abiertas[ruta] = df
+        return df, puntero
+
+    def purgar(self, nombre="snies", conservar=1):
+        """
+        Elimina las versiones anteriores de una tabla, salvo las conservar más recientes.
+
+        Los archivos que aún están mapeados por otro proceso pueden no poder eliminarse en
+        algunos sistemas operativos; en ese caso se omiten.
+
+        Devuelve
+        -------
+        int
+            Número de archivos eliminados.
+        """
+        puntero = self.leer_puntero(nombre)
+        vigente = puntero["archivo"] if puntero else None
+        versiones = sorted(
+            (entrada for entrada in os.scandir(self.directorio)
+             if entrada.name.startswith(nombre + "-") and entrada.name.endswith(self.EXTENSION)
+             and entrada.name != vigente),
+            key=lambda entrada: entrada.stat().st_mtime, reverse=True)
+        eliminados = 0
+        for entrada in versiones[max(conservar - 1, 0):]:
+            try:
+                os.remove(entrada.path)
+                eliminados += 1
+            except OSError:
+                continue
+            with self._lock:
+                self._abiertas.pop(os.path.join(self.directorio, entrada.name), None)
+        return eliminados
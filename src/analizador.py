@@ -1,22 +1,56 @@
+import numpy as np
 import pandas as pd
+from cubo_agregado import CuboAgregado
+from motor_sql import MotorSQL
+from instrumentacion import Instrumentador
 
 class Analizador:
     """
-Clase para manejar excepciones y registrar errores en un archivo de log.
-Atributos:
-    log_path (str): Ruta del archivo de log donde se registrarán los errores.
-Metodos:
-    manejar_errores(func):
-        Decorador para manejar errores en funciones y registrar los errores en el log.
-    manejar_error(error):
-        Maneja un error específico, registrándolo en el log y mostrando un mensaje de error.
-    validar_entrada_usuario(entrada, tipo_dato):
-        Valida que la entrada del usuario sea del tipo de dato esperado.
-    registrar_error(tipo_error, detalles):
-        Registra un error en el archivo de log con el tipo de error y los detalles proporcionados.
-    mostrar_error_usuario(mensaje):
-        Muestra un mensaje de advertencia al usuario.
-"""
+    Calcula las estadísticas SNIES de los programas seleccionados y sus indicadores derivados.
+
+    Las métricas de conteo se suman por programa (codigo_snies) y año dentro de rango_anios,
+    completando con cero los años sin datos. Los datos pueden venir de un diccionario de
+    DataFrames por archivo, de la tabla maestra de GestorDatos, de su cubo de totales
+    (CuboAgregado) o de su motor SQL (MotorSQL), en cuyo caso el filtrado y la suma los
+    hace el motor.
+
+    Atributos
+    ----------
+    rango_anios : tuple
+        Años (inicio, fin) incluidos en el cálculo.
+    programas_seleccionados : DataFrame
+        Programas a analizar, uno por codigo_snies.
+    resultados_estadisticas : DataFrame
+        Resultado del último cálculo de estadísticas.
+    resultados_metricas : DataFrame
+        Resultado del último cálculo de métricas derivadas.
+
+    Métodos
+    -------
+    establecer_programas_seleccionados(programas_datos)
+        Define los programas a analizar, sin duplicados por código SNIES.
+    calcular_estadisticas(dataframes, incluir_codigo=False, progreso=None, tamano_lote=1000)
+        Suma las métricas por programa y año.
+    obtener_estadisticas()
+        Devuelve el resultado del último cálculo.
+    calcular_metricas_derivadas(estadisticas=None, ventana=3, division_cero=np.nan)
+        Agrega tasas, crecimiento interanual y medias móviles.
+    calcular_cagr(estadisticas=None, division_cero=np.nan)
+        Calcula la tasa de crecimiento anual compuesta de cada métrica por programa.
+    """
+    # Columnas de conteo que se suman por programa y año
+    METRICAS = ["inscritos", "admitidos", "nuevos_matriculados", "total_matriculados", "graduados"]
+
+    # Columnas canónicas que el análisis necesita cargar (ver GestorDatos.require_columns)
+    COLUMNAS_REQUERIDAS = ["codigo_snies", "programa_academico", "anio", "semestre"] + METRICAS
+
+    # Tasas derivadas: nombre -> (numerador, denominador)
+    TASAS = {
+        "tasa_admision": ("admitidos", "inscritos"),
+        "tasa_absorcion": ("nuevos_matriculados", "admitidos"),
+        "tasa_graduacion": ("graduados", "total_matriculados"),
+    }
+
     def __init__(self, rango_anios=(2020, 2023)):
         """
         Constructs all the necessary attributes for the Analizador object.
@@ -24,44 +58,139 @@ Metodos:
         self.rango_anios = rango_anios
         self.programas_seleccionados = []
         self.resultados_estadisticas = pd.DataFrame()
+        self.resultados_metricas = pd.DataFrame()
 
     def establecer_programas_seleccionados(self, programas_datos):
 
+        # Un programa aparece en muchas filas (años, sexos, archivos); se conserva una por código
+        if "codigo_snies" in programas_datos.columns:
+            programas_datos = programas_datos.drop_duplicates("codigo_snies")
         self.programas_seleccionados = programas_datos
 
-    def calcular_estadisticas(self, dataframes):
+    @Instrumentador.medir("estadisticas")
+    def calcular_estadisticas(self, dataframes, incluir_codigo=False, progreso=None, tamano_lote=1000):
 
         """
         Calcula estadísticas para los programas seleccionados en el rango de años especificado.
 
+        Todos los códigos SNIES seleccionados se procesan en un solo paso: cada DataFrame se
+        filtra una vez con isin, las filas resultantes se agrupan por (codigo_snies, anio) y
+        los años sin datos se completan con cero. Si se indica progreso, los códigos se
+        procesan por lotes y progreso se llama después de cada lote.
+
         Parámetros
         ----------
-        dataframes : dict
-            Un diccionario donde las claves son identificadores de programas y los valores son DataFrames con datos de los programas.
-
-        """
-        estadisticas = []
-        for _, programa in self.programas_seleccionados.iterrows():  # Itera sobre las filas de programas seleccionados
-            for _, datos in dataframes.items():
-                if "anio" in datos.columns:
-                    datos["anio"] = pd.to_numeric(datos["anio"], errors="coerce").fillna(0).astype(int)
-
-                datos_programa = datos[(datos["codigo_snies"] == programa["codigo_snies"]) &
-                                       (datos["anio"].between(*self.rango_anios))]
-                for anio in range(self.rango_anios[0], self.rango_anios[1] + 1):
-                    datos_anio = datos_programa[datos_programa["anio"] == anio]
-                    estadisticas.append({
-                        "programa": programa["programa_academico"],
-                        "anio": anio,
-                        "inscritos": datos_anio["inscritos"].sum() if "inscritos" in datos_anio else 0,
-                        "admitidos": datos_anio["admitidos"].sum() if "admitidos" in datos_anio else 0,
-                        "nuevos_matriculados": datos_anio[
-                            "nuevos_matriculados"].sum() if "nuevos_matriculados" in datos_anio else 0,
-                        "total_matriculados": datos_anio[
-                            "total_matriculados"].sum() if "total_matriculados" in datos_anio else 0,
-                        "graduados": datos_anio["graduados"].sum() if "graduados" in datos_anio else 0,
-                    })
-        self.resultados_estadisticas = pd.DataFrame(estadisticas)
+        dataframes : dict, DataFrame, CuboAgregado or MotorSQL
+            Un diccionario donde las claves son identificadores de programas y los valores son DataFrames con datos de los programas,
+            la tabla maestra de GestorDatos, su cubo de totales precalculados (ver GestorDatos.get_cube) o
+            su motor SQL (ver GestorDatos.get_sql_engine), en cuyo caso el filtrado y la suma los hace el motor.
+        incluir_codigo : bool, opcional
+            Si es True, la salida incluye además la columna codigo_snies (por defecto es False).
+        progreso : callable, opcional
+            Función progreso(completados, total) que recibe el número de programas procesados.
+            Puede lanzar una excepción (por ejemplo, TareaCancelada) para interrumpir el cálculo.
+        tamano_lote : int, opcional
+            Programas por lote cuando se indica progreso (por defecto es 1000).
+
+        Devuelve
+        -------
+        DataFrame
+            Una fila por programa y año con las columnas programa, anio y las métricas.
+        """
+        columnas_salida = (["codigo_snies"] if incluir_codigo else []) + ["programa", "anio"] + self.METRICAS
+        if len(self.programas_seleccionados) == 0:
+            self.resultados_estadisticas = pd.DataFrame(columns=columnas_salida)
+            return self.resultados_estadisticas
+
+        if isinstance(dataframes, pd.DataFrame):
+            dataframes = {"tabla_maestra": dataframes}
+
+        programas = self.programas_seleccionados.drop_duplicates("codigo_snies")
+        codigos = pd.Index(programas["codigo_snies"])
+
+        if progreso is None:
+            sumas = self._sumar(dataframes, codigos)
+        else:
+            partes = []
+            progreso(0, len(codigos))
+            for inicio in range(0, len(codigos), tamano_lote):
+                partes.append(self._sumar(dataframes, codigos[inicio:inicio + tamano_lote]))
+                progreso(min(inicio + tamano_lote, len(codigos)), len(codigos))
+            sumas = pd.concat(partes)
+        return self._completar_resultados(sumas, programas, codigos, columnas_salida)
+
+    def _sumar(self, dataframes, codigos):
+        """
+        Suma las métricas de los códigos indicados en el rango de años.
+
+        Devuelve
+        -------
+        DataFrame
+            Métricas sumadas con índice (codigo_snies, anio), solo de las combinaciones con datos.
+        """
+        anio_inicio, anio_fin = self.rango_anios
+
+        if isinstance(dataframes, CuboAgregado):
+            hechos = dataframes.consultar("programa", claves=codigos, anios=range(anio_inicio, anio_fin + 1))
+            return hechos.set_index(["codigo_snies", "anio"])[self.METRICAS]
+
+        if isinstance(dataframes, MotorSQL):
+            tabla = MotorSQL.TABLA_DATOS
+            metricas = [col for col in self.METRICAS if col in dataframes.columnas(tabla)]
+            filtros = {"codigo_snies": codigos, "anio": (anio_inicio, anio_fin)}
+            sumas = dataframes.reporte_agrupado(tabla, ["codigo_snies", "anio"], metricas, filtros=filtros)
+            sumas = sumas.astype({"codigo_snies": codigos.dtype, "anio": "int64"})
+            return sumas.set_index(["codigo_snies", "anio"]).reindex(columns=self.METRICAS, fill_value=0)
+
+        partes = []
+        for datos in dataframes.values():
+            if "codigo_snies" not in datos.columns or "anio" not in datos.columns:
+                continue
+            anios = pd.to_numeric(datos["anio"], errors="coerce")
+            mascara = datos["codigo_snies"].isin(codigos) & anios.between(anio_inicio, anio_fin)
+            if not mascara.any():
+                continue
+            metricas = [col for col in self.METRICAS if col in datos.columns]
+            parte = datos.loc[mascara, ["codigo_snies"] + metricas]
+            parte = parte.assign(anio=anios[mascara].astype(int))
+            partes.append(parte)
+
+        if partes:
+            combinados = pd.concat(partes, ignore_index=True)
+        else:
+            combinados = pd.DataFrame(columns=["codigo_snies", "anio"])
+        for metrica in self.METRICAS:
+            if metrica in combinados.columns:
+                combinados[metrica] = pd.to_numeric(combinados[metrica], errors="coerce")
+            else:
+                combinados[metrica] = 0
+
+        return combinados.groupby(["codigo_snies", "anio"])[self.METRICAS].sum()
+
+    def _completar_resultados(self, sumas, programas, codigos, columnas_salida):
+        """
+        Completa con cero los años sin datos y agrega el nombre de cada programa.
+
+        Parámetros
+        ----------
+        sumas : DataFrame
+            Métricas sumadas con índice (codigo_snies, anio).
+        programas : DataFrame
+            Programas seleccionados, uno por codigo_snies.
+        codigos : Index
+            Códigos SNIES seleccionados, en el orden de la salida.
+        columnas_salida : list
+            Columnas del resultado.
+        """
+        anio_inicio, anio_fin = self.rango_anios
+        indice = pd.MultiIndex.from_product([codigos, range(anio_inicio, anio_fin + 1)],
+                                            names=["codigo_snies", "anio"])
+        sumas = sumas.reindex(indice, fill_value=0).fillna(0).astype("int64").reset_index()
+        sumas["anio"] = sumas["anio"].astype(int)
+
+        nombres = programas.set_index("codigo_snies")["programa_academico"]
+        sumas["programa"] = sumas["codigo_snies"].map(nombres)
+        self.resultados_estadisticas = sumas[columnas_salida]
         return self.resultados_estadisticas
 
     def obtener_estadisticas(self):
@@ -70,3 +199,130 @@ Metodos:
 
         """
         return self.resultados_estadisticas
+
+    @staticmethod
+    def _dividir(numerador, denominador, division_cero=np.nan):
+        """
+        Divide elemento a elemento; los denominadores cero o nulos producen division_cero.
+        """
+        numerador = np.asarray(numerador, dtype=float)
+        denominador = np.asarray(denominador, dtype=float)
+        valido = np.isfinite(denominador) & (denominador != 0)
+        resultado = np.full(np.broadcast(numerador, denominador).shape, division_cero, dtype=float)
+        np.divide(numerador, denominador, out=resultado, where=valido)
+        return resultado
+
+    @staticmethod
+    def _preparar_series(estadisticas):
+        """
+        Ordena las estadísticas por programa y año y devuelve la columna que identifica cada programa.
+        """
+        clave = "codigo_snies" if "codigo_snies" in estadisticas.columns else "programa"
+        datos = estadisticas.sort_values([clave, "anio"], kind="stable").reset_index(drop=True)
+        return datos, clave
+
+    @Instrumentador.medir("metricas_derivadas")
+    def calcular_metricas_derivadas(self, estadisticas=None, ventana=3, division_cero=np.nan):
+        """
+        Calcula tasas, crecimiento interanual y medias móviles sobre las estadísticas.
+
+        Todas las métricas se calculan con operaciones por columnas sobre el conjunto
+        completo de resultados, sin ciclos por programa: las filas se ordenan por programa y
+        año, y el año anterior y las ventanas móviles se obtienen desplazando los arreglos
+        y con sumas acumuladas. Un valor solo se compara con el del año inmediatamente
+        anterior del mismo programa.
+
+        Parámetros
+        ----------
+        estadisticas : DataFrame, opcional
+            Resultado de calcular_estadisticas. Si es None se usan las últimas calculadas.
+            Si tiene la columna codigo_snies, los programas se identifican por código; si no,
+            por nombre.
+        ventana : int, opcional
+            Años de la media móvil (por defecto es 3). Las filas sin ventana completa quedan en NaN.
+        division_cero : float, opcional
+            Valor de las tasas y crecimientos cuyo denominador es cero (por defecto es NaN).
+
+        Devuelve
+        -------
+        DataFrame
+            Las estadísticas ordenadas por programa y año con las columnas tasa_admision,
+            tasa_absorcion, tasa_graduacion, crecimiento_<métrica> y media_movil_<métrica>.
+        """
+        estadisticas = self.resultados_estadisticas if estadisticas is None else estadisticas
+        datos, clave = self._preparar_series(estadisticas)
+        metricas = [metrica for metrica in self.METRICAS if metrica in datos.columns]
+        valores = datos[metricas].to_numpy(dtype=float)
+        nuevas = {}
+
+        for nombre, (numerador, denominador) in self.TASAS.items():
+            if numerador in datos.columns and denominador in datos.columns:
+                nuevas[nombre] = self._dividir(datos[numerador], datos[denominador], division_cero)
+
+        # Una fila continúa la serie de la anterior si es el mismo programa y el año siguiente
+        grupos = datos[clave].to_numpy()
+        anios = datos["anio"].to_numpy(dtype=np.int64)
+        continua = np.zeros(len(datos), dtype=bool)
+        continua[1:] = (grupos[1:] == grupos[:-1]) & (anios[1:] == anios[:-1] + 1)
+
+        anterior = np.full_like(valores, np.nan)
+        anterior[1:] = valores[:-1]
+        anterior[~continua] = np.nan
+        crecimiento = self._dividir(valores - anterior, anterior, division_cero)
+        crecimiento[~continua] = np.nan
+
+        # Posición de cada fila dentro de su serie de años consecutivos
+        inicios = np.flatnonzero(~continua)
+        posicion = np.arange(len(datos)) - inicios[np.cumsum(~continua) - 1] if len(datos) else np.array([], int)
+        acumulado = np.vstack([np.zeros((1, len(metricas))), np.cumsum(valores, axis=0)])
+        filas = np.arange(len(datos))
+        desde = np.clip(filas + 1 - ventana, 0, None)
+        media_movil = (acumulado[filas + 1] - acumulado[desde]) / ventana
+        media_movil[posicion + 1 < ventana] = np.nan
+
+        for i, metrica in enumerate(metricas):
+            nuevas[f"crecimiento_{metrica}"] = crecimiento[:, i]
+        for i, metrica in enumerate(metricas):
+            nuevas[f"media_movil_{metrica}"] = media_movil[:, i]
+
+        self.resultados_metricas = datos.assign(**nuevas)
+        return self.resultados_metricas
+
+    def calcular_cagr(self, estadisticas=None, division_cero=np.nan):
+        """
+        Calcula la tasa de crecimiento anual compuesta (CAGR) de cada programa.
+
+        La tasa se calcula entre el primer y el último año de cada programa:
+        (valor_final / valor_inicial) ** (1 / años) - 1.
+
+        Parámetros
+        ----------
+        estadisticas : DataFrame, opcional
+            Resultado de calcular_estadisticas. Si es None se usan las últimas calculadas.
+        division_cero : float, opcional
+            Valor cuando el valor inicial es cero o el programa tiene un solo año (por defecto es NaN).
+
+        Devuelve
+        -------
+        DataFrame
+            Una fila por programa con el año inicial, el año final y cagr_<métrica>.
+        """
+        estadisticas = self.resultados_estadisticas if estadisticas is None else estadisticas
+        datos, clave = self._preparar_series(estadisticas)
+        metricas = [metrica for metrica in self.METRICAS if metrica in datos.columns]
+        agrupados = datos.groupby(clave, sort=False)
+        primeros = agrupados.first()
+        ultimos = agrupados.last()
+
+        anios = (ultimos["anio"] - primeros["anio"]).to_numpy(dtype=float)
+        resultado = pd.DataFrame({"anio_inicial": primeros["anio"], "anio_final": ultimos["anio"]})
+        if clave != "programa" and "programa" in datos.columns:
+            resultado.insert(0, "programa", primeros["programa"])
+        for metrica in metricas:
+            inicial = primeros[metrica].to_numpy(dtype=float)
+            final = ultimos[metrica].to_numpy(dtype=float)
+            valido = (inicial > 0) & (anios > 0)
+            cagr = np.full(len(resultado), division_cero, dtype=float)
+            cagr[valido] = (final[valido] / inicial[valido]) ** (1 / anios[valido]) - 1
+            resultado[f"cagr_{metrica}"] = cagr
+        return resultado.reset_index()
@@ -3,53 +3,252 @@ import pandas as pd
 from gestor_datos import GestorDatos
 from analizador import Analizador
 from visualizador import Visualizador
+from observador_directorio import ObservadorDirectorio
+from instrumentacion import Instrumentador
+from exportador import Exportador
+from ejecutor_tareas import EjecutorTareas
+from almacen_compartido import AlmacenCompartido
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
 import io
+import os
+
+# Directorio de los archivos Excel de entrada; se puede cambiar con la variable de entorno SNIES_RUTA_ENTRADAS
+RUTA_ENTRADAS = os.environ.get("SNIES_RUTA_ENTRADAS", "../docs/inputs")
 
 # Configura la página de Streamlit con un título y diseño
 st.set_page_config(page_title="SNIES Visualizador", layout="wide")
 
-# Inicializa instancias de GestorDatos, Analizador y Visualizador
-gestor_datos = GestorDatos("C:/Users/Lenovo/Desktop/GIT/proyecto-3-biosnies/docs/inputs")
-analizador = Analizador()
+# Registra los tiempos de cada etapa en docs/outputs/instrumentacion.jsonl, junto al log de errores
+Instrumentador()
+
+
+# Etapas memorizadas por Streamlit. Los parámetros con prefijo "_" no forman parte de la
+# clave de la caché: cada etapa se identifica por el hash del contenido de los archivos
+# subidos, la palabra clave y los programas seleccionados, y solo se vuelve a ejecutar
+# cuando alguno de ellos cambia. La lectura y el análisis se envían tal cual como tareas
+# en segundo plano (su primer argumento es la tarea), así que el trabajo se hace una sola
+# vez y las demás sesiones reutilizan el resultado guardado.
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def consolidar_datos(_tarea, clave_datos, _archivos):
+    """
+    Lee los archivos Excel subidos y construye un GestorDatos con su tabla maestra.
+
+    Se guarda como recurso para no copiar la tabla maestra en cada ejecución; el
+    gestor devuelto se trata como de solo lectura. Devuelve (gestor, errores por archivo).
+    """
+    gestor = GestorDatos(RUTA_ENTRADAS)
+    errores = {}
+    for completados, (nombre, contenido) in enumerate(_archivos):
+        _tarea.reportar_progreso(completados, len(_archivos), nombre)
+        try:
+            df = pd.read_excel(io.BytesIO(contenido))
+            gestor.add_dataframe(nombre, gestor.apply_dtype_schema(gestor.rename_columns(df)))
+        except Exception as e:
+            errores[nombre] = e
+    _tarea.reportar_progreso(len(_archivos), len(_archivos), "consolidando")
+    gestor.get_master_table()
+    return gestor, errores
+
+
+@st.cache_data(show_spinner="Buscando programas...")
+def buscar_programas(clave_datos, palabra_clave, _gestor, umbral=None):
+    """
+    Busca los programas que coinciden con la palabra clave en la tabla maestra.
+
+    Si se indica un umbral, la búsqueda es aproximada (ver GestorDatos.buscar_similares).
+    """
+    if umbral is not None:
+        return _gestor.buscar_similares(palabra_clave, umbral=umbral)
+    return _gestor.buscar_por_palabra_clave(palabra_clave)
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def analizar_programas(_tarea, clave_datos, codigos, _gestor):
+    """
+    Calcula las estadísticas de los programas seleccionados (por código SNIES), por lotes.
+    """
+    analizador = Analizador()
+    analizador.establecer_programas_seleccionados(_gestor.get_program_dimension().seleccionar(codigos))
+    return analizador.calcular_estadisticas(_gestor.get_master_table(), progreso=_tarea.reportar_progreso)
+
+
+# Tareas en segundo plano: consolidar_datos y analizar_programas se ejecutan en un pool de
+# hilos compartido. Cada sesión tiene su propio EjecutorTareas, que guarda los resultados
+# y cancela la tarea anterior cuando cambian los archivos o la selección.
+
+
+@st.cache_resource
+def obtener_pool_tareas():
+    """
+    Devuelve el pool de hilos compartido por las tareas de todas las sesiones.
+    """
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix="tareas_app")
+
+
+@st.fragment(run_every=1)
+def mostrar_tarea(tarea, descripcion):
+    """
+    Muestra el avance de una tarea en segundo plano y recarga la página cuando termina.
+    """
+    if tarea.terminada:
+        st.rerun()
+    mensaje = tarea.progreso["mensaje"]
+    st.progress(tarea.fraccion, text=f"{descripcion}{f' ({mensaje})' if mensaje else ''}...")
+    if st.button("Cancelar", key=f"cancelar_tarea_{tarea.id}"):
+        tarea.cancelar()
+
+
+def mostrar_tarea_interrumpida(tarea, descripcion):
+    """
+    Informa que una tarea se canceló o falló y ofrece volver a ejecutarla.
+
+    Devuelve True si se pidió reintentar.
+    """
+    if tarea.estado == "error":
+        st.error(f"Error en {descripcion}: {tarea.error}")
+    else:
+        st.warning(f"Se canceló {descripcion}.")
+    return st.button("Reintentar", key=f"reintentar_tarea_{tarea.id}")
+
+
+@st.cache_resource
+def obtener_exportador():
+    """
+    Devuelve el exportador compartido por todas las sesiones (y su caché de archivos generados).
+    """
+    return Exportador()
+
+
+@st.cache_resource
+def obtener_almacen():
+    """
+    Devuelve el almacén compartido (Arrow IPC mapeado en memoria) de los datos del directorio.
+
+    Es None si pyarrow no está instalado; en ese caso cada proceso lee los archivos Excel.
+    """
+    try:
+        return AlmacenCompartido("../docs/compartido")
+    except ImportError:
+        return None
+
+
+@st.cache_resource
+def obtener_observador(ruta_directorio):
+    """
+    Inicia (una sola vez por proceso) el observador del directorio de entradas.
+
+    Todas las sesiones comparten el mismo observador y leen la versión que publica. La
+    primera carga parte del almacén compartido, de modo que un proceso nuevo no vuelve a
+    leer los archivos Excel que otro ya publicó y todos mapean las mismas páginas.
+    """
+    observador = ObservadorDirectorio(ruta_directorio, almacen=obtener_almacen())
+    observador.iniciar()
+    return observador
+
+
+@st.fragment(run_every=2)
+def mostrar_estado_observador(observador, version_actual):
+    """
+    Muestra el progreso de carga y la versión servida; recarga la página al publicarse una nueva.
+    """
+    progreso = observador.progreso
+    if progreso["estado"] == "cargando" and progreso["total"]:
+        st.progress(progreso["completados"] / progreso["total"],
+                    text=f"Cargando {progreso['archivo'] or ''} ({progreso['completados']}/{progreso['total']})")
+    elif progreso["estado"] == "error":
+        st.error(f"Error al recargar el directorio: {observador.ultimo_error}")
+
+    instantanea = observador.obtener_instantanea()
+    if instantanea is None:
+        st.info("Cargando los archivos del directorio...")
+    else:
+        st.caption(f"Versión de datos {instantanea.version} · {len(instantanea.archivos)} archivos · "
+                   f"publicada {instantanea.cargada_en}")
+    if instantanea is not None and instantanea.version != version_actual:
+        st.rerun()
+
+
+# Inicializa instancias de GestorDatos y Visualizador
+gestor_datos = GestorDatos(RUTA_ENTRADAS)
 visualizador = Visualizador()
 
+# Ejecutor de tareas en segundo plano de esta sesión
+if "tareas" not in st.session_state:
+    st.session_state["tareas"] = EjecutorTareas(obtener_pool_tareas())
+tareas = st.session_state["tareas"]
+
+# Panel de depuración con los tiempos de cada etapa (se muestra al final de la página)
+modo_depuracion = st.sidebar.checkbox("Panel de depuración")
+medir_memoria = modo_depuracion and st.sidebar.checkbox("Medir pico de memoria (más lento)")
+Instrumentador.configurar(memoria=medir_memoria)
+
 # Título de la barra lateral para la sección de carga de archivos
 st.sidebar.title("Cargar Archivos")
-# Widget de carga de archivos en la barra lateral para seleccionar múltiples archivos Excel
-uploaded_files = st.sidebar.file_uploader("Selecciona archivos Excel", accept_multiple_files=True, type=["xlsx"])
+# Origen de los datos: archivos subidos o el directorio de entradas observado
+fuente_datos = st.sidebar.radio("Fuente de datos", ["Subir archivos", "Directorio de entradas"])
 
-# Diccionario para almacenar los dataframes cargados de los archivos subidos
+# Diccionario de los dataframes cargados de los archivos subidos
 dataframes = {}
+# Clave de los datos cargados: nombre y hash del contenido de cada archivo
+clave_datos = ()
+uploaded_files = None
 
-# Si se suben archivos, procesa cada archivo
+if fuente_datos == "Subir archivos":
+    # Widget de carga de archivos en la barra lateral para seleccionar múltiples archivos Excel
+    uploaded_files = st.sidebar.file_uploader("Selecciona archivos Excel", accept_multiple_files=True, type=["xlsx"])
+else:
+    # Usa la última versión publicada por el observador del directorio
+    observador = obtener_observador(RUTA_ENTRADAS)
+    instantanea = observador.obtener_instantanea()
+    with st.sidebar:
+        mostrar_estado_observador(observador, instantanea.version if instantanea else None)
+    if instantanea is not None:
+        gestor_datos = instantanea.gestor
+        dataframes = gestor_datos.data
+        clave_datos = (("directorio", instantanea.version),)
+
+# Si se suben archivos, los lee en segundo plano (una tarea por conjunto de archivos)
 if uploaded_files:
-    for uploaded_file in uploaded_files:
-        try:
-            # Lee el archivo Excel subido en un dataframe
-            df = pd.read_excel(uploaded_file)
-            # Renombra las columnas usando la instancia de gestor_datos y almacena en el diccionario de dataframes
-            dataframes[uploaded_file.name] = gestor_datos.rename_columns(df)
-            st.success(f"Archivo cargado: {uploaded_file.name}")
+    archivos = [(uploaded_file.name, uploaded_file.getvalue()) for uploaded_file in uploaded_files]
+    clave_datos = tuple((nombre, hashlib.sha256(contenido).hexdigest()) for nombre, contenido in archivos)
+    tarea_lectura = tareas.enviar("lectura", clave_datos, consolidar_datos, clave_datos, archivos)
 
+    if not tarea_lectura.terminada:
+        with st.sidebar:
+            mostrar_tarea(tarea_lectura, "Leyendo archivos")
+    elif tarea_lectura.estado != "completada":
+        if mostrar_tarea_interrumpida(tarea_lectura, "la lectura de los archivos"):
+            tareas.enviar("lectura", clave_datos, consolidar_datos, clave_datos, archivos, reintentar=True)
+            st.rerun()
+    else:
+        gestor_datos, errores = tarea_lectura.resultado
+        dataframes = gestor_datos.data
+        for nombre, df in dataframes.items():
+            st.success(f"Archivo cargado: {nombre}")
             # Muestra las columnas del dataframe cargado
-            st.write(f"Columnas en {uploaded_file.name}: {list(dataframes[uploaded_file.name].columns)}")
-
-        except Exception as e:
+            st.write(f"Columnas en {nombre}: {list(df.columns)}")
+        for nombre, error in errores.items():
             # Muestra un mensaje de error si hay un problema al procesar el archivo
-            st.error(f"Error al procesar {uploaded_file.name}: {e}")
+            st.error(f"Error al procesar {nombre}: {error}")
 
-    # Muestra los dataframes cargados
-    st.write("Datos cargados:")
-    st.write(dataframes)
+        # Muestra los dataframes cargados
+        st.write("Datos cargados:")
+        st.write(dataframes)
 
-# Mensaje de advertencia si no se cargan dataframes
-if not dataframes:
+# Mensaje de advertencia si no se cargan dataframes (salvo mientras se leen los subidos)
+if not dataframes and not (uploaded_files and not tarea_lectura.terminada):
     st.warning("Por favor, carga al menos un archivo para continuar.")
 
 # Título de la barra lateral para la sección de filtrado de programas
 st.sidebar.title("Filtrar Programas")
 # Widget de entrada de texto en la barra lateral para introducir una palabra clave para filtrar programas
 palabra_clave = st.sidebar.text_input("Introduce una palabra clave para filtrar programas:")
+# Búsqueda aproximada por trigramas: tolera errores de escritura y abreviaturas
+busqueda_aproximada = st.sidebar.checkbox("Búsqueda aproximada")
+umbral_similitud = st.sidebar.slider("Similitud mínima", 0.1, 1.0, 0.5, 0.05) if busqueda_aproximada else None
 
 # DataFrame para almacenar los programas filtrados y lista para almacenar los programas seleccionados
 programas_filtrados = pd.DataFrame()
@@ -59,7 +258,7 @@ programas_seleccionados = []
 if palabra_clave and dataframes:
     try:
         # Filtra los programas usando la palabra clave y almacena en programas_filtrados
-        programas_filtrados = gestor_datos.buscar_por_palabra_clave(palabra_clave, dataframes)
+        programas_filtrados = buscar_programas(clave_datos, palabra_clave, gestor_datos, umbral_similitud)
         st.sidebar.write(f"Programas encontrados: {len(programas_filtrados)}")
     except KeyError as e:
         # Muestra un mensaje de error si hay un problema con la palabra clave
@@ -69,30 +268,45 @@ if palabra_clave and dataframes:
 if programas_filtrados.empty:
     st.warning("No se encontraron programas con la palabra clave proporcionada.")
 else:
-    # Widget de selección múltiple para seleccionar programas para el análisis
+    # Widget de selección múltiple con un programa por código SNIES (sin repetir años ni archivos)
+    dimension_programas = gestor_datos.get_program_dimension()
     programas_seleccionados = st.multiselect(
         "Selecciona programas para el análisis",
-        options=programas_filtrados['programa_academico'].unique()
+        options=programas_filtrados['codigo_snies'].dropna().unique().tolist(),
+        format_func=dimension_programas.etiqueta
     )
 
     # Muestra los programas seleccionados
     if programas_seleccionados:
-        st.write("Programas seleccionados:", programas_seleccionados)
+        st.write("Programas seleccionados:")
+        st.dataframe(dimension_programas.seleccionar(programas_seleccionados), hide_index=True)
 
 # DataFrame para almacenar los resultados del análisis
 resultados = pd.DataFrame()
 
-# Si se seleccionan programas, realiza el análisis
+# Si se seleccionan programas, realiza el análisis en segundo plano; un cambio de
+# selección reemplaza al análisis en curso
 if programas_seleccionados:
-    # Filtra los datos para los programas seleccionados
-    programas_datos = programas_filtrados[programas_filtrados['programa_academico'].isin(programas_seleccionados)]
-    analizador.establecer_programas_seleccionados(programas_datos)
-
-    # Calcula las estadísticas y almacena en resultados
-    resultados = analizador.calcular_estadisticas(dataframes)
-    st.write("Resultados del análisis:")
-    st.dataframe(resultados)
+    clave_analisis = (clave_datos, tuple(programas_seleccionados))
+    tarea_analisis = tareas.enviar("analisis", clave_analisis, analizar_programas, clave_datos,
+                                   tuple(programas_seleccionados), gestor_datos)
+    if not tarea_analisis.terminada:
+        mostrar_tarea(tarea_analisis, "Calculando estadísticas")
+    elif tarea_analisis.estado != "completada":
+        if mostrar_tarea_interrumpida(tarea_analisis, "el análisis"):
+            tareas.enviar("analisis", clave_analisis, analizar_programas, clave_datos,
+                          tuple(programas_seleccionados), gestor_datos, reintentar=True)
+            st.rerun()
+    else:
+        resultados = tarea_analisis.resultado
+        st.write("Resultados del análisis:")
+        st.dataframe(resultados)
+        # Tasas, crecimiento interanual y medias móviles de los mismos resultados
+        st.write("Indicadores derivados:")
+        st.dataframe(Analizador().calcular_metricas_derivadas(resultados))
 else:
+    # Sin selección no tiene sentido terminar un análisis anterior
+    tareas.cancelar("analisis")
     # Informa al usuario que seleccione al menos un programa
     st.info("Por favor selecciona al menos un programa para continuar.")
 
@@ -114,31 +328,35 @@ if not resultados.empty:
     if genero_fig:
         st.plotly_chart(genero_fig, use_container_width=True)
 
-# Si hay resultados disponibles, proporciona opciones de descarga
+# Si hay resultados disponibles, proporciona opciones de descarga. Cada archivo se genera
+# solo cuando se pulsa su botón y se reutiliza mientras los resultados no cambien.
 if not resultados.empty:
-    buffer = io.BytesIO()  # Usa un buffer para manejar la conversión
-    with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
-        resultados.to_excel(writer, index=False)
-    buffer.seek(0)  # Resetea el puntero del buffer para que Streamlit pueda leerlo
-    st.download_button(
-        label="Descargar resultados en Excel",
-        data=buffer,
-        file_name="resultados.xlsx",
-        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-    )
-    # Guardar como JSON
-    resultados_json = resultados.to_json(orient="records", indent=4)
-    st.download_button(
-        label="Descargar resultados en JSON",
-        data=resultados_json,
-        file_name="resultados.json",
-        mime="application/json"
-    )
-    # Guardar como CSV
-    csv_data = resultados.to_csv(index=False).encode('utf-8')
-    st.download_button(
-    label="Descargar en formato CSV",
-    data=csv_data,
-    file_name="resultados.csv",
-    mime="text/csv"
-)
+    exportador = obtener_exportador()
+    clave_resultados = exportador.hash_resultado(resultados)
+    descargas = {
+        "xlsx": "Descargar resultados en Excel",
+        "json": "Descargar resultados en JSON",
+        "csv": "Descargar en formato CSV",
+        "csv.gz": "Descargar CSV comprimido",
+        "parquet": "Descargar en formato Parquet",
+    }
+    for formato, etiqueta in descargas.items():
+        if formato not in exportador.formatos_disponibles():
+            continue
+        extension, mime = Exportador.FORMATOS[formato]
+        st.download_button(
+            label=etiqueta,
+            data=lambda formato=formato: exportador.exportar(resultados, formato, clave_resultados),
+            file_name=f"resultados{extension}",
+            mime=mime,
+            on_click="ignore",
+        )
+
+# Muestra los tiempos, filas y memoria registrados por etapa
+if modo_depuracion:
+    with st.expander("Depuración: tiempos por etapa", expanded=True):
+        st.dataframe(Instrumentador.resumen())
+        st.write("Últimas ejecuciones:")
+        st.dataframe(Instrumentador.reporte().tail(50))
+        if st.button("Limpiar registros"):
+            Instrumentador.limpiar()
@@ -0,0 +1,83 @@
+import argparse
+import pandas as pd
+from analizador import Analizador
+from benchmark_snies import medir
+from generador_sintetico import generar_dataframes, generar_tabla
+
+
+def calcular_estadisticas_iterativo(analizador, dataframes):
+    """
+    Implementación original de Analizador.calcular_estadisticas (programa x archivo x año).
+
+    Se conserva aquí únicamente como referencia para el benchmark.
+    """
+    estadisticas = []
+    for _, programa in analizador.programas_seleccionados.iterrows():
+        for _, datos in dataframes.items():
+            if "anio" in datos.columns:
+                datos["anio"] = pd.to_numeric(datos["anio"], errors="coerce").fillna(0).astype(int)
+
+            datos_programa = datos[(datos["codigo_snies"] == programa["codigo_snies"]) &
+                                   (datos["anio"].between(*analizador.rango_anios))]
+            for anio in range(analizador.rango_anios[0], analizador.rango_anios[1] + 1):
+                datos_anio = datos_programa[datos_programa["anio"] == anio]
+                fila = {"programa": programa["programa_academico"], "anio": anio}
+                for metrica in Analizador.METRICAS:
+                    fila[metrica] = datos_anio[metrica].sum() if metrica in datos_anio else 0
+                estadisticas.append(fila)
+    return pd.DataFrame(estadisticas)
+
+
+def ejecutar_benchmark(num_instituciones, programas_por_institucion, num_seleccionados,
+                       rango_anios=(2015, 2023), repeticiones=3):
+    """
+    Compara el tiempo del cálculo vectorizado con el del ciclo original.
+
+    Los datos se generan con generador_sintetico: un DataFrame por métrica y año, con los
+    nombres de columnas canónicos de GestorDatos.
+
+    Devuelve
+    -------
+    dict
+        Tiempos mínimos en segundos de cada implementación y la aceleración obtenida.
+    """
+    anios = range(rango_anios[0], rango_anios[1] + 1)
+    tabla = generar_tabla(num_instituciones, programas_por_institucion, anios)
+    dataframes = generar_dataframes(tabla)
+    seleccion = tabla.drop_duplicates("codigo_snies").head(num_seleccionados)
+
+    analizador = Analizador(rango_anios=rango_anios)
+    analizador.establecer_programas_seleccionados(seleccion)
+
+    tiempo_vectorizado, vectorizado = medir(lambda: analizador.calcular_estadisticas(dataframes), repeticiones)
+    tiempo_iterativo, iterativo = medir(lambda: calcular_estadisticas_iterativo(analizador, dataframes), 1)
+
+    # El ciclo original genera una fila por archivo y los nombres de programa se repiten
+    # entre códigos; ambos resultados se agrupan por programa y año para comparar totales.
+    esperado = iterativo.groupby(["programa", "anio"], as_index=False)[Analizador.METRICAS].sum()
+    obtenido = vectorizado.groupby(["programa", "anio"], as_index=False)[Analizador.METRICAS].sum()
+    coinciden = (obtenido[Analizador.METRICAS].to_numpy() == esperado[Analizador.METRICAS].to_numpy()).all()
+
+    return {
+        "programas": num_instituciones * programas_por_institucion,
+        "seleccionados": len(seleccion),
+        "filas": len(tabla),
+        "vectorizado_s": tiempo_vectorizado,
+        "iterativo_s": tiempo_iterativo,
+        "aceleracion": tiempo_iterativo / tiempo_vectorizado,
+        "resultados_coinciden": bool(coinciden),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de Analizador.calcular_estadisticas.")
+    parser.add_argument("--instituciones", type=int, default=100, help="Instituciones en los datos sintéticos.")
+    parser.add_argument("--programas", type=int, default=20, help="Programas por institución.")
+    parser.add_argument("--seleccionados", type=int, nargs="+", default=[10, 50, 200],
+                        help="Cantidades de programas seleccionados a evaluar.")
+    parser.add_argument("--repeticiones", type=int, default=3, help="Repeticiones del cálculo vectorizado.")
+    args = parser.parse_args()
+
+    resultados = [ejecutar_benchmark(args.instituciones, args.programas, n, repeticiones=args.repeticiones)
+                  for n in args.seleccionados]
+    print(pd.DataFrame(resultados).to_string(index=False))
@@ -0,0 +1,169 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+import pandas as pd
+from analizador import Analizador
+from gestor_datos import GestorDatos
+from generador_sintetico import encabezados_originales, escribir_libros, generar_dataframes, generar_tabla
+from visualizador import Visualizador
+
+CONSULTAS = ["ingenieria", "administracion empresas", "maestria datos", "derecho OR medicina", "tecnolog"]
+
+
+def medir(funcion, repeticiones):
+    """
+    Ejecuta una función varias veces y devuelve el menor tiempo y el último resultado.
+
+    La salida por consola de la función se descarta para no alterar la medición.
+    """
+    tiempos = []
+    resultado = None
+    for _ in range(repeticiones):
+        with contextlib.redirect_stdout(io.StringIO()):
+            inicio = time.perf_counter()
+            resultado = funcion()
+            tiempos.append(time.perf_counter() - inicio)
+    return min(tiempos), resultado
+
+
+def version_codigo():
+    """
+    Devuelve el commit actual del repositorio o None si no se puede determinar.
+    """
+    try:
+        salida = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), check=True)
+        return salida.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def ejecutar_benchmark(num_instituciones, programas_por_institucion, anios, num_seleccionados=50,
+                       repeticiones=3, parallel=False):
+    """
+    Mide carga, renombrado, búsqueda, estadísticas y gráficas sobre datos sintéticos.
+
+    Los libros Excel se escriben en un directorio temporal con los encabezados originales
+    del SNIES, de modo que la carga incluye la lectura y el renombrado de columnas.
+
+    Parámetros
+    ----------
+    num_instituciones : int
+        Número de instituciones.
+    programas_por_institucion : int
+        Programas por institución.
+    anios : range
+        Años cubiertos por los datos.
+    num_seleccionados : int, opcional
+        Programas seleccionados para las estadísticas (por defecto es 50).
+    repeticiones : int, opcional
+        Repeticiones de cada medición; se reporta el menor tiempo (por defecto es 3).
+    parallel : bool, opcional
+        Si es True, la carga usa el pool de procesos de GestorDatos (por defecto es False).
+
+    Devuelve
+    -------
+    dict
+        Registro con los parámetros, el tamaño de los datos y los tiempos en segundos.
+    """
+    tabla = generar_tabla(num_instituciones, programas_por_institucion, anios)
+    dataframes = generar_dataframes(tabla)
+    tiempos = {}
+
+    with tempfile.TemporaryDirectory() as directorio:
+        sinonimos = GestorDatos(directorio).column_synonyms
+        escribir_libros(dataframes, directorio, sinonimos)
+
+        gestor = None
+
+        def cargar():
+            nonlocal gestor
+            gestor = GestorDatos(directorio)
+            return gestor.load_data(parallel=parallel)
+
+        tiempos["carga_s"], _ = medir(cargar, repeticiones)
+
+    originales = [encabezados_originales(df, sinonimos) for df in dataframes.values()]
+    tiempos["renombrado_s"], _ = medir(lambda: [gestor.rename_columns(df) for df in originales], repeticiones)
+
+    def construir_indice():
+        gestor.master_index = None
+        return gestor.get_master_index()
+
+    tiempos["tabla_maestra_s"], maestra = medir(gestor.get_master_table, 1)
+    tiempos["indice_busqueda_s"], _ = medir(construir_indice, repeticiones)
+    tiempos["busqueda_s"], _ = medir(lambda: [gestor.buscar_por_palabra_clave(c) for c in CONSULTAS], repeticiones)
+
+    seleccion = maestra.drop_duplicates("codigo_snies").head(num_seleccionados)
+    analizador = Analizador(rango_anios=(anios[0], anios[-1]))
+    analizador.establecer_programas_seleccionados(seleccion)
+    tiempos["estadisticas_s"], estadisticas = medir(lambda: analizador.calcular_estadisticas(gestor.data),
+                                                    repeticiones)
+    tiempos["estadisticas_maestra_s"], _ = medir(lambda: analizador.calcular_estadisticas(maestra), repeticiones)
+    tiempos["cubo_s"], cubo = medir(gestor.get_cube, 1)
+    tiempos["estadisticas_cubo_s"], _ = medir(lambda: analizador.calcular_estadisticas(cubo), repeticiones)
+
+    visualizador = Visualizador()
+    modalidad = maestra.groupby("metodologia", observed=True, as_index=False)["graduados"].sum()
+
+    def graficar():
+        visualizador.establecer_datos_analizados(estadisticas)
+        figuras = [visualizador.graficar_tendencias_inscripcion(), visualizador.graficar_comparacion_genero()]
+        visualizador.establecer_datos_analizados(modalidad.rename(columns={"metodologia": "modalidad"}))
+        figuras.append(visualizador.graficar_comparacion_modalidad())
+        return figuras
+
+    tiempos["figuras_s"], _ = medir(graficar, repeticiones)
+
+    return {
+        "fecha": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "version": version_codigo(),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "parametros": {
+            "instituciones": num_instituciones,
+            "programas_por_institucion": programas_por_institucion,
+            "anios": [anios[0], anios[-1]],
+            "seleccionados": num_seleccionados,
+            "repeticiones": repeticiones,
+            "parallel": parallel,
+        },
+        "archivos": len(dataframes),
+        "filas": len(maestra),
+        "tiempos_s": tiempos,
+    }
+
+
+def guardar_resultado(resultado, ruta):
+    """
+    Agrega un resultado al archivo JSON Lines de resultados (una línea por ejecución).
+    """
+    os.makedirs(os.path.dirname(ruta) or ".", exist_ok=True)
+    with open(ruta, "a", encoding="utf-8") as archivo:
+        archivo.write(json.dumps(resultado, ensure_ascii=False) + "\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de carga, búsqueda, estadísticas y gráficas SNIES.")
+    parser.add_argument("--instituciones", type=int, default=20, help="Instituciones en los datos sintéticos.")
+    parser.add_argument("--programas", type=int, default=15, help="Programas por institución.")
+    parser.add_argument("--anios", type=int, nargs=2, default=[2019, 2023], metavar=("INICIO", "FIN"),
+                        help="Rango de años de los datos.")
+    parser.add_argument("--seleccionados", type=int, default=50, help="Programas seleccionados para estadísticas.")
+    parser.add_argument("--repeticiones", type=int, default=3, help="Repeticiones de cada medición.")
+    parser.add_argument("--paralelo", action="store_true", help="Carga los archivos en un pool de procesos.")
+    parser.add_argument("--salida", default="../docs/outputs/benchmarks.jsonl",
+                        help="Archivo JSON Lines donde se agregan los resultados.")
+    args = parser.parse_args()
+
+    resultado = ejecutar_benchmark(args.instituciones, args.programas, range(args.anios[0], args.anios[1] + 1),
+                                   args.seleccionados, args.repeticiones, args.paralelo)
+    guardar_resultado(resultado, args.salida)
+    print(pd.Series(resultado["tiempos_s"], name="segundos").to_string())
+    print(f"Resultado agregado a {args.salida}")
@@ -0,0 +1,268 @@
+import hashlib
+import json
+import os
+import time
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+    FORMATO_POR_DEFECTO = "parquet"
+except ImportError:
+    FORMATO_POR_DEFECTO = "pickle"
+
+
+class CacheColumnar:
+    """
+    Caché en disco de los DataFrames ya renombrados y validados por GestorDatos.
+
+    Cada entrada se guarda en formato columnar (Parquet o Feather) junto a un archivo
+    JSON con sus metadatos. La clave de la entrada depende de la ruta, el tamaño y la
+    fecha de modificación del archivo Excel de origen y de un hash de la configuración
+    de procesamiento (sinónimos de columnas, esquema de tipos), de modo que cualquier
+    cambio en alguno de ellos invalida la entrada.
+
+    Atributos
+    ----------
+    directorio : str
+        Carpeta donde se almacenan las entradas de la caché.
+    formato : str
+        Formato de almacenamiento: "parquet", "feather" o "pickle".
+
+    Métodos
+    -------
+    obtener(file_path, configuracion)
+        Devuelve el DataFrame guardado para el archivo o None si no hay entrada válida.
+    guardar(file_path, configuracion, df)
+        Guarda el DataFrame procesado de un archivo.
+    listar_entradas()
+        Devuelve un DataFrame con los metadatos de todas las entradas.
+    purgar(file_path=None)
+        Elimina todas las entradas o solo las de un archivo de origen.
+    purgar_obsoletas()
+        Elimina las entradas cuyo archivo de origen cambió o ya no existe.
+    """
+
+    EXTENSIONES = {"parquet": ".parquet", "feather": ".feather", "pickle": ".pkl"}
+
+    def __init__(self, directorio="../docs/cache", formato=None):
+        """
+        Inicializa la caché y crea su directorio si no existe.
+
+        Parámetros
+        ----------
+        directorio : str, opcional
+            Carpeta de la caché (por defecto es "../docs/cache").
+        formato : str, opcional
+            Formato de almacenamiento. Si es None se usa Parquet cuando pyarrow está disponible.
+        """
+        self.formato = formato or FORMATO_POR_DEFECTO
+        if self.formato not in self.EXTENSIONES:
+            raise ValueError(f"Formato de caché no soportado: {self.formato}")
+        self.directorio = directorio
+        os.makedirs(self.directorio, exist_ok=True)
+
+    @staticmethod
+    def hash_configuracion(configuracion):
+        """
+        Calcula un hash estable de la configuración de procesamiento.
+        """
+        contenido = json.dumps(configuracion, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(contenido.encode("utf-8")).hexdigest()
+
+    def clave(self, file_path, configuracion):
+        """
+        Calcula la clave de caché de un archivo de origen.
+
+        Parámetros
+        ----------
+        file_path : str
+            Ruta del archivo Excel de origen.
+        configuracion : dict
+            Configuración usada al procesar el archivo (por ejemplo, los sinónimos de columnas).
+
+        Devuelve
+        -------
+        str
+            Clave hexadecimal de la entrada.
+        """
+        estado = os.stat(file_path)
+        partes = [
+            os.path.abspath(file_path),
+            str(estado.st_size),
+            str(estado.st_mtime_ns),
+            self.hash_configuracion(configuracion),
+        ]
+        return hashlib.sha256("|".join(partes).encode("utf-8")).hexdigest()
+
+    def _ruta_datos(self, clave):
+        return os.path.join(self.directorio, clave + self.EXTENSIONES[self.formato])
+
+    def _ruta_metadatos(self, clave):
+        return os.path.join(self.directorio, clave + ".json")
+
+    def ruta(self, file_path, configuracion):
+        """
+        Devuelve la ruta del archivo de datos de una entrada, si existe.
+
+        Devuelve
+        -------
+        str or None
+            Ruta del archivo de la caché o None si no existe una entrada válida.
+        """
+        ruta = self._ruta_datos(self.clave(file_path, configuracion))
+        return ruta if os.path.exists(ruta) else None
+
+    def obtener(self, file_path, configuracion):
+        """
+        Devuelve el DataFrame guardado para un archivo de origen.
+
+        Devuelve
+        -------
+        DataFrame or None
+            DataFrame de la caché o None si no existe una entrada válida.
+        """
+        ruta = self.ruta(file_path, configuracion)
+        if ruta is None:
+            return None
+        try:
+            if self.formato == "parquet":
+                return pd.read_parquet(ruta)
+            if self.formato == "feather":
+                return pd.read_feather(ruta)
+            return pd.read_pickle(ruta)
+        except Exception as e:
+            print(f"Advertencia: no se pudo leer la entrada de caché {ruta}: {e}")
+            return None
+
+    def guardar(self, file_path, configuracion, df):
+        """
+        Guarda el DataFrame procesado de un archivo de origen.
+
+        Parámetros
+        ----------
+        file_path : str
+            Ruta del archivo Excel de origen.
+        configuracion : dict
+            Configuración usada al procesar el archivo.
+        df : DataFrame
+            DataFrame renombrado y validado.
+
+        Devuelve
+        -------
+        bool
+            True si la entrada se guardó, False en caso contrario.
+        """
+        clave = self.clave(file_path, configuracion)
+        ruta = self._ruta_datos(clave)
+        ruta_temporal = ruta + ".tmp"
+        try:
+            if self.formato == "parquet":
+                df.to_parquet(ruta_temporal, index=False)
+            elif self.formato == "feather":
+                df.reset_index(drop=True).to_feather(ruta_temporal)
+            else:
+                df.to_pickle(ruta_temporal)
+            os.replace(ruta_temporal, ruta)
+        except Exception as e:
+            if os.path.exists(ruta_temporal):
+                os.remove(ruta_temporal)
+            print(f"Advertencia: no se pudo guardar {file_path} en la caché: {e}")
+            return False
+
+        estado = os.stat(file_path)
+        metadatos = {
+            "clave": clave,
+            "archivo_origen": os.path.abspath(file_path),
+            "tamano": estado.st_size,
+            "mtime_ns": estado.st_mtime_ns,
+            "hash_configuracion": self.hash_configuracion(configuracion),
+            "formato": self.formato,
+            "filas": len(df),
+            "columnas": len(df.columns),
+            "creado": time.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        with open(self._ruta_metadatos(clave), "w", encoding="utf-8") as archivo:
+            json.dump(metadatos, archivo, ensure_ascii=False, indent=2)
+        return True
+
+    def _leer_metadatos(self):
+        metadatos = []
+        for nombre in os.listdir(self.directorio):
+            if nombre.endswith(".json"):
+                try:
+                    with open(os.path.join(self.directorio, nombre), encoding="utf-8") as archivo:
+                        metadatos.append(json.load(archivo))
+                except (OSError, ValueError):
+                    continue
+        return metadatos
+
+    def listar_entradas(self):
+        """
+        Devuelve los metadatos de todas las entradas de la caché.
+
+        Devuelve
+        -------
+        DataFrame
+            Una fila por entrada con su archivo de origen, tamaño en disco y vigencia.
+        """
+        entradas = []
+        for metadatos in self._leer_metadatos():
+            ruta = os.path.join(self.directorio, metadatos["clave"] + self.EXTENSIONES[metadatos["formato"]])
+            origen = metadatos["archivo_origen"]
+            vigente = os.path.exists(origen)
+            if vigente:
+                estado = os.stat(origen)
+                vigente = estado.st_size == metadatos["tamano"] and estado.st_mtime_ns == metadatos["mtime_ns"]
+            entradas.append({
+                **metadatos,
+                "bytes_en_disco": os.path.getsize(ruta) if os.path.exists(ruta) else 0,
+                "vigente": vigente,
+            })
+        return pd.DataFrame(entradas)
+
+    def _eliminar(self, metadatos):
+        for ruta in (
+            os.path.join(self.directorio, metadatos["clave"] + self.EXTENSIONES[metadatos["formato"]]),
+            self._ruta_metadatos(metadatos["clave"]),
+        ):
+            if os.path.exists(ruta):
+                os.remove(ruta)
+
+    def purgar(self, file_path=None):
+        """
+        Elimina entradas de la caché.
+
+        Parámetros
+        ----------
+        file_path : str, opcional
+            Si se indica, solo se eliminan las entradas de ese archivo de origen.
+
+        Devuelve
+        -------
+        int
+            Número de entradas eliminadas.
+        """
+        origen = os.path.abspath(file_path) if file_path else None
+        eliminadas = 0
+        for metadatos in self._leer_metadatos():
+            if origen is None or metadatos["archivo_origen"] == origen:
+                self._eliminar(metadatos)
+                eliminadas += 1
+        return eliminadas
+
+    def purgar_obsoletas(self):
+        """
+        Elimina las entradas cuyo archivo de origen cambió o ya no existe.
+
+        Devuelve
+        -------
+        int
+            Número de entradas eliminadas.
+        """
+        entradas = self.listar_entradas()
+        if entradas.empty:
+            return 0
+        obsoletas = entradas[~entradas["vigente"]]
+        for _, metadatos in obsoletas.iterrows():
+            self._eliminar(metadatos)
+        return len(obsoletas)
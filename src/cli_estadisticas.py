@@ -0,0 +1,210 @@
+import argparse
+import json
+import os
+import time
+import pandas as pd
+from analizador import Analizador
+from exportador import Exportador
+from gestor_datos import GestorDatos
+from gestor_filtros import GestorFiltros
+from indice_busqueda import normalizar_texto
+
+FORMATOS = {
+    ".parquet": "parquet", ".csv": "csv", ".gz": "csv.gz", ".json": "json", ".jsonl": "jsonl", ".xlsx": "xlsx",
+}
+
+
+def leer_consultas(ruta):
+    """
+    Lee el archivo de consultas.
+
+    Se aceptan tres formatos según la extensión:
+
+    - .json: una lista de objetos de consulta.
+    - .jsonl: un objeto de consulta por línea.
+    - cualquier otra: una palabra clave por línea; las líneas vacías y las que empiezan
+      por "#" se ignoran.
+
+    Cada objeto de consulta tiene la clave "palabra_clave" y, opcionalmente, "id",
+    "operador" ("and" u "or") y "programas" (códigos SNIES o nombres a conservar de entre
+    los resultados de la búsqueda).
+
+    Parámetros
+    ----------
+    ruta : str
+        Ruta del archivo de consultas.
+
+    Devuelve
+    -------
+    list
+        Lista de diccionarios con las claves id, palabra_clave, operador y programas.
+
+    Lanza
+    -----
+    ValueError
+        Si una consulta no tiene palabra clave o los identificadores se repiten.
+    """
+    extension = os.path.splitext(ruta)[1].lower()
+    with open(ruta, encoding="utf-8") as archivo:
+        if extension == ".json":
+            crudas = json.load(archivo)
+        elif extension == ".jsonl":
+            crudas = [json.loads(linea) for linea in archivo if linea.strip()]
+        else:
+            crudas = [linea.strip() for linea in archivo if linea.strip() and not linea.lstrip().startswith("#")]
+
+    consultas = []
+    for numero, cruda in enumerate(crudas, start=1):
+        consulta = {"palabra_clave": cruda} if isinstance(cruda, str) else dict(cruda)
+        if not str(consulta.get("palabra_clave", "")).strip():
+            raise ValueError(f"La consulta {numero} de {ruta} no tiene palabra clave.")
+        consulta.setdefault("id", str(numero))
+        consulta.setdefault("operador", "and")
+        consulta.setdefault("programas", None)
+        consultas.append(consulta)
+
+    ids = [str(consulta["id"]) for consulta in consultas]
+    if len(set(ids)) != len(ids):
+        raise ValueError(f"Los identificadores de las consultas de {ruta} deben ser únicos.")
+    return consultas
+
+
+def _filtrar_programas(programas, seleccion):
+    """
+    Conserva los programas cuyo código SNIES o nombre está en la selección de una consulta.
+    """
+    codigos = set()
+    nombres = set()
+    for valor in seleccion:
+        numero = pd.to_numeric(valor, errors="coerce")
+        if pd.notna(numero) and float(numero).is_integer():
+            codigos.add(int(numero))
+        else:
+            nombres.add(normalizar_texto(valor))
+    codigos_programas = pd.to_numeric(programas["codigo_snies"], errors="coerce")
+    nombres_programas = programas["programa_academico"].astype(str).map(normalizar_texto)
+    return programas[codigos_programas.isin(codigos) | nombres_programas.isin(nombres)]
+
+
+def evaluar_consultas(gestor, consultas, rango_anios=None, ventana=None):
+    """
+    Calcula las estadísticas de todas las consultas en una sola pasada.
+
+    Cada consulta se resuelve con el índice de búsqueda de la tabla maestra; luego se
+    toma la unión de los programas encontrados y se calculan sus estadísticas una única
+    vez sobre el cubo de totales, para repartirlas después entre las consultas.
+
+    Parámetros
+    ----------
+    gestor : GestorDatos
+        Gestor con los datos ya cargados.
+    consultas : list
+        Consultas leídas con leer_consultas.
+    rango_anios : tuple, opcional
+        Años (inicio, fin) a calcular. Si es None se usan todos los años de los datos.
+    ventana : int, opcional
+        Si se indica, se agregan las métricas derivadas de Analizador.calcular_metricas_derivadas
+        con medias móviles de esa cantidad de años.
+
+    Devuelve
+    -------
+    tuple
+        (DataFrame con una fila por consulta, programa y año; DataFrame con el número de
+        programas encontrados por consulta).
+    """
+    maestra = gestor.get_master_table()
+    filtros = GestorFiltros()
+    asignaciones = []
+    resumen = []
+    for consulta in consultas:
+        encontrados = filtros.buscar_por_palabra_clave(consulta["palabra_clave"], maestra, consulta["operador"])
+        programas = encontrados.drop_duplicates("codigo_snies")[["codigo_snies", "programa_academico"]]
+        if consulta["programas"]:
+            programas = _filtrar_programas(programas, consulta["programas"])
+        asignaciones.append(programas.assign(consulta=str(consulta["id"])))
+        resumen.append({"consulta": str(consulta["id"]), "palabra_clave": consulta["palabra_clave"],
+                        "programas": len(programas)})
+
+    cubo = gestor.get_cube()
+    if rango_anios is None:
+        anios = cubo.hechos.index.get_level_values("anio")
+        rango_anios = (int(anios.min()), int(anios.max())) if len(anios) else (0, -1)
+
+    seleccion = pd.concat(asignaciones, ignore_index=True)
+    analizador = Analizador(rango_anios=rango_anios)
+    analizador.establecer_programas_seleccionados(seleccion.drop_duplicates("codigo_snies"))
+    estadisticas = analizador.calcular_estadisticas(cubo, incluir_codigo=True)
+    if ventana is not None:
+        estadisticas = analizador.calcular_metricas_derivadas(estadisticas, ventana=ventana)
+
+    resultados = seleccion[["consulta", "codigo_snies"]].merge(estadisticas, on="codigo_snies", how="inner")
+    return resultados, pd.DataFrame(resumen)
+
+
+def guardar_resultados(resultados, ruta, formato=None):
+    """
+    Escribe los resultados por lotes en Parquet, CSV, JSON, JSON Lines o Excel.
+
+    Parámetros
+    ----------
+    resultados : DataFrame
+        Resultados de evaluar_consultas.
+    ruta : str
+        Ruta del archivo de salida.
+    formato : str, opcional
+        Uno de Exportador.FORMATOS. Si es None se deduce de la extensión de la ruta;
+        un CSV terminado en .gz se comprime.
+    """
+    formato = formato or FORMATOS.get(os.path.splitext(ruta)[1].lower())
+    if formato is None:
+        raise ValueError(f"No se puede deducir el formato de salida de {ruta}; use --formato.")
+    os.makedirs(os.path.dirname(os.path.abspath(ruta)), exist_ok=True)
+    Exportador().escribir(resultados, formato, ruta)
+
+
+def main(argv=None):
+    """
+    Punto de entrada de la línea de comandos.
+    """
+    parser = argparse.ArgumentParser(
+        description="Calcula las estadísticas SNIES de muchas consultas por palabra clave sin interfaz gráfica.")
+    parser.add_argument("directorio", help="Directorio con los archivos Excel de entrada.")
+    parser.add_argument("consultas", help="Archivo de consultas (.txt, .json o .jsonl).")
+    parser.add_argument("-o", "--salida", default="../docs/outputs/estadisticas.parquet",
+                        help="Archivo de salida (.parquet, .csv, .csv.gz, .json, .jsonl o .xlsx).")
+    parser.add_argument("--formato", choices=list(Exportador.FORMATOS),
+                        help="Formato de salida si no se deduce de la extensión.")
+    parser.add_argument("-w", "--workers", type=int, default=1,
+                        help="Procesos para leer los archivos (1 lee de forma secuencial).")
+    parser.add_argument("--anios", type=int, nargs=2, metavar=("INICIO", "FIN"),
+                        help="Rango de años; por defecto todos los años de los datos.")
+    parser.add_argument("--metricas-derivadas", type=int, nargs="?", const=3, metavar="VENTANA",
+                        help="Agrega tasas, crecimiento interanual y medias móviles (ventana por defecto 3).")
+    parser.add_argument("--cache-dir", default="../docs/cache",
+                        help="Directorio de la caché columnar ('' la desactiva).")
+    args = parser.parse_args(argv)
+
+    inicio = time.perf_counter()
+    consultas = leer_consultas(args.consultas)
+
+    gestor = GestorDatos(args.directorio, max_workers=args.workers, cache_dir=args.cache_dir or None)
+    gestor.require_columns(Analizador.COLUMNAS_REQUERIDAS)
+    gestor.load_data(parallel=args.workers > 1)
+    if not gestor.data:
+        parser.error(f"No se cargó ningún archivo válido de {args.directorio}.")
+
+    resultados, resumen = evaluar_consultas(gestor, consultas, tuple(args.anios) if args.anios else None,
+                                            args.metricas_derivadas)
+    guardar_resultados(resultados, args.salida, args.formato)
+
+    sin_resultados = resumen[resumen["programas"] == 0]
+    if not sin_resultados.empty:
+        print(f"Advertencia: {len(sin_resultados)} consultas no encontraron programas: "
+              f"{list(sin_resultados['consulta'])}")
+    print(f"{len(consultas)} consultas, {len(resultados)} filas escritas en {args.salida} "
+          f"en {time.perf_counter() - inicio:.1f} s.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
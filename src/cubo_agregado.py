@@ -0,0 +1,232 @@
+import numpy as np
+import pandas as pd
+
+
+class CuboAgregado:
+    """
+    Cubo de totales precalculados de las métricas SNIES por programa, año y semestre.
+
+    El cubo guarda un agregado parcial por archivo de origen, de modo que al cambiar un
+    archivo solo se vuelve a agregar ese archivo. Los totales consolidados y sus
+    agregaciones por institución, geografía, metodología o nivel se calculan una vez y
+    quedan ordenados por su clave, así las consultas por clave cuestan lo que mide el
+    resultado y no lo que miden los datos crudos.
+
+    Atributos
+    ----------
+    hechos : DataFrame
+        Totales por (codigo_snies, anio, semestre), con índice ordenado.
+    dimension : DataFrame
+        Atributos de cada programa (nombre, institución, geografía...), indexados por codigo_snies.
+
+    Métodos
+    -------
+    desde_dataframes(dataframes)
+        Construye un cubo a partir de un diccionario de DataFrames cargados.
+    actualizar_archivo(nombre, df)
+        Agrega (o vuelve a agregar) los datos de un archivo de origen.
+    eliminar_archivo(nombre)
+        Quita del cubo los datos de un archivo de origen.
+    copia()
+        Devuelve un cubo independiente que comparte los agregados ya calculados.
+    consultar(nivel="programa", claves=None, anios=None, semestral=False)
+        Devuelve los totales de un nivel de agregación.
+    """
+
+    GRANO = ["codigo_snies", "anio", "semestre"]
+    METRICAS = ["inscritos", "admitidos", "nuevos_matriculados", "total_matriculados", "graduados"]
+    ATRIBUTOS = [
+        "programa_academico", "codigo_institucion", "institucion", "nivel_formacion", "metodologia",
+        "departamento_oferta_programa", "municipio_oferta_programa",
+    ]
+
+    # Columnas que identifican cada nivel de agregación; la primera es la clave de consulta
+    NIVELES = {
+        "programa": ["codigo_snies"],
+        "institucion": ["codigo_institucion", "institucion"],
+        "departamento": ["departamento_oferta_programa"],
+        "municipio": ["departamento_oferta_programa", "municipio_oferta_programa"],
+        "metodologia": ["metodologia"],
+        "nivel_formacion": ["nivel_formacion"],
+    }
+
+    def __init__(self):
+        """
+        Inicializa un cubo vacío.
+        """
+        self._hechos_por_archivo = {}
+        self._dimension_por_archivo = {}
+        self._invalidar()
+
+    @classmethod
+    def desde_dataframes(cls, dataframes):
+        """
+        Construye un cubo a partir de un diccionario de DataFrames cargados.
+
+        Parámetros
+        ----------
+        dataframes : dict
+            Diccionario {nombre_archivo: DataFrame} con columnas canónicas.
+
+        Devuelve
+        -------
+        CuboAgregado
+            Cubo con los datos de todos los archivos.
+        """
+        cubo = cls()
+        for nombre, df in dataframes.items():
+            cubo.actualizar_archivo(nombre, df)
+        return cubo
+
+    def _invalidar(self):
+        self._hechos = None
+        self._dimension = None
+        self._agregados = {}
+
+    def actualizar_archivo(self, nombre, df):
+        """
+        Agrega (o vuelve a agregar) los datos de un archivo de origen.
+
+        Solo se recorren las filas de este archivo; los totales consolidados se recalculan
+        a partir de los agregados parciales en la siguiente consulta.
+
+        Parámetros
+        ----------
+        nombre : str
+            Nombre del archivo de origen.
+        df : DataFrame
+            Datos del archivo con columnas canónicas.
+        """
+        self._hechos_por_archivo.pop(nombre, None)
+        self._dimension_por_archivo.pop(nombre, None)
+        self._invalidar()
+        if "codigo_snies" not in df.columns or "anio" not in df.columns:
+            return
+
+        metricas = [metrica for metrica in self.METRICAS if metrica in df.columns]
+        datos = pd.DataFrame({
+            "codigo_snies": df["codigo_snies"],
+            "anio": pd.to_numeric(df["anio"], errors="coerce"),
+            "semestre": pd.to_numeric(df["semestre"], errors="coerce") if "semestre" in df.columns else 0,
+        })
+        for metrica in metricas:
+            datos[metrica] = pd.to_numeric(df[metrica], errors="coerce")
+        self._hechos_por_archivo[nombre] = datos.groupby(self.GRANO)[metricas].sum()
+
+        atributos = [atributo for atributo in self.ATRIBUTOS if atributo in df.columns]
+        dimension = df[["codigo_snies"] + atributos].drop_duplicates("codigo_snies")
+        self._dimension_por_archivo[nombre] = dimension.astype({atributo: object for atributo in atributos})
+
+    def eliminar_archivo(self, nombre):
+        """
+        Quita del cubo los datos de un archivo de origen.
+
+        Parámetros
+        ----------
+        nombre : str
+            Nombre del archivo de origen.
+        """
+        self._hechos_por_archivo.pop(nombre, None)
+        self._dimension_por_archivo.pop(nombre, None)
+        self._invalidar()
+
+    def copia(self):
+        """
+        Devuelve un cubo independiente que comparte los agregados ya calculados.
+
+        Los agregados nunca se modifican en el lugar, por lo que la copia es barata y
+        los cambios posteriores en uno de los cubos no afectan al otro.
+        """
+        cubo = CuboAgregado()
+        cubo._hechos_por_archivo = dict(self._hechos_por_archivo)
+        cubo._dimension_por_archivo = dict(self._dimension_por_archivo)
+        cubo._hechos = self._hechos
+        cubo._dimension = self._dimension
+        cubo._agregados = dict(self._agregados)
+        return cubo
+
+    @property
+    def hechos(self):
+        if self._hechos is None:
+            if self._hechos_por_archivo:
+                hechos = pd.concat(self._hechos_por_archivo.values()).groupby(level=self.GRANO).sum()
+                hechos = hechos.reindex(columns=self.METRICAS).fillna(0).astype("int64")
+            else:
+                indice = pd.MultiIndex.from_arrays([[], [], []], names=self.GRANO)
+                hechos = pd.DataFrame(columns=self.METRICAS, index=indice, dtype="int64")
+            self._hechos = hechos.sort_index()
+        return self._hechos
+
+    @property
+    def dimension(self):
+        if self._dimension is None:
+            if self._dimension_por_archivo:
+                dimension = pd.concat(self._dimension_por_archivo.values(), ignore_index=True)
+                dimension = dimension.drop_duplicates("codigo_snies", keep="last")
+            else:
+                dimension = pd.DataFrame(columns=["codigo_snies"])
+            self._dimension = dimension.set_index("codigo_snies").sort_index()
+        return self._dimension
+
+    def _agregado(self, nivel, semestral):
+        """
+        Devuelve los totales de un nivel ordenados por su índice y las claves de su primer nivel.
+        """
+        if nivel not in self.NIVELES:
+            raise ValueError(f"Nivel de agregación no soportado: {nivel}")
+        clave = (nivel, semestral)
+        if clave not in self._agregados:
+            tiempo = ["anio", "semestre"] if semestral else ["anio"]
+            if nivel == "programa":
+                tabla = self.hechos if semestral else self.hechos.groupby(level=["codigo_snies", "anio"]).sum()
+            else:
+                columnas = self.NIVELES[nivel]
+                faltantes = [columna for columna in columnas if columna not in self.dimension.columns]
+                if faltantes:
+                    raise KeyError(f"El cubo no tiene las columnas necesarias para el nivel '{nivel}': {faltantes}")
+                base = self.hechos.reset_index().join(self.dimension[columnas], on="codigo_snies")
+                tabla = base.groupby(columnas + tiempo)[self.METRICAS].sum()
+            tabla = tabla.sort_index()
+            self._agregados[clave] = (tabla, np.asarray(tabla.index.get_level_values(0)))
+        return self._agregados[clave]
+
+    def consultar(self, nivel="programa", claves=None, anios=None, semestral=False):
+        """
+        Devuelve los totales de las métricas en un nivel de agregación.
+
+        Parámetros
+        ----------
+        nivel : str, opcional
+            "programa", "institucion", "departamento", "municipio", "metodologia" o
+            "nivel_formacion" (por defecto es "programa").
+        claves : iterable, opcional
+            Valores de la primera columna del nivel (por ejemplo, códigos SNIES) a consultar.
+            Si es None se devuelven todas.
+        anios : iterable, opcional
+            Años a conservar. Si es None se conservan todos.
+        semestral : bool, opcional
+            Si es True, los totales se separan por semestre (por defecto es False).
+
+        Devuelve
+        -------
+        DataFrame
+            Una fila por clave del nivel y periodo con las métricas sumadas. En el nivel
+            "programa" se incluye además la columna programa_academico.
+        """
+        tabla, valores_clave = self._agregado(nivel, semestral)
+        if claves is not None:
+            tramos = []
+            for valor in pd.unique(np.asarray(list(claves), dtype=object)):
+                inicio = np.searchsorted(valores_clave, valor, side="left")
+                fin = np.searchsorted(valores_clave, valor, side="right")
+                if fin > inicio:
+                    tramos.append(tabla.iloc[inicio:fin])
+            tabla = pd.concat(tramos) if tramos else tabla.iloc[0:0]
+        if anios is not None:
+            tabla = tabla[tabla.index.get_level_values("anio").isin(list(anios))]
+
+        resultado = tabla.reset_index()
+        if nivel == "programa" and "programa_academico" in self.dimension.columns:
+            resultado.insert(1, "programa_academico",
+                             resultado["codigo_snies"].map(self.dimension["programa_academico"]))
+        return resultado
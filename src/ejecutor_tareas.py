@@ -0,0 +1,250 @@
+import contextvars
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+
+class TareaCancelada(Exception):
+    """
+    Se lanza dentro de una tarea cuando se pidió cancelarla.
+    """
+
+
+class Tarea:
+    """
+    Trabajo en segundo plano enviado a EjecutorTareas.
+
+    La función de la tarea recibe la propia tarea como primer argumento y llama a
+    reportar_progreso entre lotes de trabajo; si se pidió cancelarla, reportar_progreso
+    lanza TareaCancelada y la tarea termina en ese punto.
+
+    Atributos
+    ----------
+    id : int
+        Identificador único de la tarea.
+    canal : str
+        Canal de la tarea (por ejemplo, "analisis"); una tarea nueva reemplaza a la anterior del mismo canal.
+    clave : hashable
+        Identifica los parámetros de la tarea; una tarea con la misma clave reutiliza el resultado.
+    estado : str
+        "pendiente", "ejecutando", "completada", "cancelada" o "error".
+    progreso : dict
+        Último avance reportado: completados, total y mensaje.
+    resultado : object
+        Valor devuelto por la función cuando estado es "completada".
+    error : Exception or None
+        Excepción lanzada por la función cuando estado es "error".
+
+    Métodos
+    -------
+    reportar_progreso(completados, total, mensaje=None)
+        Registra el avance y lanza TareaCancelada si se pidió cancelar.
+    cancelar()
+        Pide cancelar la tarea.
+    """
+
+    _ids = itertools.count(1)
+
+    def __init__(self, canal, clave):
+        self.id = next(self._ids)
+        self.canal = canal
+        self.clave = clave
+        self.estado = "pendiente"
+        self.progreso = {"completados": 0, "total": 0, "mensaje": None}
+        self.resultado = None
+        self.error = None
+        self.creada_en = time.time()
+        self.duracion = None
+        self._cancelar = threading.Event()
+        self._terminada = threading.Event()
+        self._future = None
+
+    @property
+    def terminada(self):
+        return self._terminada.is_set()
+
+    @property
+    def fraccion(self):
+        """
+        Avance entre 0 y 1 según el último progreso reportado.
+        """
+        total = self.progreso["total"]
+        return min(self.progreso["completados"] / total, 1.0) if total else 0.0
+
+    def reportar_progreso(self, completados, total, mensaje=None):
+        """
+        Registra el avance de la tarea.
+
+        Lanza
+        -----
+        TareaCancelada
+            Si se pidió cancelar la tarea.
+        """
+        self.progreso = {"completados": completados, "total": total, "mensaje": mensaje}
+        if self._cancelar.is_set():
+            raise TareaCancelada(f"La tarea {self.id} fue cancelada.")
+
+    def cancelar(self):
+        """
+        Pide cancelar la tarea. Si aún no empezó, no llega a ejecutarse.
+        """
+        self._cancelar.set()
+        if self._future is not None and self._future.cancel():
+            self._finalizar("cancelada")
+
+    def esperar(self, timeout=None):
+        """
+        Espera a que la tarea termine y devuelve True si terminó.
+        """
+        return self._terminada.wait(timeout)
+
+    def _ejecutar(self, funcion, args, kwargs):
+        if self._cancelar.is_set():
+            self._finalizar("cancelada")
+            return
+        self.estado = "ejecutando"
+        inicio = time.perf_counter()
+        try:
+            self.resultado = funcion(self, *args, **kwargs)
+            estado = "completada"
+        except TareaCancelada:
+            estado = "cancelada"
+        except Exception as e:
+            self.error = e
+            estado = "error"
+        self.duracion = time.perf_counter() - inicio
+        self._finalizar(estado)
+
+    def _finalizar(self, estado):
+        self.estado = estado
+        self._terminada.set()
+
+    def __repr__(self):
+        return f"Tarea(id={self.id}, canal={self.canal}, estado={self.estado}, progreso={self.progreso})"
+
+
+class EjecutorTareas:
+    """
+    Ejecuta tareas en segundo plano para una sesión, sin bloquear el hilo que las envía.
+
+    Cada canal tiene como máximo una tarea vigente: al enviar una tarea con parámetros
+    distintos, la anterior del mismo canal se cancela en lugar de acumularse. Los
+    resultados de las tareas completadas se guardan en una caché LRU por (canal, clave),
+    de modo que volver a una selección anterior no repite el cálculo. El pool de hilos
+    puede compartirse entre varios ejecutores (uno por sesión de Streamlit).
+
+    Atributos
+    ----------
+    max_resultados : int
+        Número máximo de resultados guardados.
+
+    Métodos
+    -------
+    enviar(canal, clave, funcion, *args, **kwargs)
+        Devuelve la tarea del canal para esa clave, iniciándola si hace falta.
+    obtener(canal)
+        Devuelve la tarea vigente de un canal.
+    cancelar(canal=None)
+        Cancela la tarea vigente de un canal, o de todos.
+    limpiar_resultados()
+        Descarta los resultados guardados.
+    """
+
+    def __init__(self, pool=None, max_workers=2, max_resultados=16):
+        """
+        Parámetros
+        ----------
+        pool : ThreadPoolExecutor, opcional
+            Pool compartido. Si es None se crea uno propio con max_workers hilos.
+        max_workers : int, opcional
+            Hilos del pool propio (por defecto es 2).
+        max_resultados : int, opcional
+            Resultados guardados en la caché (por defecto es 16).
+        """
+        self._pool = pool or ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="EjecutorTareas")
+        self.max_resultados = max_resultados
+        self._tareas = {}
+        self._resultados = OrderedDict()
+        self._lock = threading.RLock()
+
+    def enviar(self, canal, clave, funcion, *args, reintentar=False, **kwargs):
+        """
+        Devuelve la tarea del canal para esa clave, iniciándola si hace falta.
+
+        Si la tarea vigente del canal tiene la misma clave se devuelve tal cual (en curso
+        o terminada). Si la clave ya tiene un resultado guardado se devuelve una tarea
+        completada sin ejecutar nada. En otro caso la tarea vigente se cancela y se inicia
+        una nueva con funcion(tarea, *args, **kwargs).
+
+        Parámetros
+        ----------
+        canal : str
+            Canal de la tarea.
+        clave : hashable
+            Identificador de los parámetros de la tarea.
+        funcion : callable
+            Función a ejecutar; recibe la tarea como primer argumento.
+        reintentar : bool, opcional
+            Si es True, una tarea con la misma clave cancelada o con error se vuelve a iniciar.
+
+        Devuelve
+        -------
+        Tarea
+            Tarea vigente del canal.
+        """
+        with self._lock:
+            actual = self._tareas.get(canal)
+            if actual is not None and actual.clave == clave:
+                if not (reintentar and actual.estado in ("cancelada", "error")):
+                    return actual
+
+            if actual is not None:
+                actual.cancelar()
+
+            tarea = Tarea(canal, clave)
+            if (canal, clave) in self._resultados:
+                self._resultados.move_to_end((canal, clave))
+                tarea.resultado = self._resultados[(canal, clave)]
+                tarea._finalizar("completada")
+            else:
+                # La tarea corre con el contexto de quien la envía (por ejemplo, la configuración
+                # del Instrumentador de la sesión)
+                contexto = contextvars.copy_context()
+                tarea._future = self._pool.submit(contexto.run, tarea._ejecutar, funcion, args, kwargs)
+                tarea._future.add_done_callback(lambda _, tarea=tarea: self._guardar_resultado(tarea))
+            self._tareas[canal] = tarea
+            return tarea
+
+    def _guardar_resultado(self, tarea):
+        if tarea.estado != "completada":
+            return
+        with self._lock:
+            self._resultados[(tarea.canal, tarea.clave)] = tarea.resultado
+            self._resultados.move_to_end((tarea.canal, tarea.clave))
+            while len(self._resultados) > self.max_resultados:
+                self._resultados.popitem(last=False)
+
+    def obtener(self, canal):
+        """
+        Devuelve la tarea vigente de un canal, o None si no hay ninguna.
+        """
+        return self._tareas.get(canal)
+
+    def cancelar(self, canal=None):
+        """
+        Cancela la tarea vigente de un canal, o de todos si canal es None.
+        """
+        with self._lock:
+            tareas = list(self._tareas.values()) if canal is None else [self._tareas.get(canal)]
+        for tarea in tareas:
+            if tarea is not None and not tarea.terminada:
+                tarea.cancelar()
+
+    def limpiar_resultados(self):
+        """
+        Descarta los resultados guardados.
+        """
+        with self._lock:
+            self._resultados.clear()
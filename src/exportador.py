@@ -0,0 +1,226 @@
+import gzip
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+try:
+    import xlsxwriter
+except ImportError:
+    xlsxwriter = None
+
+
+class Exportador:
+    """
+    Serializa resultados para descarga en Excel, CSV, CSV comprimido, JSON, JSON Lines o Parquet.
+
+    La serialización se hace solo cuando se pide un formato y por lotes de filas, de modo
+    que nunca se construye en memoria una cadena con todo el resultado. Los bytes
+    generados se guardan en una caché LRU indexada por el hash del contenido del
+    resultado y el formato, así una segunda descarga del mismo resultado no lo vuelve a
+    serializar.
+
+    Atributos
+    ----------
+    tamano_lote : int
+        Filas por lote al escribir.
+    max_bytes : int
+        Tamaño máximo de la caché de bytes serializados.
+
+    Métodos
+    -------
+    hash_resultado(df)
+        Calcula el hash del contenido de un DataFrame.
+    exportar(df, formato, clave=None)
+        Devuelve los bytes del DataFrame en el formato pedido.
+    escribir(df, formato, destino)
+        Escribe el DataFrame por lotes en una ruta o un archivo binario abierto.
+    formatos_disponibles()
+        Devuelve los formatos soportados con las dependencias instaladas.
+    """
+
+    # formato: (extensión, tipo MIME)
+    FORMATOS = {
+        "xlsx": (".xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+        "csv": (".csv", "text/csv"),
+        "csv.gz": (".csv.gz", "application/gzip"),
+        "json": (".json", "application/json"),
+        "jsonl": (".jsonl", "application/x-ndjson"),
+        "parquet": (".parquet", "application/vnd.apache.parquet"),
+    }
+
+    def __init__(self, tamano_lote=100000, max_bytes=256 * 1024 * 1024):
+        """
+        Inicializa el exportador con una caché vacía.
+
+        Parámetros
+        ----------
+        tamano_lote : int, opcional
+            Filas por lote al escribir (por defecto es 100000).
+        max_bytes : int, opcional
+            Bytes máximos que ocupa la caché de resultados serializados (por defecto 256 MB).
+        """
+        self.tamano_lote = tamano_lote
+        self.max_bytes = max_bytes
+        self._cache = OrderedDict()
+        self._bytes_en_cache = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def hash_resultado(df):
+        """
+        Calcula el hash del contenido de un DataFrame (valores, índice, columnas y tipos).
+
+        Parámetros
+        ----------
+        df : DataFrame
+            Resultado a exportar.
+
+        Devuelve
+        -------
+        str
+            Hash hexadecimal.
+        """
+        digest = hashlib.sha256()
+        digest.update(repr([(str(col), str(dtype)) for col, dtype in df.dtypes.items()]).encode("utf-8"))
+        digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+        return digest.hexdigest()
+
+    def formatos_disponibles(self):
+        """
+        Devuelve los formatos soportados con las dependencias instaladas.
+        """
+        return [formato for formato in self.FORMATOS if formato != "parquet" or pa is not None]
+
+    def exportar(self, df, formato, clave=None):
+        """
+        Devuelve los bytes del DataFrame en el formato pedido, usando la caché si es posible.
+
+        Parámetros
+        ----------
+        df : DataFrame
+            Resultado a exportar.
+        formato : str
+            Uno de FORMATOS.
+        clave : str, opcional
+            Hash del resultado si ya se calculó (ver hash_resultado).
+
+        Devuelve
+        -------
+        bytes
+            Contenido del archivo.
+        """
+        clave = (clave or self.hash_resultado(df), formato)
+        with self._lock:
+            if clave in self._cache:
+                self._cache.move_to_end(clave)
+                return self._cache[clave]
+
+        buffer = io.BytesIO()
+        self.escribir(df, formato, buffer)
+        contenido = buffer.getvalue()
+
+        with self._lock:
+            if clave not in self._cache and len(contenido) <= self.max_bytes:
+                self._cache[clave] = contenido
+                self._bytes_en_cache += len(contenido)
+                while self._bytes_en_cache > self.max_bytes:
+                    _, descartado = self._cache.popitem(last=False)
+                    self._bytes_en_cache -= len(descartado)
+        return contenido
+
+    def escribir(self, df, formato, destino):
+        """
+        Escribe el DataFrame por lotes de tamano_lote filas.
+
+        Parámetros
+        ----------
+        df : DataFrame
+            Resultado a exportar.
+        formato : str
+            Uno de FORMATOS.
+        destino : str or file-like
+            Ruta del archivo o archivo binario abierto.
+
+        Lanza
+        -----
+        ValueError
+            Si el formato no está soportado.
+        ImportError
+            Si el formato requiere una dependencia que no está instalada.
+        """
+        if formato not in self.FORMATOS:
+            raise ValueError(f"Formato de exportación no soportado: {formato}")
+        if isinstance(destino, str):
+            with open(destino, "wb") as archivo:
+                self.escribir(df, formato, archivo)
+            return
+
+        if formato == "csv":
+            self._escribir_csv(df, destino)
+        elif formato == "csv.gz":
+            with gzip.GzipFile(fileobj=destino, mode="wb", compresslevel=6) as comprimido:
+                self._escribir_csv(df, comprimido)
+        elif formato == "json":
+            self._escribir_json(df, destino)
+        elif formato == "jsonl":
+            for lote in self._lotes(df):
+                destino.write(lote.to_json(orient="records", lines=True, force_ascii=False).encode("utf-8"))
+        elif formato == "parquet":
+            self._escribir_parquet(df, destino)
+        else:
+            self._escribir_xlsx(df, destino)
+
+    def _lotes(self, df):
+        for inicio in range(0, len(df), self.tamano_lote):
+            yield df.iloc[inicio:inicio + self.tamano_lote]
+
+    def _escribir_csv(self, df, destino):
+        destino.write(df.iloc[0:0].to_csv(index=False).encode("utf-8"))
+        for lote in self._lotes(df):
+            destino.write(lote.to_csv(index=False, header=False).encode("utf-8"))
+
+    def _escribir_json(self, df, destino):
+        destino.write(b"[")
+        primero = True
+        for lote in self._lotes(df):
+            # Cada lote se serializa como lista; se quitan sus corchetes y se unen con comas
+            registros = lote.to_json(orient="records", force_ascii=False)[1:-1]
+            if registros:
+                destino.write((registros if primero else "," + registros).encode("utf-8"))
+                primero = False
+        destino.write(b"]")
+
+    def _escribir_parquet(self, df, destino):
+        if pa is None:
+            raise ImportError("La exportación a Parquet requiere pyarrow.")
+        esquema = pa.Schema.from_pandas(df, preserve_index=False)
+        with pq.ParquetWriter(destino, esquema) as escritor:
+            for lote in self._lotes(df):
+                escritor.write_table(pa.Table.from_pandas(lote, schema=esquema, preserve_index=False))
+
+    def _escribir_xlsx(self, df, destino):
+        if xlsxwriter is None:
+            # Sin xlsxwriter se usa el escritor de pandas con openpyxl
+            with pd.ExcelWriter(destino, engine="openpyxl") as writer:
+                df.to_excel(writer, index=False)
+            return
+
+        # constant_memory escribe cada fila al disco temporal en cuanto se completa
+        libro = xlsxwriter.Workbook(destino, {"constant_memory": True, "in_memory": False})
+        hoja = libro.add_worksheet()
+        hoja.write_row(0, 0, [str(columna) for columna in df.columns])
+        fila = 1
+        for lote in self._lotes(df):
+            valores = lote.astype(object).where(lote.notna(), None)
+            for registro in valores.itertuples(index=False, name=None):
+                hoja.write_row(fila, 0, registro)
+                fila += 1
+        libro.close()
@@ -0,0 +1,170 @@
+import os
+import numpy as np
+import pandas as pd
+
+# Archivos que publica el SNIES y la métrica canónica que contiene cada uno
+ARCHIVOS_METRICAS = {
+    "inscritos": "inscritos",
+    "admitidos": "admitidos",
+    "matriculados": "total_matriculados",
+    "primer_curso": "nuevos_matriculados",
+    "graduados": "graduados",
+}
+
+PROGRAMAS_BASE = [
+    "INGENIERÍA DE SISTEMAS", "INGENIERÍA CIVIL", "INGENIERÍA INDUSTRIAL", "ADMINISTRACIÓN DE EMPRESAS",
+    "CONTADURÍA PÚBLICA", "DERECHO", "MEDICINA", "ENFERMERÍA", "PSICOLOGÍA", "COMUNICACIÓN SOCIAL",
+    "LICENCIATURA EN MATEMÁTICAS", "ECONOMÍA", "ARQUITECTURA", "DISEÑO GRÁFICO", "BIOLOGÍA",
+    "TECNOLOGÍA EN DESARROLLO DE SOFTWARE", "TÉCNICA PROFESIONAL EN LOGÍSTICA",
+    "ESPECIALIZACIÓN EN GERENCIA DE PROYECTOS", "MAESTRÍA EN CIENCIA DE DATOS", "DOCTORADO EN EDUCACIÓN",
+]
+NIVELES_FORMACION = ["UNIVERSITARIA", "TECNOLÓGICA", "ESPECIALIZACIÓN UNIVERSITARIA", "MAESTRÍA", "DOCTORADO"]
+GEOGRAFIA = {
+    "BOGOTÁ D.C.": ["BOGOTÁ D.C."],
+    "ANTIOQUIA": ["MEDELLÍN", "ENVIGADO", "RIONEGRO"],
+    "VALLE DEL CAUCA": ["CALI", "PALMIRA", "TULUÁ"],
+    "ATLÁNTICO": ["BARRANQUILLA", "SOLEDAD"],
+    "SANTANDER": ["BUCARAMANGA", "FLORIDABLANCA"],
+}
+MODALIDADES = ["PRESENCIAL", "VIRTUAL", "A DISTANCIA"]
+SEXOS = ["HOMBRE", "MUJER"]
+
+
+def generar_tabla(num_instituciones=20, programas_por_institucion=15, anios=range(2019, 2024),
+                  semestres=(1, 2), sexos=SEXOS, modalidades=MODALIDADES, semilla=0):
+    """
+    Genera una tabla sintética de programas SNIES con los nombres de columnas canónicos.
+
+    Cada programa pertenece a una institución, tiene una modalidad y un municipio de
+    oferta, y aparece una vez por año, semestre y sexo con un valor para cada métrica.
+
+    Parámetros
+    ----------
+    num_instituciones : int, opcional
+        Número de instituciones (por defecto es 20).
+    programas_por_institucion : int, opcional
+        Programas ofrecidos por cada institución (por defecto es 15).
+    anios : iterable, opcional
+        Años cubiertos por los datos (por defecto es 2019 a 2023).
+    semestres : tuple, opcional
+        Semestres de cada año (por defecto es (1, 2)).
+    sexos : list, opcional
+        Valores de la columna sexo.
+    modalidades : list, opcional
+        Valores de la columna metodologia.
+    semilla : int, opcional
+        Semilla del generador aleatorio.
+
+    Devuelve
+    -------
+    DataFrame
+        Una fila por programa, año, semestre y sexo con todas las métricas.
+    """
+    rng = np.random.default_rng(semilla)
+    num_programas = num_instituciones * programas_por_institucion
+    departamentos = list(GEOGRAFIA)
+
+    instituciones = pd.DataFrame({
+        "codigo_institucion": np.arange(1101, 1101 + num_instituciones),
+        "institucion": [f"INSTITUCIÓN UNIVERSITARIA {i + 1}" for i in range(num_instituciones)],
+        "departamento_oferta_programa": rng.choice(departamentos, size=num_instituciones),
+    })
+    programas = instituciones.loc[np.repeat(instituciones.index, programas_por_institucion)].reset_index(drop=True)
+    programas["codigo_snies"] = np.arange(1, num_programas + 1)
+    bases = rng.integers(0, len(PROGRAMAS_BASE), size=num_programas)
+    programas["programa_academico"] = [
+        PROGRAMAS_BASE[b] + ("" if i % 3 == 0 else f" {i % 7 + 1}") for i, b in enumerate(bases)
+    ]
+    programas["nivel_formacion"] = rng.choice(NIVELES_FORMACION, size=num_programas)
+    programas["metodologia"] = rng.choice(list(modalidades), size=num_programas)
+    programas["municipio_oferta_programa"] = [
+        GEOGRAFIA[d][rng.integers(0, len(GEOGRAFIA[d]))] for d in programas["departamento_oferta_programa"]
+    ]
+
+    periodos = pd.MultiIndex.from_product([list(anios), list(semestres), list(sexos)],
+                                          names=["anio", "semestre", "sexo"]).to_frame(index=False)
+    tabla = programas.merge(periodos, how="cross")
+
+    # Embudo plausible: inscritos >= admitidos >= primer curso; matriculados y graduados aparte
+    tamanos = rng.lognormal(mean=3.5, sigma=1.0, size=num_programas)
+    escala = np.repeat(tamanos, len(periodos))
+    filas = len(tabla)
+    tabla["inscritos"] = rng.poisson(escala * 2)
+    tabla["admitidos"] = rng.binomial(tabla["inscritos"], 0.7)
+    tabla["nuevos_matriculados"] = rng.binomial(tabla["admitidos"], 0.8)
+    tabla["total_matriculados"] = rng.poisson(escala * 4, size=filas)
+    tabla["graduados"] = rng.poisson(escala * 0.5, size=filas)
+    return tabla
+
+
+def generar_dataframes(tabla):
+    """
+    Divide una tabla sintética en un DataFrame por métrica y año, como los publica el SNIES.
+
+    Parámetros
+    ----------
+    tabla : DataFrame
+        Tabla generada con generar_tabla.
+
+    Devuelve
+    -------
+    dict
+        Diccionario {nombre_archivo: DataFrame} con nombres como "inscritos_2022.xlsx".
+    """
+    atributos = [col for col in tabla.columns if col not in ARCHIVOS_METRICAS.values()]
+    dataframes = {}
+    for anio, datos_anio in tabla.groupby("anio"):
+        for archivo, metrica in ARCHIVOS_METRICAS.items():
+            dataframes[f"{archivo}_{anio}.xlsx"] = datos_anio[atributos + [metrica]].reset_index(drop=True)
+    return dataframes
+
+
+def encabezados_originales(df, column_synonyms):
+    """
+    Devuelve una copia del DataFrame con los encabezados que usan los archivos del SNIES.
+
+    Cada nombre canónico se reemplaza por su primer sinónimo, de modo que al cargar los
+    datos se ejercita el renombrado de columnas.
+
+    Parámetros
+    ----------
+    df : DataFrame
+        DataFrame con columnas canónicas.
+    column_synonyms : dict
+        Sinónimos de GestorDatos.
+
+    Devuelve
+    -------
+    DataFrame
+        DataFrame con los encabezados originales.
+    """
+    return df.rename(columns={col: column_synonyms[col][0] for col in df.columns if column_synonyms.get(col)})
+
+
+def escribir_libros(dataframes, directorio, column_synonyms=None):
+    """
+    Escribe cada DataFrame como un libro Excel en el directorio indicado.
+
+    Parámetros
+    ----------
+    dataframes : dict
+        Diccionario {nombre_archivo: DataFrame}.
+    directorio : str
+        Carpeta de destino; se crea si no existe.
+    column_synonyms : dict, opcional
+        Si se indica, las columnas se escriben con sus encabezados originales del SNIES.
+
+    Devuelve
+    -------
+    list
+        Rutas de los archivos escritos.
+    """
+    os.makedirs(directorio, exist_ok=True)
+    rutas = []
+    for nombre, df in dataframes.items():
+        if column_synonyms is not None:
+            df = encabezados_originales(df, column_synonyms)
+        ruta = os.path.join(directorio, nombre)
+        df.to_excel(ruta, index=False)
+        rutas.append(ruta)
+    return rutas
@@ -1,6 +1,33 @@
+import numpy as np
 import pandas as pd
+import hashlib
+import copy
 import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from openpyxl import load_workbook
 from manejador_excepciones import ManejadorExcepciones
+from cache_columnar import CacheColumnar
+from cubo_agregado import CuboAgregado
+from indice_busqueda import IndiceTrigramas, buscar_en_dataframes
+from resolutor_columnas import ResolutorColumnas, cargar_sinonimos
+from instrumentacion import Instrumentador
+from motor_sql import MotorSQL
+from programa import DimensionProgramas
+
+
+def _procesar_archivo_en_proceso(gestor, file, streaming, columns, instrumentacion):
+    """
+    Punto de entrada de los procesos trabajadores de load_data.
+
+    Se define a nivel de módulo para que pueda serializarse con pickle. Devuelve el
+    resultado de process_file junto con los registros de Instrumentador del archivo.
+    """
+    # El trabajador puede haber heredado registros del proceso principal al crearse
+    Instrumentador.limpiar()
+    Instrumentador.configurar(*instrumentacion)
+    return gestor.process_file(file, streaming, columns), Instrumentador.tomar_registros()
 
 class GestorDatos:
     """
@@ -10,8 +37,29 @@ class GestorDatos:
     -------
     normalizar_columnas(df)
         Normaliza los nombres de las columnas de un DataFrame.
-    load_data()
+    load_data(parallel=False, max_workers=None, streaming=False, columns=None, incremental=False,
+              progress_callback=None)
         Carga los datos de los archivos Excel en el directorio especificado.
+    detect_changes(files)
+        Compara los archivos del directorio con el manifiesto de la última carga.
+    require_columns(columns)
+        Declara columnas canónicas que necesita un consumidor de los datos.
+    resolve_projection(columns=None)
+        Calcula las columnas canónicas que se deben cargar.
+    process_file(file, streaming=False, columns=None)
+        Lee, renombra y valida un único archivo Excel.
+    read_header(file_path)
+        Lee la fila de encabezados de un archivo Excel.
+    read_excel_chunks(file_path, chunk_size=None, columns=None)
+        Lee un archivo Excel por lotes de filas ya renombrados y tipados.
+    get_cache_entries()
+        Devuelve los metadatos de las entradas de la caché columnar.
+    purge_cache(file_name=None, only_stale=False)
+        Elimina entradas de la caché columnar.
+    get_column_resolver()
+        Devuelve el resolutor precompilado de sinónimos de columnas.
+    add_column_synonyms(synonyms)
+        Agrega sinónimos de columnas y descarta el resolutor compilado.
     rename_columns(df)
         Renombra las columnas de un DataFrame según los sinónimos definidos.
     get_optional_columns(file_name)
@@ -20,25 +68,121 @@ class GestorDatos:
         Obtiene todas las columnas disponibles en los datos cargados.
     show_column_info(data)
         Muestra información de las columnas de los DataFrames cargados.
-    buscar_por_palabra_clave(palabra_clave, dataframes)
+    add_dataframe(file_name, df)
+        Registra un DataFrame cargado y lo agrega a la tabla maestra.
+    remove_dataframe(file_name)
+        Quita un archivo cargado de la tabla maestra y de las estructuras derivadas.
+    get_master_table()
+        Devuelve la tabla maestra con los datos de todos los archivos cargados.
+    get_cube()
+        Devuelve el cubo de totales precalculados por programa, año y semestre.
+    get_master_index()
+        Devuelve el índice invertido de programa_academico sobre la tabla maestra.
+    get_program_dimension()
+        Devuelve la dimensión de programas de los datos cargados, uno por codigo_snies.
+    get_sql_engine(source="memory", engine=None)
+        Devuelve un motor SQL embebido con los datos cargados registrados.
+    snapshot()
+        Devuelve una copia de solo lectura de los datos cargados.
+    publish_shared(store)
+        Publica la tabla maestra en un almacén compartido mapeado en memoria.
+    open_shared(store)
+        Carga los datos desde un almacén compartido sin leer los archivos Excel.
+    apply_dtype_schema(df)
+        Convierte las columnas de un DataFrame a los tipos compactos del esquema.
+    get_memory_report()
+        Devuelve la memoria ocupada por cada archivo antes y después de aplicar el esquema.
+    buscar_por_palabra_clave(palabra_clave, dataframes=None, operador="and", prefijo=True)
         Busca programas académicos por palabra clave en los DataFrames cargados.
+    buscar_similares(palabra_clave, umbral=0.3, top_k=20, modo="palabra")
+        Busca programas académicos con nombres parecidos a la palabra clave.
     """
 
-    def __init__(self, ruta_directorio):
+    # Atributos de ejecución que no se envían a los procesos trabajadores
+    _RUNTIME_STATE = {
+        "search_indexes": dict,
+        "data": dict,
+        "_file_columns": dict,
+        "_master_parts": list,
+        "_master_table": lambda: None,
+        "master_index": lambda: None,
+        "cube": lambda: None,
+        "program_dimension": lambda: None,
+        "manifest": dict,
+        "sql_engines": dict,
+    }
+
+    # Columnas que se alinean como numéricas al consolidar archivos con tipos distintos
+    NUMERIC_PREFIXES = ("codigo_", "id_")
+
+    # Archivo JSON con sinónimos adicionales que se carga si existe y no se indica otro
+    DEFAULT_SYNONYMS_FILE = "../docs/config/sinonimos_columnas.json"
+
+    def __init__(self, ruta_directorio, max_workers=None, cache_dir=None, synonyms_file=None):
 
         self.ruta_directorio = ruta_directorio
 
+        # Caché columnar de los archivos ya procesados (desactivada si cache_dir es None)
+        self.cache = CacheColumnar(cache_dir) if cache_dir else None
+
+        # Número de procesos para la carga paralela (None usa todos los núcleos)
+        self.max_workers = max_workers
+
+        # Tiempo en segundos que tomó procesar cada archivo en la última carga
+        self.load_timings = {}
+
+        # Bytes ocupados por cada archivo antes y después de aplicar dtype_schema
+        self.memory_report = {}
+
+        # Filas por lote en la lectura por streaming
+        self.chunk_size = 50000
+
+        # Índices invertidos de programa_academico por archivo, construidos en cada carga
+        self.search_indexes = {}
+
+        # Archivos cargados y tabla maestra consolidada (se construye a medida que se cargan).
+        # Una vez consolidada, cada DataFrame de data es una vista de la tabla maestra con
+        # las columnas que tenía el archivo (_file_columns), de modo que no hay dos copias
+        self.data = {}
+        self._file_columns = {}
+        self._master_parts = []
+        self._master_table = None
+        self.master_index = None
+
+        # Cubo de totales precalculados; se construye en la primera consulta y luego se
+        # actualiza archivo por archivo
+        self.cube = None
+
+        # Dimensión de programas (uno por codigo_snies); se construye en la primera consulta
+        # y luego se actualiza archivo por archivo
+        self.program_dimension = None
+
+        # Motores SQL con los datos cargados registrados, por origen (ver get_sql_engine)
+        self.sql_engines = {}
+
+        # Proyección de columnas de la última carga (parte de la clave de la caché columnar)
+        self.loaded_columns = None
+
+        # Manifiesto de los archivos ingeridos: {archivo: {path, size, mtime_ns, hash}}
+        self.manifest = {}
+
+        # Archivos agregados, modificados y eliminados en la última carga
+        self.last_changes = {"agregados": [], "modificados": [], "eliminados": []}
+
         self.min_required_columns = [
             "codigo_institucion", "institucion", "codigo_snies", "programa_academico",
             "anio", "semestre"
         ]
 
+        # Columna opcional de cada tipo de archivo: {columna_canonica: [fragmento_del_nombre, ...]}.
+        # Se usa la primera columna cuyo fragmento aparece en el nombre, así que nuevos_matriculados
+        # va antes que total_matriculados ("matriculados_primer_curso_2022.xlsx").
         self.optional_columns = {
             "admitidos": ["admitidos"],
             "graduados": ["graduados"],
             "inscritos": ["inscritos"],
-            "total_matriculados": ["matriculados"],
-            "nuevos_matriculados": ["primer_curso"]
+            "nuevos_matriculados": ["primer_curso"],
+            "total_matriculados": ["matriculados"]
         }
 
         # Diccionario de sinónimos
@@ -88,6 +232,37 @@ class GestorDatos:
             "nuevos_matriculados": ["MATRICULADOS PRIMER CURSO","PRIMER CURSO"],
         }
 
+        # Resolutor compilado a partir de column_synonyms (ver get_column_resolver)
+        self._column_resolver = None
+
+        # Sinónimos adicionales definidos fuera del código: {nombre_canonico: [sinonimo, ...]}
+        if synonyms_file is None and os.path.exists(self.DEFAULT_SYNONYMS_FILE):
+            synonyms_file = self.DEFAULT_SYNONYMS_FILE
+        if synonyms_file is not None:
+            self.add_column_synonyms(cargar_sinonimos(synonyms_file))
+
+        # Encabezados sin sinónimo de cada archivo procesado en la última carga
+        self.unmapped_columns = {}
+
+        # Esquema de tipos compactos por nombre canónico:
+        # "category" para texto de baja cardinalidad, "unsigned" para años, semestres y
+        # conteos, y "nullable_int" para códigos e identificadores.
+        self.dtype_schema = {}
+        for column in self.column_synonyms:
+            if column in ("anio", "semestre") or column in self.optional_columns:
+                self.dtype_schema[column] = "unsigned"
+            elif column.startswith(self.NUMERIC_PREFIXES) or column == "ies_padre":
+                self.dtype_schema[column] = "nullable_int"
+            else:
+                self.dtype_schema[column] = "category"
+
+        # Columnas que usan Analizador y Visualizador; la lectura por streaming las usa
+        # cuando no se declaró ninguna proyección
+        self.analysis_columns = self.min_required_columns + list(self.optional_columns) + ["metodologia", "sexo"]
+
+        # Columnas declaradas por los consumidores con require_columns (vacío carga todas)
+        self.required_columns = set()
+
     def normalizar_columnas(self, df):
         """
         Normaliza los nombres de las columnas de un DataFrame.
@@ -106,43 +281,934 @@ class GestorDatos:
         return df
 
     @ManejadorExcepciones.manejar_errores
-    def load_data(self):
+    @Instrumentador.medir("load_data")
+    def load_data(self, parallel=False, max_workers=None, streaming=False, columns=None, incremental=False,
+                  progress_callback=None):
         """
         Carga los datos de los archivos Excel en el directorio especificado.
 
+        Parámetros
+        ----------
+        parallel : bool, opcional
+            Si es True, los archivos se procesan en un pool de procesos (por defecto es False).
+        max_workers : int, opcional
+            Número de procesos del pool. Si es None se usa self.max_workers.
+        streaming : bool, opcional
+            Si es True, cada archivo se lee por lotes de self.chunk_size filas (por defecto es False).
+            Sin proyección declarada solo se conservan las columnas de self.analysis_columns.
+        columns : list, opcional
+            Columnas canónicas a cargar además de las declaradas con require_columns y de
+            las mínimas requeridas. Si no hay ninguna proyección se cargan todas las columnas.
+        incremental : bool, opcional
+            Si es True y ya hay datos cargados, solo se leen los archivos nuevos o modificados
+            según el manifiesto y se quitan los datos de los archivos eliminados (por defecto es False).
+            Si la proyección o los sinónimos cambiaron desde la última carga se recargan todos.
+        progress_callback : callable, opcional
+            Función progress_callback(file, completed, total) que se llama cada vez que
+            termina de procesarse un archivo.
+
         Devuelve
         -------
         dict
             Diccionario donde las claves son los nombres de los archivos y los valores son los DataFrames cargados.
         """
-        data = {}
-        for file in os.listdir(self.ruta_directorio):
-            if file.endswith('.xlsx'):
-                file_path = os.path.join(self.ruta_directorio, file)
-                try:
-                    df = pd.read_excel(file_path, header=0)
+        files = sorted(file for file in os.listdir(self.ruta_directorio) if file.endswith('.xlsx'))
+        columns = self.resolve_projection(columns)
+        if streaming and columns is None:
+            columns = sorted(self.analysis_columns)
+        self.loaded_columns = columns
+
+        # Los datos cargados con otra configuración no se pueden combinar con los nuevos
+        config = CacheColumnar.hash_configuracion(self._cache_config(columns))
+        incremental = (incremental and bool(self.manifest)
+                       and all(entry.get("config") == config for entry in self.manifest.values()))
+        if incremental:
+            changes, manifest = self.detect_changes(files)
+            to_load = changes["agregados"] + changes["modificados"]
+        else:
+            manifest = {file: self._fingerprint(file) for file in files}
+            changes = {"agregados": files, "modificados": [], "eliminados": []}
+            to_load = files
+        for entry in manifest.values():
+            entry["config"] = config
+
+        results = {}
+        if parallel and len(to_load) > 1:
+            workers = max_workers or self.max_workers or os.cpu_count()
+            instrumentacion = (Instrumentador.activo, Instrumentador.midiendo_memoria())
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = {executor.submit(_procesar_archivo_en_proceso, self, file, streaming, columns,
+                                           instrumentacion): file
+                           for file in to_load}
+                for future in as_completed(futures):
+                    results[futures[future]], registros = future.result()
+                    Instrumentador.agregar_registros(registros)
+                    if progress_callback is not None:
+                        progress_callback(futures[future], len(results), len(to_load))
+        else:
+            for file in to_load:
+                results[file] = self.process_file(file, streaming, columns)
+                if progress_callback is not None:
+                    progress_callback(file, len(results), len(to_load))
+
+        if incremental:
+            # Se trabaja sobre un diccionario nuevo para que las referencias a la carga
+            # anterior no cambien
+            self.data = dict(self.data)
+            for file in changes["modificados"] + changes["eliminados"]:
+                self.remove_dataframe(file)
+                self.load_timings.pop(file, None)
+                self.memory_report.pop(file, None)
+                self.unmapped_columns.pop(file, None)
+        else:
+            self.reset_data()
+            self.load_timings = {}
+            self.memory_report = {}
+            self.unmapped_columns = {}
+        self.manifest = manifest
+        self.last_changes = changes
+
+        for file in to_load:
+            df, messages, elapsed, memory, unmapped = results[file]
+            self.load_timings[file] = elapsed
+            if memory is not None:
+                self.memory_report[file] = memory
+            if unmapped is not None:
+                self.unmapped_columns[file] = unmapped
+            for message in messages:
+                print(message)
+            if df is not None:
+                self.add_dataframe(file, df)
+        # Consolida la tabla maestra para que data quede con vistas de ella y no con copias
+        self.get_master_table()
+        return self.data
+
+    def _fingerprint(self, file, previous=None):
+        """
+        Calcula la entrada del manifiesto de un archivo.
+
+        Si se pasa la entrada anterior y el tamaño y la fecha de modificación no cambiaron,
+        se reutiliza su hash sin volver a leer el archivo.
+        """
+        file_path = os.path.join(self.ruta_directorio, file)
+        stat = os.stat(file_path)
+        entry = {"path": os.path.abspath(file_path), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        if previous is not None and previous["size"] == entry["size"] and previous["mtime_ns"] == entry["mtime_ns"]:
+            entry["hash"] = previous["hash"]
+            return entry
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as handle:
+            for block in iter(lambda: handle.read(1 << 20), b""):
+                digest.update(block)
+        entry["hash"] = digest.hexdigest()
+        return entry
+
+    def detect_changes(self, files):
+        """
+        Compara los archivos del directorio con el manifiesto de la última carga.
+
+        Solo se vuelve a calcular el hash de los archivos cuyo tamaño o fecha de
+        modificación cambió; un archivo cuyo contenido no cambió no se considera modificado.
+
+        Parámetros
+        ----------
+        files : list
+            Nombres de los archivos presentes en el directorio.
+
+        Devuelve
+        -------
+        tuple
+            (diccionario con las listas "agregados", "modificados" y "eliminados",
+            manifiesto actualizado).
+        """
+        manifest = {}
+        changes = {"agregados": [], "modificados": [], "eliminados": []}
+        for file in files:
+            previous = self.manifest.get(file)
+            manifest[file] = self._fingerprint(file, previous)
+            if previous is None:
+                changes["agregados"].append(file)
+            elif manifest[file]["hash"] != previous["hash"]:
+                changes["modificados"].append(file)
+        changes["eliminados"] = [file for file in self.manifest if file not in manifest]
+        return changes, manifest
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        for attribute, factory in self._RUNTIME_STATE.items():
+            state[attribute] = factory()
+        return state
+
+    def require_columns(self, columns):
+        """
+        Declara columnas canónicas que necesita un consumidor de los datos.
+
+        Las columnas declaradas se suman a la proyección de las siguientes cargas.
+
+        Parámetros
+        ----------
+        columns : iterable
+            Nombres canónicos (claves de column_synonyms) o sinónimos de las columnas.
+        """
+        self.required_columns.update(self._canonical_names(columns))
+
+    def resolve_projection(self, columns=None):
+        """
+        Calcula las columnas canónicas que se deben cargar.
+
+        Parámetros
+        ----------
+        columns : iterable, opcional
+            Columnas adicionales para esta carga.
+
+        Devuelve
+        -------
+        list or None
+            Lista ordenada de nombres canónicos, o None si se deben cargar todas las columnas.
+        """
+        if columns is None and not self.required_columns:
+            return None
+        projection = set(self.min_required_columns) | self.required_columns
+        projection.update(self._canonical_names(columns or []))
+        return sorted(projection)
+
+    def _canonical_names(self, columns):
+        """
+        Traduce sinónimos a nombres canónicos; los nombres ya canónicos se conservan.
+        """
+        header = [str(column) for column in columns]
+        return list(self.rename_columns(pd.DataFrame(columns=header)).columns)
+
+    def process_file(self, file, streaming=False, columns=None):
+        """
+        Lee, renombra y valida un único archivo Excel del directorio.
+
+        Parámetros
+        ----------
+        file : str
+            Nombre del archivo dentro de ruta_directorio.
+        streaming : bool, opcional
+            Si es True, el archivo se lee por lotes con read_excel_chunks (por defecto es False).
+        columns : list, opcional
+            Columnas canónicas a conservar. Si es None se conservan todas; si no, se agregan
+            las columnas opcionales del archivo (ver get_optional_columns).
+
+        Devuelve
+        -------
+        tuple
+            (DataFrame o None si el archivo no es válido, lista de mensajes, segundos empleados,
+            diccionario con los bytes antes y después de aplicar el esquema o None,
+            lista de encabezados sin sinónimo o None si el archivo vino de la caché).
+        """
+        start = time.perf_counter()
+        file_path = os.path.join(self.ruta_directorio, file)
+        if columns is not None:
+            # La métrica propia de cada archivo se carga aunque no esté en la proyección
+            columns = sorted(set(columns) | set(self.get_optional_columns(file)))
+        messages = []
+        memory = None
+        unmapped = None
+        df = None
+        try:
+            if self.cache is not None:
+                df = self.cache.obtener(file_path, self._cache_config(columns))
+                if df is not None:
+                    messages.append(f"Datos cargados desde la caché para {file}.")
+                    memory = {"bytes_antes": None, "bytes_despues": int(df.memory_usage(deep=True).sum())}
+                    return df, messages, time.perf_counter() - start, memory, unmapped
+
+            if streaming:
+                unmapped = self.get_column_resolver().sin_mapear(self.read_header(file_path))
+                with Instrumentador.etapa("read_excel") as registro:
+                    chunks = list(self.read_excel_chunks(file_path, columns=columns))
+                    df = self._concat_chunks(chunks) if chunks else pd.DataFrame()
+                    registro["filas_salida"] = len(df)
+                bytes_before = None
+            else:
+                with Instrumentador.etapa("read_excel") as registro:
+                    usecols = None
+                    if columns is not None:
+                        header = self.read_header(file_path)
+                        unmapped = self.get_column_resolver().sin_mapear(header)
+                        names = self._canonical_names(header)
+                        usecols = [i for i, name in enumerate(names) if name in columns]
+                    df = pd.read_excel(file_path, header=0, usecols=usecols)
+                    registro["filas_salida"] = len(df)
+                with Instrumentador.etapa("rename", filas_entrada=len(df)) as registro:
+                    if unmapped is None:
+                        unmapped = self.get_column_resolver().sin_mapear(df.columns)
                     df = self.rename_columns(df)
-                    missing_min_columns = [col for col in self.min_required_columns if col not in df.columns]
-
-                    optional_columns = self.get_optional_columns(file)
-                    missing_optional_columns = [col for col in optional_columns if col not in df.columns]
-
-                    if missing_min_columns:
-                        print(f"Error: {file} no contiene las columnas mínimas requeridas: {missing_min_columns}")
-                    else:
-                        data[file] = df
-                        if missing_optional_columns:
-                            print(
-                                f"Advertencia: {file} no contiene todas las columnas opcionales: {missing_optional_columns}")
-                        print(f"Datos cargados exitosamente desde {file}.")
-                except Exception as e:
-                    print(f"Error al cargar {file}: {e}")
-        return data
+                    registro["filas_salida"] = len(df)
+                bytes_before = int(df.memory_usage(deep=True).sum())
+            if unmapped:
+                messages.append(f"Advertencia: {file} tiene columnas sin sinónimo definido: {unmapped}")
+            with Instrumentador.etapa("validate", filas_entrada=len(df)) as registro:
+                missing_min_columns = [col for col in self.min_required_columns if col not in df.columns]
+
+                optional_columns = self.get_optional_columns(file)
+                missing_optional_columns = [col for col in optional_columns if col not in df.columns]
+
+                if missing_min_columns:
+                    messages.append(
+                        f"Error: {file} no contiene las columnas mínimas requeridas: {missing_min_columns}")
+                    df = None
+                else:
+                    if missing_optional_columns:
+                        messages.append(
+                            f"Advertencia: {file} no contiene todas las columnas opcionales: {missing_optional_columns}")
+                    df = self.apply_dtype_schema(df)
+                    non_numeric = self._count_non_numeric(df)
+                    if non_numeric:
+                        messages.append(
+                            f"Advertencia: {file} tiene valores no numéricos en columnas numéricas (se "
+                            f"convierten en nulos al consolidar con otros archivos): {non_numeric}")
+                    registro["filas_salida"] = len(df)
+            if df is not None:
+                memory = {"bytes_antes": bytes_before, "bytes_despues": int(df.memory_usage(deep=True).sum())}
+                messages.append(f"Datos cargados exitosamente desde {file}.")
+                if self.cache is not None:
+                    self.cache.guardar(file_path, self._cache_config(columns), df)
+        except Exception as e:
+            messages.append(f"Error al cargar {file}: {e}")
+            df = None
+        return df, messages, time.perf_counter() - start, memory, unmapped
+
+    def _concat_chunks(self, chunks):
+        """
+        Une los lotes de un archivo leído por streaming con un solo tipo por columna.
+
+        Cada lote llega con el esquema de tipos aplicado por separado, así que una columna
+        puede ser entera en un lote y de texto en otro. Esas columnas se unen como objetos
+        y el esquema se vuelve a aplicar al archivo completo, con el mismo resultado que
+        la lectura sin streaming; las categóricas comparten la unión de sus categorías.
+        """
+        dtypes = {}
+        for chunk in chunks:
+            for column, dtype in chunk.dtypes.items():
+                dtypes.setdefault(column, []).append(dtype)
+        conversions = {}
+        for column, types in dtypes.items():
+            if all(dtype == types[0] for dtype in types):
+                continue
+            if all(isinstance(dtype, pd.CategoricalDtype) for dtype in types):
+                union = types[0].categories
+                for other in types[1:]:
+                    union = union.union(other.categories)
+                conversions[column] = pd.CategoricalDtype(union)
+            else:
+                conversions[column] = object
+        if not conversions:
+            return pd.concat(chunks, ignore_index=True)
+        chunks = [chunk.astype({column: dtype for column, dtype in conversions.items() if column in chunk.columns})
+                  for chunk in chunks]
+        df = pd.concat(chunks, ignore_index=True)
+        return self.apply_dtype_schema(df) if object in conversions.values() else df
+
+    def _count_non_numeric(self, df):
+        """
+        Cuenta, por columna numérica del esquema, los valores que no se pueden convertir a número.
+
+        apply_dtype_schema deja esas columnas sin convertir y al consolidar la tabla maestra
+        (ver _align_dtypes) los valores se convierten en nulos.
+        """
+        counts = {}
+        for column, kind in self.dtype_schema.items():
+            if kind == "category" or column not in df.columns or pd.api.types.is_numeric_dtype(df[column]):
+                continue
+            serie = df[column]
+            coerced = int((pd.to_numeric(serie, errors="coerce").isna() & serie.notna()).sum())
+            if coerced:
+                counts[column] = coerced
+        return counts
+
+    def _cache_config(self, columns=None):
+        """
+        Devuelve la configuración de procesamiento que forma parte de la clave de caché.
+        """
+        return {
+            "column_synonyms": self.column_synonyms,
+            "dtype_schema": self.dtype_schema,
+            "columns": columns,
+        }
+
+    def read_header(self, file_path):
+        """
+        Lee la fila de encabezados de la primera hoja de un archivo Excel.
+
+        Parámetros
+        ----------
+        file_path : str
+            Ruta del archivo Excel.
+
+        Devuelve
+        -------
+        list
+            Encabezados como texto; las celdas vacías se nombran unnamed_<posición>.
+        """
+        workbook = load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            header = next(workbook.worksheets[0].iter_rows(max_row=1, values_only=True), ())
+        finally:
+            workbook.close()
+        return [str(name) if name is not None else f"unnamed_{i}" for i, name in enumerate(header)]
+
+    def read_excel_chunks(self, file_path, chunk_size=None, columns=None):
+        """
+        Lee la primera hoja de un archivo Excel por lotes de filas.
+
+        El archivo se abre en modo de solo lectura de openpyxl, de modo que nunca se
+        cargan en memoria más filas crudas que las de un lote. Cada lote se devuelve
+        con las columnas renombradas, proyectadas y con el esquema de tipos aplicado.
+
+        Parámetros
+        ----------
+        file_path : str
+            Ruta del archivo Excel.
+        chunk_size : int, opcional
+            Filas por lote. Si es None se usa self.chunk_size.
+        columns : list, opcional
+            Nombres canónicos de las columnas a conservar. Si es None se conservan todas.
+
+        Devuelve
+        -------
+        generator
+            Generador de DataFrames, uno por lote.
+        """
+        chunk_size = chunk_size or self.chunk_size
+        workbook = load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            rows = workbook.worksheets[0].iter_rows(values_only=True)
+            header = next(rows, None)
+            if header is None:
+                return
+            header = [str(name) if name is not None else f"unnamed_{i}" for i, name in enumerate(header)]
+            names = self._canonical_names(header)
+            keep = [i for i, name in enumerate(names) if columns is None or name in columns]
+            kept_names = [names[i] for i in keep]
+
+            batch = []
+            for row in rows:
+                if all(value is None for value in row):
+                    continue
+                batch.append([row[i] if i < len(row) else None for i in keep])
+                if len(batch) >= chunk_size:
+                    yield self.apply_dtype_schema(pd.DataFrame(batch, columns=kept_names))
+                    batch = []
+            if batch:
+                yield self.apply_dtype_schema(pd.DataFrame(batch, columns=kept_names))
+        finally:
+            workbook.close()
+
+    def apply_dtype_schema(self, df):
+        """
+        Convierte las columnas de un DataFrame a los tipos compactos de dtype_schema.
+
+        Las columnas numéricas solo se convierten si todos sus valores son enteros; en caso
+        contrario se dejan como están.
+
+        Parámetros
+        ----------
+        df : DataFrame
+            DataFrame con columnas renombradas a sus nombres canónicos.
+
+        Devuelve
+        -------
+        DataFrame
+            DataFrame con los tipos del esquema aplicados.
+        """
+        changes = {}
+        for column, kind in self.dtype_schema.items():
+            if column not in df.columns:
+                continue
+            serie = df[column]
+            if kind == "category":
+                if not isinstance(serie.dtype, pd.CategoricalDtype):
+                    changes[column] = serie.astype("category")
+                continue
+
+            numeric = pd.to_numeric(serie, errors="coerce")
+            values = numeric.dropna()
+            if len(values) < serie.notna().sum() or not (values == values.round()).all():
+                continue
+            if kind == "unsigned" and len(values) == len(numeric) and (values >= 0).all():
+                changes[column] = pd.to_numeric(numeric, downcast="unsigned")
+            else:
+                changes[column] = self._to_nullable_int(numeric, unsigned=kind == "unsigned")
+        return df.assign(**changes) if changes else df
+
+    @staticmethod
+    def _to_nullable_int(numeric, unsigned):
+        """
+        Convierte una serie numérica entera al tipo entero con nulos más pequeño que la contiene.
+        """
+        values = numeric.dropna()
+        if unsigned and (values >= 0).all():
+            candidates = ("UInt8", "UInt16", "UInt32", "UInt64")
+        else:
+            candidates = ("Int8", "Int16", "Int32", "Int64")
+        for dtype in candidates:
+            limits = np.iinfo(dtype.lower())
+            if values.empty or (values.min() >= limits.min and values.max() <= limits.max):
+                return numeric.astype(dtype)
+        return numeric
+
+    def get_memory_report(self):
+        """
+        Devuelve la memoria ocupada por cada archivo antes y después de aplicar el esquema.
+
+        Devuelve
+        -------
+        DataFrame
+            Una fila por archivo con los bytes antes y después y el porcentaje de reducción.
+            Los archivos servidos desde la caché o leídos por streaming no tienen medición previa.
+        """
+        report = pd.DataFrame.from_dict(self.memory_report, orient="index",
+                                        columns=["bytes_antes", "bytes_despues"])
+        report.index.name = "archivo"
+        report["bytes_antes"] = pd.to_numeric(report["bytes_antes"])
+        report["reduccion_pct"] = 100 * (1 - report["bytes_despues"] / report["bytes_antes"])
+        return report.reset_index()
+
+    def reset_data(self):
+        """
+        Descarta los archivos cargados y la tabla maestra.
+        """
+        self.data = {}
+        self._file_columns = {}
+        self._master_parts = []
+        self._master_table = None
+        self.master_index = None
+        self.cube = None
+        self.program_dimension = None
+        self.sql_engines = {}
+        self.manifest = {}
+
+    def add_dataframe(self, file_name, df):
+        """
+        Registra un DataFrame cargado y lo agrega a la tabla maestra.
+
+        Los DataFrames se acumulan y la tabla maestra se consolida con una sola
+        concatenación la próxima vez que se consulta; en ese momento df se reemplaza en
+        data por una vista de la tabla maestra.
+
+        Parámetros
+        ----------
+        file_name : str
+            Nombre del archivo de origen.
+        df : DataFrame
+            DataFrame renombrado y validado.
+        """
+        if file_name in self.data:
+            raise ValueError(f"El archivo {file_name} ya fue agregado a la tabla maestra.")
+        self.data[file_name] = df
+        self._file_columns[file_name] = list(df.columns)
+        self._master_parts.append((file_name, df))
+        self.master_index = None
+        self.sql_engines = {}
+        if self.program_dimension is not None:
+            self.program_dimension = self.program_dimension.agregar(df)
+        if self.cube is not None:
+            self.cube.actualizar_archivo(file_name, df)
+
+    def remove_dataframe(self, file_name):
+        """
+        Quita un archivo cargado de la tabla maestra y de las estructuras derivadas.
+
+        Parámetros
+        ----------
+        file_name : str
+            Nombre del archivo de origen.
+        """
+        if file_name not in self.data:
+            return
+        del self.data[file_name]
+        self._file_columns.pop(file_name, None)
+        self._master_parts = [(name, df) for name, df in self._master_parts if name != file_name]
+        master = self._master_table
+        if master is not None and file_name in master["source_file"].cat.categories:
+            master = master[master["source_file"] != file_name].reset_index(drop=True)
+            master["source_file"] = master["source_file"].cat.remove_categories([file_name])
+            self._master_table = master
+            self._refresh_file_views()
+        self.master_index = None
+        self.sql_engines = {}
+        self.program_dimension = None
+        if self.cube is not None:
+            self.cube.eliminar_archivo(file_name)
+
+    def get_master_table(self):
+        """
+        Devuelve la tabla maestra con los datos de todos los archivos cargados.
+
+        La tabla tiene una columna categórica source_file con el archivo de origen de cada
+        fila y tipos de datos alineados entre archivos. Se devuelve sin copiar, por lo que
+        debe tratarse como de solo lectura.
+
+        Devuelve
+        -------
+        DataFrame
+            Tabla maestra consolidada.
+        """
+        if self._master_parts:
+            sources = pd.CategoricalDtype(list(self.data))
+            parts = []
+            if self._master_table is not None:
+                parts.append(self._master_table.assign(
+                    source_file=self._master_table["source_file"].astype(sources)))
+            for file_name, df in self._master_parts:
+                codes = np.full(len(df), sources.categories.get_loc(file_name))
+                parts.append(df.assign(source_file=pd.Categorical.from_codes(codes, dtype=sources)))
+            # Las columnas ausentes en algunos archivos quedan como float al concatenar;
+            # el esquema las devuelve a enteros con nulos.
+            with Instrumentador.etapa("concat", filas_entrada=sum(len(part) for part in parts)) as registro:
+                self._master_table = self.apply_dtype_schema(
+                    pd.concat(self._align_dtypes(parts), ignore_index=True))
+                registro["filas_salida"] = len(self._master_table)
+            self._master_parts = []
+            self._refresh_file_views()
+        if self._master_table is None:
+            self._master_table = pd.DataFrame(columns=self.min_required_columns + ["source_file"])
+        return self._master_table
+
+    def _refresh_file_views(self):
+        """
+        Reemplaza los DataFrames de data por vistas de la tabla maestra.
+
+        Las filas de cada archivo son contiguas en la tabla maestra, así que cada vista es
+        una rebanada sin copia con las columnas que tenía el archivo; los DataFrames
+        originales se liberan y los datos quedan una sola vez en memoria.
+        """
+        master = self._master_table
+        sources = master["source_file"]
+        codes, starts, counts = np.unique(sources.cat.codes.to_numpy(), return_index=True, return_counts=True)
+        for code, start, count in zip(codes, starts, counts):
+            file_name = sources.cat.categories[code]
+            columns = self._file_columns.get(file_name) or [col for col in master.columns if col != "source_file"]
+            self.data[file_name] = master.iloc[start:start + count][columns].reset_index(drop=True)
+
+    def get_cube(self):
+        """
+        Devuelve el cubo de totales precalculados por programa, año y semestre.
+
+        El cubo se construye a partir de los archivos cargados en la primera llamada y se
+        mantiene actualizado a medida que se agregan archivos.
+
+        Devuelve
+        -------
+        CuboAgregado
+            Cubo con los datos de todos los archivos cargados.
+        """
+        if self.cube is None:
+            self.cube = CuboAgregado.desde_dataframes(self.data)
+        return self.cube
+
+    def get_master_index(self):
+        """
+        Devuelve el índice invertido de programa_academico sobre la tabla maestra.
+
+        El índice se construye una vez por carga y se descarta cuando cambian los datos.
+        También atiende las búsquedas aproximadas por trigramas (ver buscar_similares).
+
+        Devuelve
+        -------
+        IndiceTrigramas
+            Índice cuyas posiciones corresponden a las filas de la tabla maestra.
+        """
+        if self.master_index is None:
+            self.master_index = IndiceTrigramas(self.get_master_table()['programa_academico'])
+        return self.master_index
+
+    def get_program_dimension(self):
+        """
+        Devuelve la dimensión de programas de los datos cargados, uno por codigo_snies.
+
+        La dimensión se construye una vez a partir de la tabla maestra y se actualiza a
+        medida que se agregan archivos; se descarta cuando se quita alguno.
+
+        Devuelve
+        -------
+        DimensionProgramas
+            Programas distintos con su nombre, institución, nivel, metodología y municipio.
+        """
+        if self.program_dimension is None:
+            self.program_dimension = DimensionProgramas.desde_dataframe(self.get_master_table())
+        return self.program_dimension
+
+    def get_sql_engine(self, source="memory", engine=None):
+        """
+        Devuelve un motor SQL embebido con los datos cargados registrados en la tabla "snies".
+
+        Con source="memory" se registra la tabla maestra (sin copiarla si el motor es
+        DuckDB). Con source="cache" la tabla lee directamente los archivos Parquet de la
+        caché columnar, de modo que las consultas no necesitan tener los datos en memoria;
+        si algún archivo cargado no tiene entrada Parquet en la caché, o el motor no es
+        DuckDB, se usa la tabla maestra. El motor se reutiliza hasta que cambian los datos.
+
+        Parámetros
+        ----------
+        source : str, opcional
+            "memory" o "cache" (por defecto es "memory").
+        engine : str, opcional
+            "duckdb" o "sqlite". Si es None se usa DuckDB cuando está instalado.
+
+        Devuelve
+        -------
+        MotorSQL
+            Motor con la tabla MotorSQL.TABLA_DATOS registrada.
+        """
+        if source not in ("memory", "cache"):
+            raise ValueError(f"Origen de datos SQL no soportado: {source}")
+        key = (source, engine)
+        if key not in self.sql_engines:
+            motor = MotorSQL(engine)
+            paths = self._cached_parquet_paths() if source == "cache" and motor.motor == "duckdb" else None
+            if paths:
+                motor.registrar_parquet(MotorSQL.TABLA_DATOS, paths)
+            else:
+                motor.registrar_tabla(MotorSQL.TABLA_DATOS, self.get_master_table())
+            self.sql_engines[key] = motor
+        return self.sql_engines[key]
+
+    def _cached_parquet_paths(self):
+        """
+        Devuelve {archivo: ruta Parquet} de los archivos cargados, o None si falta alguno en la caché.
+        """
+        if self.cache is None or self.cache.formato != "parquet" or not self.data:
+            return None
+        paths = {}
+        for file_name in self.data:
+            file_path = os.path.join(self.ruta_directorio, file_name)
+            path = self.cache.ruta(file_path, self._cache_config(self.loaded_columns)) \
+                if os.path.exists(file_path) else None
+            if path is None:
+                return None
+            paths[file_name] = path
+        return paths
+
+    def snapshot(self):
+        """
+        Devuelve una copia de solo lectura de los datos cargados.
+
+        La copia comparte los DataFrames, la tabla maestra y el índice de búsqueda (que
+        nunca se modifican en el lugar), pero tiene su propio diccionario de datos y su
+        propio cubo, de modo que las cargas posteriores de este gestor no la alteran.
+
+        Devuelve
+        -------
+        GestorDatos
+            Gestor con los datos actuales, listo para buscar y analizar.
+        """
+        master = self.get_master_table()
+        view = copy.copy(self)
+        view.data = dict(self.data)
+        view._file_columns = dict(self._file_columns)
+        view._master_table = master
+        view.manifest = dict(self.manifest)
+        view.sql_engines = dict(self.sql_engines)
+        if 'programa_academico' in master.columns:
+            view.master_index = self.get_master_index()
+        view.cube = self.cube.copia() if self.cube is not None else None
+        return view
+
+    def publish_shared(self, store):
+        """
+        Publica la tabla maestra en un almacén compartido mapeado en memoria.
+
+        Junto con la tabla se guardan el rango de filas de cada archivo, el manifiesto y
+        la configuración de procesamiento, para que open_shared pueda reconstruir el
+        gestor y las cargas incrementales posteriores sepan qué archivos ya están.
+
+        Parámetros
+        ----------
+        store : AlmacenCompartido
+            Almacén donde se publica.
+
+        Devuelve
+        -------
+        str
+            Ruta del archivo publicado.
+        """
+        master = self.get_master_table()
+        codes = master["source_file"].cat.codes.to_numpy()
+        if len(codes) and (np.diff(codes) < 0).any():
+            # Las filas de cada archivo deben quedar contiguas para abrirlas como rebanadas
+            master = master.take(np.argsort(codes, kind="stable")).reset_index(drop=True)
+            codes = master["source_file"].cat.codes.to_numpy()
+        files = list(master["source_file"].cat.categories)
+        bounds = np.searchsorted(codes, np.arange(len(files) + 1))
+        ranges = {file: [int(bounds[i]), int(bounds[i + 1])] for i, file in enumerate(files)}
+
+        config = CacheColumnar.hash_configuracion(self._cache_config(self.loaded_columns))
+        manifest = {file: entry for file, entry in self.manifest.items() if file in ranges}
+        if len(manifest) == len(ranges):
+            content = {file: entry["hash"] for file, entry in manifest.items()}
+        else:
+            # Datos agregados con add_dataframe (sin archivo en el directorio): se usa su contenido
+            content = hashlib.sha256(pd.util.hash_pandas_object(master, index=False).to_numpy().tobytes()).hexdigest()
+        key = CacheColumnar.hash_configuracion({"content": content, "config": config, "ranges": ranges})
+        metadata = {"files": ranges, "manifest": manifest, "config": config, "columns": self.loaded_columns}
+        return store.publicar(master.drop(columns="source_file"), key, metadata)
+
+    def open_shared(self, store):
+        """
+        Carga los datos desde un almacén compartido sin leer los archivos Excel.
+
+        La tabla maestra usa directamente las columnas mapeadas del almacén (pd.ArrowDtype),
+        sin copiarlas; los DataFrames de cada archivo son rebanadas de ella. Solo la columna
+        source_file se construye en memoria. Los datos se descartan y se devuelve False si
+        el almacén está vacío o se publicó con otra configuración de procesamiento.
+
+        Parámetros
+        ----------
+        store : AlmacenCompartido
+            Almacén publicado con publish_shared.
+
+        Devuelve
+        -------
+        bool
+            True si se cargaron los datos del almacén.
+        """
+        shared, pointer = store.abrir()
+        if shared is None:
+            return False
+        metadata = pointer["metadatos"]
+        columns = self.resolve_projection()
+        if metadata.get("config") != CacheColumnar.hash_configuracion(self._cache_config(columns)):
+            return False
+
+        self.reset_data()
+        ranges = metadata["files"]
+        sources = pd.CategoricalDtype(list(ranges))
+        lengths = [stop - start for start, stop in ranges.values()]
+        codes = np.repeat(np.arange(len(ranges), dtype=np.int32), lengths)
+        self._master_table = shared.assign(source_file=pd.Categorical.from_codes(codes, dtype=sources))
+        for file, (start, stop) in ranges.items():
+            part = shared.iloc[start:stop].reset_index(drop=True)
+            # Las columnas que el archivo no tenía quedaron nulas al consolidar
+            empty = [column for column in part.columns
+                     if len(part) and column not in self.min_required_columns and part[column].count() == 0]
+            self.data[file] = part.drop(columns=empty)
+            self._file_columns[file] = list(self.data[file].columns)
+        self.manifest = dict(metadata["manifest"])
+        self.loaded_columns = metadata["columns"]
+        self.last_changes = {"agregados": list(ranges), "modificados": [], "eliminados": []}
+        return True
+
+    def _align_dtypes(self, parts):
+        """
+        Alinea los tipos de las columnas que difieren entre DataFrames antes de concatenarlos.
+
+        Las columnas categóricas comparten la unión de sus categorías, las de códigos,
+        identificadores, año, semestre y conteos se convierten a numéricas y el resto de
+        columnas con tipos mezclados se convierten a texto.
+        """
+        dtypes = {}
+        categories = {}
+        for df in parts:
+            for column, dtype in df.dtypes.items():
+                dtypes.setdefault(column, set()).add(str(dtype))
+                if isinstance(dtype, pd.CategoricalDtype):
+                    categories.setdefault(column, []).append(dtype.categories)
+
+        numeric_columns = set(self.min_required_columns) - {"institucion", "programa_academico"}
+        numeric_columns.update(self.optional_columns)
+        conversions = {}
+        for column, types in dtypes.items():
+            if column == "source_file":
+                continue
+            if types == {"category"} and len(categories[column]) > 1:
+                union = categories[column][0]
+                for other in categories[column][1:]:
+                    union = union.union(other)
+                conversions[column] = lambda serie, dtype=pd.CategoricalDtype(union): serie.astype(dtype)
+                continue
+            if len(types) == 1:
+                continue
+            if column in numeric_columns or column.startswith(self.NUMERIC_PREFIXES):
+                conversions[column] = lambda serie: pd.to_numeric(serie, errors="coerce")
+            elif not all(pd.api.types.is_numeric_dtype(df[column]) for df in parts if column in df.columns):
+                conversions[column] = lambda serie: serie.astype("string")
+
+        if not conversions:
+            return parts
+        aligned = []
+        for df in parts:
+            changes = {column: convert(df[column]) for column, convert in conversions.items() if column in df.columns}
+            aligned.append(df.assign(**changes) if changes else df)
+        return aligned
+
+    def get_cache_entries(self):
+        """
+        Devuelve los metadatos de las entradas de la caché columnar.
+
+        Devuelve
+        -------
+        DataFrame
+            Una fila por entrada, o un DataFrame vacío si la caché está desactivada.
+        """
+        if self.cache is None:
+            return pd.DataFrame()
+        return self.cache.listar_entradas()
+
+    def purge_cache(self, file_name=None, only_stale=False):
+        """
+        Elimina entradas de la caché columnar.
+
+        Parámetros
+        ----------
+        file_name : str, opcional
+            Nombre de un archivo del directorio cuyas entradas se eliminarán.
+        only_stale : bool, opcional
+            Si es True, solo se eliminan las entradas cuyo archivo de origen cambió.
+
+        Devuelve
+        -------
+        int
+            Número de entradas eliminadas.
+        """
+        if self.cache is None:
+            return 0
+        if only_stale:
+            return self.cache.purgar_obsoletas()
+        file_path = os.path.join(self.ruta_directorio, file_name) if file_name else None
+        return self.cache.purgar(file_path)
+
+    def get_column_resolver(self):
+        """
+        Devuelve el resolutor precompilado de sinónimos de columnas.
+
+        El resolutor se compila en la primera llamada y se reutiliza para todos los
+        archivos; add_column_synonyms lo descarta para que se vuelva a compilar.
+
+        Devuelve
+        -------
+        ResolutorColumnas
+            Resolutor construido a partir de column_synonyms.
+        """
+        if self._column_resolver is None:
+            self._column_resolver = ResolutorColumnas(self.column_synonyms)
+        return self._column_resolver
+
+    def add_column_synonyms(self, synonyms):
+        """
+        Agrega sinónimos a column_synonyms y descarta el resolutor compilado.
+
+        Parámetros
+        ----------
+        synonyms : dict
+            Diccionario {nombre_canonico: [sinonimo, ...]}; los sinónimos ya conocidos se omiten.
+        """
+        for column, names in synonyms.items():
+            known = self.column_synonyms.setdefault(column, [])
+            known.extend(name for name in names if name not in known)
+        self._column_resolver = None
 
     def rename_columns(self, df):
         """
         Renombra las columnas de un DataFrame según los sinónimos definidos.
 
+        Los encabezados se comparan sin distinguir tildes, espacios ni mayúsculas.
+
         Parámetros
         ----------
         df : DataFrame
@@ -153,21 +1219,17 @@ class GestorDatos:
         DataFrame
             DataFrame con las columnas renombradas.
         """
-        new_columns = {}
-        for col in df.columns:
-            col_lower = col.lower().strip().replace(" ", "_")
-            for standard_name, synonyms in self.column_synonyms.items():
-                if col in synonyms:
-                    new_columns[col] = standard_name
-                    break
-            else:
-                new_columns[col] = col_lower
-        return df.rename(columns=new_columns)
+        return df.rename(columns=self.get_column_resolver().renombres(df.columns))
 
     def get_optional_columns(self, file_name):
         """
         Obtiene las columnas opcionales basadas en el nombre del archivo.
 
+        Las claves de optional_columns son las columnas canónicas y los valores los
+        fragmentos del nombre de archivo que las identifican; se usa la primera columna
+        cuyo fragmento coincide. Los espacios y guiones del nombre se tratan como "_",
+        como en las descargas del SNIES ("MATRICULADOS PRIMER CURSO 2022.xlsx").
+
         Parámetros
         ----------
         file_name : str
@@ -177,10 +1239,21 @@ class GestorDatos:
         -------
         list
             Lista de columnas opcionales.
+
+        Ejemplos
+        --------
+        >>> gestor = GestorDatos(".")
+        >>> gestor.get_optional_columns("matriculados_primer_curso_2022.xlsx")
+        ['nuevos_matriculados']
+        >>> gestor.get_optional_columns("MATRICULADOS PRIMER CURSO 2022.xlsx")
+        ['nuevos_matriculados']
+        >>> gestor.get_optional_columns("matriculados_2022.xlsx")
+        ['total_matriculados']
         """
-        for key, cols in self.optional_columns.items():
-            if key in file_name.lower():
-                return cols
+        file_name = re.sub(r"[\s-]+", "_", file_name.lower())
+        for column, fragments in self.optional_columns.items():
+            if any(fragment in file_name for fragment in fragments):
+                return [column]
         return []
 
     def get_available_columns(self, data):
@@ -216,27 +1289,71 @@ class GestorDatos:
             for column in df.columns:
                 print(f"- {column}")
 
-    def buscar_por_palabra_clave(self, palabra_clave, dataframes):
+    @Instrumentador.medir("search")
+    def buscar_por_palabra_clave(self, palabra_clave, dataframes=None, operador="and", prefijo=True):
         """
         Busca programas académicos por palabra clave en los DataFrames cargados.
 
+        La búsqueda usa un índice invertido sobre los nombres distintos de
+        programa_academico, sin distinguir mayúsculas ni tildes. Las palabras de la consulta
+        se combinan con AND (o con OR si operador="or") y los grupos separados por " OR " o
+        "|" se combinan con OR.
+
         Parámetros
         ----------
         palabra_clave : str
             Palabra clave para buscar en los programas académicos.
-        dataframes : dict
-            Diccionario de DataFrames cargados.
+        dataframes : dict, opcional
+            Diccionario de DataFrames. Si es None o son los datos cargados por este gestor,
+            se busca directamente en la tabla maestra.
+        operador : str, opcional
+            Operador entre las palabras de la consulta: "and" u "or" (por defecto es "and").
+        prefijo : bool, opcional
+            Si es True, cada palabra coincide también como prefijo (por defecto es True).
 
         Devuelve
         -------
         DataFrame
             DataFrame con los programas académicos que coinciden con la palabra clave.
         """
-        datos_combinados = pd.concat(dataframes.values(), ignore_index=True)
+        if dataframes is None or dataframes is self.data:
+            master = self.get_master_table()
+            if 'programa_academico' not in master.columns:
+                raise KeyError("La columna 'programa_academico' no se encuentra en los datos.")
+            return master.take(self.get_master_index().buscar(palabra_clave, operador, prefijo))
 
-        if 'programa_academico' not in datos_combinados.columns:
+        if not any('programa_academico' in df.columns for df in dataframes.values()):
             raise KeyError("La columna 'programa_academico' no se encuentra en los datos.")
 
-        programas_filtrados = datos_combinados[datos_combinados['programa_academico']
-        .str.contains(palabra_clave, case=False, na=False)]
-        return programas_filtrados
\ No newline at end of file
+        return buscar_en_dataframes(palabra_clave, dataframes, self.search_indexes, operador, prefijo)
+
+    @Instrumentador.medir("search")
+    def buscar_similares(self, palabra_clave, umbral=0.3, top_k=20, modo="palabra"):
+        """
+        Busca programas académicos con nombres parecidos a la palabra clave.
+
+        Tolera tildes, mayúsculas, abreviaturas y errores de escritura comparando los
+        trigramas de la consulta con los de los nombres distintos de programa_academico.
+
+        Parámetros
+        ----------
+        palabra_clave : str
+            Texto de búsqueda.
+        umbral : float, opcional
+            Similitud mínima entre 0 y 1 (por defecto es 0.3).
+        top_k : int, opcional
+            Número máximo de nombres distintos; None los devuelve todos (por defecto es 20).
+        modo : str, opcional
+            "palabra" o "completo" (ver IndiceTrigramas.buscar_similares).
+
+        Devuelve
+        -------
+        DataFrame
+            Filas de la tabla maestra de los nombres encontrados, con la columna similitud y
+            ordenadas de mayor a menor similitud.
+        """
+        master = self.get_master_table()
+        if 'programa_academico' not in master.columns:
+            raise KeyError("La columna 'programa_academico' no se encuentra en los datos.")
+        positions, similarity = self.get_master_index().buscar_aproximado(palabra_clave, umbral, top_k, modo)
+        return master.take(positions).assign(similitud=similarity).reset_index(drop=True)
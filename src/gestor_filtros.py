@@ -1,4 +1,5 @@
 import pandas as pd
+from indice_busqueda import buscar_en_dataframes
 
 class GestorFiltros:
     """
@@ -10,6 +11,8 @@ class GestorFiltros:
         Lista de palabras clave utilizadas para la búsqueda.
     programas_seleccionados : list
         Lista de programas académicos seleccionados.
+    indices_busqueda : dict
+        Índices invertidos de programa_academico por archivo, reutilizados entre búsquedas.
 
     """
 
@@ -19,17 +22,25 @@ class GestorFiltros:
         """
         self.palabras_clave_busqueda = []
         self.programas_seleccionados = []
+        self.indices_busqueda = {}
 
-    def buscar_por_palabra_clave(self, palabra_clave, dataframes):
+    def buscar_por_palabra_clave(self, palabra_clave, dataframes, operador="and", prefijo=True):
         """
         Busca programas académicos por palabra clave en los DataFrames cargados.
 
+        Los índices invertidos de cada DataFrame se construyen en la primera búsqueda y se
+        reutilizan mientras el DataFrame no cambie.
+
         Parámetros
         ----------
         palabra_clave : str
             Palabra clave para buscar en los programas académicos.
-        dataframes : dict
-            Diccionario de DataFrames cargados.
+        dataframes : dict or DataFrame
+            Diccionario de DataFrames cargados o la tabla maestra de GestorDatos.
+        operador : str, opcional
+            Operador entre las palabras de la consulta: "and" u "or" (por defecto es "and").
+        prefijo : bool, opcional
+            Si es True, cada palabra coincide también como prefijo (por defecto es True).
 
         Devuelve
         -------
@@ -41,14 +52,13 @@ class GestorFiltros:
         KeyError
             Si la columna 'programa_academico' no se encuentra en los datos.
         """
-        datos_combinados = pd.concat(dataframes.values(), ignore_index=True)
+        if isinstance(dataframes, pd.DataFrame):
+            dataframes = {"tabla_maestra": dataframes}
 
-        if 'programa_academico' not in datos_combinados.columns:
+        if not any('programa_academico' in df.columns for df in dataframes.values()):
             raise KeyError("La columna 'programa_academico' no se encuentra en los datos.")
 
-        programas_filtrados = datos_combinados[datos_combinados['programa_academico']
-        .str.contains(palabra_clave, case=False, na=False)]
-        return programas_filtrados
+        return buscar_en_dataframes(palabra_clave, dataframes, self.indices_busqueda, operador, prefijo)
 
     def seleccionar_programa(self, programa):
         """
@@ -0,0 +1,343 @@
+import bisect
+import re
+import unicodedata
+import numpy as np
+import pandas as pd
+
+PATRON_TOKEN = re.compile(r"[a-z0-9]+")
+PATRON_OR = re.compile(r"\s+OR\s+|\|")
+
+
+def normalizar_texto(texto):
+    """
+    Convierte un texto a minúsculas y elimina tildes y diacríticos.
+
+    Parámetros
+    ----------
+    texto : str
+        Texto a normalizar.
+
+    Devuelve
+    -------
+    str
+        Texto normalizado.
+    """
+    texto = unicodedata.normalize("NFKD", str(texto))
+    return "".join(c for c in texto if not unicodedata.combining(c)).lower()
+
+
+def tokenizar(texto):
+    """
+    Divide un texto normalizado en palabras alfanuméricas.
+    """
+    return PATRON_TOKEN.findall(normalizar_texto(texto))
+
+
+class IndiceInvertido:
+    """
+    Índice invertido de palabras sobre los valores distintos de una columna de texto.
+
+    Cada palabra normalizada (sin tildes y en minúsculas) apunta a los nombres distintos
+    que la contienen, y cada nombre apunta a las posiciones de fila donde aparece. Así una
+    búsqueda recorre solo los nombres distintos y no las filas repetidas.
+
+    Atributos
+    ----------
+    nombres : ndarray
+        Valores distintos de la columna indexada.
+    num_filas : int
+        Número de filas de la serie indexada.
+
+    Métodos
+    -------
+    buscar_nombres(consulta, operador="and", prefijo=True)
+        Devuelve los identificadores de los nombres que coinciden con la consulta.
+    buscar(consulta, operador="and", prefijo=True)
+        Devuelve las posiciones de fila que coinciden con la consulta.
+    """
+
+    def __init__(self, serie):
+        """
+        Construye el índice a partir de una serie de textos.
+
+        Parámetros
+        ----------
+        serie : Series
+            Serie de textos (por ejemplo, la columna programa_academico).
+        """
+        codigos, nombres = pd.factorize(serie)
+        self.nombres = np.asarray(nombres, dtype=object)
+        self.num_filas = len(serie)
+
+        # Las filas de cada nombre quedan contiguas en _orden, entre _limites[i] y _limites[i + 1]
+        self._orden = np.argsort(codigos, kind="stable")
+        self._limites = np.searchsorted(codigos[self._orden], np.arange(len(self.nombres) + 1))
+
+        self._tokens = {}
+        for id_nombre, nombre in enumerate(self.nombres):
+            for token in set(tokenizar(nombre)):
+                self._tokens.setdefault(token, []).append(id_nombre)
+        self._tokens_ordenados = sorted(self._tokens)
+
+    def _ids_termino(self, termino, prefijo):
+        if not prefijo:
+            return set(self._tokens.get(termino, ()))
+        ids = set()
+        i = bisect.bisect_left(self._tokens_ordenados, termino)
+        while i < len(self._tokens_ordenados) and self._tokens_ordenados[i].startswith(termino):
+            ids.update(self._tokens[self._tokens_ordenados[i]])
+            i += 1
+        return ids
+
+    def buscar_nombres(self, consulta, operador="and", prefijo=True):
+        """
+        Devuelve los identificadores de los nombres que coinciden con la consulta.
+
+        Las palabras de la consulta se combinan con el operador indicado. Los grupos
+        separados por " OR " o "|" siempre se combinan con OR.
+
+        Parámetros
+        ----------
+        consulta : str
+            Texto de búsqueda.
+        operador : str, opcional
+            "and" exige todas las palabras, "or" basta con una (por defecto es "and").
+        prefijo : bool, opcional
+            Si es True, cada palabra coincide con las que empiezan por ella (por defecto es True).
+
+        Devuelve
+        -------
+        list
+            Identificadores ordenados de los nombres coincidentes.
+        """
+        if operador not in ("and", "or"):
+            raise ValueError(f"Operador no soportado: {operador}")
+        resultado = set()
+        for grupo in PATRON_OR.split(consulta):
+            terminos = tokenizar(grupo)
+            if not terminos:
+                continue
+            conjuntos = [self._ids_termino(termino, prefijo) for termino in terminos]
+            if operador == "and":
+                resultado |= set.intersection(*conjuntos)
+            else:
+                resultado |= set.union(*conjuntos)
+        return sorted(resultado)
+
+    def posiciones_de_nombres(self, ids_nombres):
+        """
+        Devuelve las posiciones de fila ordenadas de los nombres indicados.
+        """
+        if len(ids_nombres) == 0:
+            return np.array([], dtype=np.intp)
+        posiciones = np.concatenate([self._orden[self._limites[i]:self._limites[i + 1]] for i in ids_nombres])
+        posiciones.sort()
+        return posiciones
+
+    def buscar(self, consulta, operador="and", prefijo=True):
+        """
+        Devuelve las posiciones de fila que coinciden con la consulta.
+
+        Devuelve
+        -------
+        ndarray
+            Posiciones de fila ordenadas, aptas para DataFrame.iloc o DataFrame.take.
+        """
+        return self.posiciones_de_nombres(self.buscar_nombres(consulta, operador, prefijo))
+
+
+def trigramas(texto):
+    """
+    Devuelve el conjunto de trigramas de un texto normalizado.
+
+    Cada palabra se rellena con dos espacios al inicio y uno al final, de modo que los
+    inicios de palabra pesan más y "sistemas" comparte trigramas con "sistmas".
+    """
+    resultado = set()
+    for token in tokenizar(texto):
+        palabra = f"  {token} "
+        resultado.update(palabra[i:i + 3] for i in range(len(palabra) - 2))
+    return resultado
+
+
+class IndiceTrigramas(IndiceInvertido):
+    """
+    Índice invertido que además permite búsquedas aproximadas por trigramas.
+
+    Los trigramas se calculan sobre los nombres distintos ya normalizados (sin tildes ni
+    mayúsculas), por lo que "INGENIERIA DE SISTEMAS" e "INGENIERÍA DE SISTEMAS" se
+    indexan una sola vez. Las listas de nombres de cada trigrama se guardan en arreglos
+    de numpy y una consulta cuenta los trigramas compartidos con np.bincount, sin
+    recorrer los nombres uno por uno. La estructura de trigramas se construye en la
+    primera búsqueda aproximada.
+
+    Métodos
+    -------
+    buscar_similares(consulta, umbral=0.3, top_k=20, modo="palabra")
+        Devuelve los nombres más parecidos a la consulta con su similitud.
+    buscar_aproximado(consulta, umbral=0.3, top_k=20, modo="palabra")
+        Devuelve las posiciones de fila de los nombres más parecidos a la consulta.
+    """
+
+    MODOS = ("palabra", "completo")
+
+    def __init__(self, serie):
+        super().__init__(serie)
+        self._trigramas = None
+
+    def _construir_trigramas(self):
+        # Nombres normalizados distintos y el normalizado que corresponde a cada nombre
+        normalizados = [" ".join(tokenizar(nombre)) for nombre in self.nombres]
+        self._id_normalizado, distintos = pd.factorize(pd.Series(normalizados, dtype=object))
+
+        vocabulario = {}
+        ids_trigrama = []
+        ids_nombre = []
+        tamanos = np.zeros(len(distintos), dtype=np.int64)
+        for id_normalizado, nombre in enumerate(distintos):
+            propios = trigramas(nombre)
+            tamanos[id_normalizado] = len(propios)
+            for trigrama in propios:
+                ids_trigrama.append(vocabulario.setdefault(trigrama, len(vocabulario)))
+                ids_nombre.append(id_normalizado)
+
+        # Listas de nombres por trigrama en formato CSR: _postings[_inicios[t]:_inicios[t + 1]]
+        ids_trigrama = np.asarray(ids_trigrama, dtype=np.int64)
+        orden = np.argsort(ids_trigrama, kind="stable")
+        self._postings = np.asarray(ids_nombre, dtype=np.int32)[orden]
+        self._inicios = np.searchsorted(ids_trigrama[orden], np.arange(len(vocabulario) + 1))
+        self._vocabulario = vocabulario
+        self._tamanos = tamanos
+        self._trigramas = True
+
+    def buscar_similares(self, consulta, umbral=0.3, top_k=20, modo="palabra"):
+        """
+        Devuelve los nombres más parecidos a la consulta, ordenados por similitud.
+
+        Parámetros
+        ----------
+        consulta : str
+            Texto de búsqueda; se ignoran tildes, mayúsculas y signos.
+        umbral : float, opcional
+            Similitud mínima entre 0 y 1 (por defecto es 0.3).
+        top_k : int, opcional
+            Número máximo de nombres distintos; None los devuelve todos (por defecto es 20).
+        modo : str, opcional
+            "palabra" mide qué fracción de los trigramas de la consulta aparece en el nombre,
+            útil para consultas cortas dentro de nombres largos; "completo" usa el índice de
+            Jaccard entre ambos conjuntos de trigramas (por defecto es "palabra").
+
+        Devuelve
+        -------
+        DataFrame
+            Columnas id_nombre, nombre y similitud, de mayor a menor similitud.
+
+        Lanza
+        -----
+        ValueError
+            Si el modo no está soportado.
+        """
+        if modo not in self.MODOS:
+            raise ValueError(f"Modo de similitud no soportado: {modo}")
+        vacio = pd.DataFrame({"id_nombre": np.array([], dtype=np.intp), "nombre": np.array([], dtype=object),
+                              "similitud": np.array([], dtype=float)})
+        if self._trigramas is None:
+            self._construir_trigramas()
+        consultados = trigramas(consulta)
+        ids = [self._vocabulario[t] for t in consultados if t in self._vocabulario]
+        if not consultados or not ids:
+            return vacio
+
+        postings = np.concatenate([self._postings[self._inicios[t]:self._inicios[t + 1]] for t in ids])
+        compartidos = np.bincount(postings, minlength=len(self._tamanos))
+        jaccard = compartidos / (len(consultados) + self._tamanos - compartidos)
+        similitud = compartidos / len(consultados) if modo == "palabra" else jaccard
+
+        # Se pasa de los nombres normalizados a los nombres originales
+        similitud = similitud[self._id_normalizado]
+        jaccard = jaccard[self._id_normalizado]
+        candidatos = np.flatnonzero(similitud >= umbral)
+        if top_k is not None and len(candidatos) > top_k:
+            candidatos = candidatos[np.argpartition(-similitud[candidatos], top_k - 1)[:top_k]]
+        # Orden: similitud descendente y, en empate, el nombre más parecido en conjunto
+        candidatos = candidatos[np.lexsort((-jaccard[candidatos], -similitud[candidatos]))]
+        return pd.DataFrame({"id_nombre": candidatos, "nombre": self.nombres[candidatos],
+                             "similitud": similitud[candidatos]})
+
+    def buscar_aproximado(self, consulta, umbral=0.3, top_k=20, modo="palabra"):
+        """
+        Devuelve las posiciones de fila de los nombres más parecidos a la consulta.
+
+        Devuelve
+        -------
+        tuple
+            (posiciones de fila agrupadas por nombre de mayor a menor similitud,
+            similitud de cada posición).
+        """
+        similares = self.buscar_similares(consulta, umbral, top_k, modo)
+        ids = similares["id_nombre"].to_numpy()
+        if len(ids) == 0:
+            return np.array([], dtype=np.intp), np.array([], dtype=float)
+        posiciones = np.concatenate([self._orden[self._limites[i]:self._limites[i + 1]] for i in ids])
+        similitud = np.repeat(similares["similitud"].to_numpy(), self._limites[ids + 1] - self._limites[ids])
+        return posiciones, similitud
+
+
+def actualizar_indices(dataframes, indices, columna="programa_academico"):
+    """
+    Construye los índices de los DataFrames que aún no tienen uno vigente.
+
+    Parámetros
+    ----------
+    dataframes : dict
+        Diccionario de DataFrames cargados.
+    indices : dict
+        Caché {nombre: (DataFrame, IndiceInvertido)} que se actualiza en el lugar.
+    columna : str, opcional
+        Columna a indexar (por defecto es "programa_academico").
+    """
+    for nombre in list(indices):
+        if nombre not in dataframes:
+            del indices[nombre]
+    for nombre, df in dataframes.items():
+        if columna not in df.columns:
+            continue
+        entrada = indices.get(nombre)
+        if entrada is None or entrada[0] is not df:
+            indices[nombre] = (df, IndiceInvertido(df[columna]))
+
+
+def buscar_en_dataframes(palabra_clave, dataframes, indices, operador="and", prefijo=True,
+                         columna="programa_academico"):
+    """
+    Busca una consulta en varios DataFrames usando sus índices invertidos.
+
+    Parámetros
+    ----------
+    palabra_clave : str
+        Consulta de búsqueda.
+    dataframes : dict
+        Diccionario de DataFrames cargados.
+    indices : dict
+        Caché de índices por DataFrame (ver actualizar_indices).
+
+    Devuelve
+    -------
+    DataFrame
+        Filas coincidentes de todos los DataFrames, con índice consecutivo.
+
+    Lanza
+    -----
+    KeyError
+        Si ningún DataFrame contiene la columna indexada.
+    """
+    actualizar_indices(dataframes, indices, columna)
+    if not indices:
+        raise KeyError(f"La columna '{columna}' no se encuentra en los datos.")
+
+    partes = []
+    for nombre, df in dataframes.items():
+        if nombre in indices:
+            posiciones = indices[nombre][1].buscar(palabra_clave, operador, prefijo)
+            partes.append(df.take(posiciones))
+    return pd.concat(partes, ignore_index=True)
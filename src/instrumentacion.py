@@ -0,0 +1,298 @@
+import contextvars
+import functools
+import json
+import logging
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+import pandas as pd
+
+
+def contar_filas(valor):
+    """
+    Cuenta las filas de un DataFrame, de un diccionario de DataFrames o del primer
+    elemento DataFrame de una tupla. Devuelve None para cualquier otro valor.
+    """
+    if isinstance(valor, (pd.DataFrame, pd.Series)):
+        return len(valor)
+    if isinstance(valor, dict) and valor and all(isinstance(v, pd.DataFrame) for v in valor.values()):
+        return sum(len(v) for v in valor.values())
+    if isinstance(valor, tuple) and valor and isinstance(valor[0], pd.DataFrame):
+        return len(valor[0])
+    return None
+
+
+class Instrumentador:
+    """
+    Registro del tiempo, las filas y la memoria de cada etapa del procesamiento.
+
+    Es el complemento de ManejadorExcepciones: el decorador medir(etapa) y el
+    administrador de contexto etapa(nombre) registran para cada ejecución el tiempo real,
+    el tiempo de CPU, las filas de entrada y de salida y, si se activa, el pico de memoria
+    medido con tracemalloc. Los registros se guardan en memoria (los últimos
+    MAX_REGISTROS) y, si se crea una instancia, también como líneas JSON en un archivo
+    junto al log de errores.
+
+    La medición de memoria se activa por contexto (el hilo o la sesión que llama a
+    configurar), no para todo el proceso. tracemalloc se inicia con la primera etapa que
+    mide memoria y se detiene cuando termina la última, sin importar el hilo. Como su
+    pico es global, el de una etapa incluye lo que asignan otros hilos mientras corre.
+
+    Atributos
+    ----------
+    log_path : str
+        Ruta del archivo JSON Lines donde se escriben los registros.
+
+    Métodos
+    -------
+    medir(etapa, filas_entrada=None)
+        Decorador que registra cada llamada de la función decorada.
+    etapa(nombre, filas_entrada=None)
+        Administrador de contexto que registra un bloque de código.
+    configurar(activo=True, memoria=False)
+        Activa o desactiva el registro y la medición de memoria.
+    midiendo_memoria()
+        Indica si el contexto actual mide el pico de memoria.
+    reporte()
+        Devuelve todos los registros como DataFrame.
+    resumen()
+        Devuelve los totales por etapa.
+    """
+
+    MAX_REGISTROS = 10000
+
+    activo = True
+    _medir_memoria = contextvars.ContextVar("instrumentador_medir_memoria", default=False)
+    # Etapas que miden memoria en cualquier hilo: {id(registro): registro}
+    _etapas_memoria = {}
+    _tracemalloc_propio = False
+    _registros = deque(maxlen=MAX_REGISTROS)
+    _lock = threading.Lock()
+    _logger = logging.getLogger("instrumentacion")
+    _pid_log = None
+
+    def __init__(self, log_path="../docs/outputs/instrumentacion.jsonl"):
+        """
+        Configura el archivo JSON Lines donde se escriben los registros.
+
+        Parámetros
+        ----------
+        log_path : str, opcional
+            Ruta del archivo (por defecto es "../docs/outputs/instrumentacion.jsonl").
+        """
+        os.makedirs(os.path.dirname(log_path), exist_ok=True)
+
+        self.log_path = log_path
+        ruta = os.path.abspath(log_path)
+        if not any(getattr(h, "baseFilename", None) == ruta for h in self._logger.handlers):
+            handler = logging.FileHandler(ruta, encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            self._logger.addHandler(handler)
+        self._logger.setLevel(logging.INFO)
+        self._logger.propagate = False
+        # Solo el proceso que configuró el log escribe en él; los procesos trabajadores
+        # devuelven sus registros al proceso principal
+        Instrumentador._pid_log = os.getpid()
+
+    @classmethod
+    def configurar(cls, activo=True, memoria=False):
+        """
+        Activa o desactiva el registro de etapas.
+
+        Parámetros
+        ----------
+        activo : bool, opcional
+            Si es False, medir y etapa no registran nada (por defecto es True).
+        memoria : bool, opcional
+            Si es True, las etapas del contexto actual (hilo o sesión) miden el pico de
+            memoria con tracemalloc, lo que hace más lento el código medido (por defecto es False).
+        """
+        cls.activo = activo
+        cls._medir_memoria.set(memoria)
+
+    @classmethod
+    def midiendo_memoria(cls):
+        """
+        Indica si las etapas del contexto actual miden el pico de memoria.
+        """
+        return cls._medir_memoria.get()
+
+    @classmethod
+    def _reiniciar_pico(cls):
+        """
+        Lleva el pico actual de tracemalloc a todas las etapas en curso y lo reinicia.
+
+        Debe llamarse con _lock adquirido. Devuelve la memoria asignada actualmente.
+        """
+        actual, pico = tracemalloc.get_traced_memory()
+        for registro in cls._etapas_memoria.values():
+            registro["_pico"] = max(registro["_pico"], pico)
+        tracemalloc.reset_peak()
+        return actual
+
+    @classmethod
+    @contextmanager
+    def etapa(cls, nombre, filas_entrada=None):
+        """
+        Registra el tiempo, las filas y la memoria de un bloque de código.
+
+        El administrador devuelve el registro en curso; el bloque puede completar sus
+        claves "filas_entrada" y "filas_salida".
+
+        Parámetros
+        ----------
+        nombre : str
+            Nombre de la etapa (por ejemplo, "read_excel" o "concat").
+        filas_entrada : int, opcional
+            Filas que recibe la etapa.
+        """
+        registro = {"etapa": nombre, "filas_entrada": filas_entrada, "filas_salida": None}
+        if not cls.activo:
+            yield registro
+            return
+
+        if cls._medir_memoria.get():
+            with cls._lock:
+                if not cls._etapas_memoria and not tracemalloc.is_tracing():
+                    tracemalloc.start()
+                    cls._tracemalloc_propio = True
+                registro["_base"] = registro["_pico"] = cls._reiniciar_pico()
+                cls._etapas_memoria[id(registro)] = registro
+
+        registro["inicio"] = time.strftime("%Y-%m-%d %H:%M:%S")
+        inicio, inicio_cpu = time.perf_counter(), time.process_time()
+        error = None
+        try:
+            yield registro
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            registro["tiempo_s"] = time.perf_counter() - inicio
+            registro["cpu_s"] = time.process_time() - inicio_cpu
+            registro["error"] = repr(error) if error is not None else None
+            if "_base" in registro:
+                with cls._lock:
+                    cls._reiniciar_pico()
+                    del cls._etapas_memoria[id(registro)]
+                    # Solo la última etapa en curso detiene tracemalloc, y solo si lo inició el instrumentador
+                    if not cls._etapas_memoria and cls._tracemalloc_propio:
+                        tracemalloc.stop()
+                        cls._tracemalloc_propio = False
+                registro["memoria_pico_bytes"] = registro.pop("_pico") - registro.pop("_base")
+            else:
+                registro["memoria_pico_bytes"] = None
+            cls.agregar_registros([registro])
+
+    @classmethod
+    def medir(cls, etapa, filas_entrada=None):
+        """
+        Decorador que registra cada llamada de la función decorada como una etapa.
+
+        Las filas de entrada se toman del primer argumento DataFrame (o diccionario de
+        DataFrames) y las de salida del valor devuelto.
+
+        Parámetros
+        ----------
+        etapa : str
+            Nombre de la etapa.
+        filas_entrada : callable, opcional
+            Función que recibe los mismos argumentos que la función decorada y devuelve
+            sus filas de entrada, para funciones que no reciben los datos como argumento.
+
+        Devuelve
+        -------
+        function
+            Decorador.
+        """
+        def decorador(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not cls.activo:
+                    return func(*args, **kwargs)
+                if filas_entrada is not None:
+                    filas = filas_entrada(*args, **kwargs)
+                else:
+                    filas = next((n for n in map(contar_filas, list(args) + list(kwargs.values())) if n is not None),
+                                 None)
+                with cls.etapa(etapa, filas_entrada=filas) as registro:
+                    registro["funcion"] = func.__qualname__
+                    resultado = func(*args, **kwargs)
+                    registro["filas_salida"] = contar_filas(resultado)
+                return resultado
+            return wrapper
+        return decorador
+
+    @classmethod
+    def agregar_registros(cls, registros):
+        """
+        Agrega registros (por ejemplo, los devueltos por un proceso trabajador).
+        """
+        registros = [{**registro, "pid": registro.get("pid", os.getpid())} for registro in registros]
+        with cls._lock:
+            cls._registros.extend(registros)
+        if cls._logger.handlers and cls._pid_log == os.getpid():
+            for registro in registros:
+                cls._logger.info(json.dumps(registro, ensure_ascii=False, default=str))
+
+    @classmethod
+    def tomar_registros(cls):
+        """
+        Devuelve los registros acumulados y los elimina del registro en memoria.
+        """
+        with cls._lock:
+            registros = list(cls._registros)
+            cls._registros.clear()
+        return registros
+
+    @classmethod
+    def limpiar(cls):
+        """
+        Elimina los registros en memoria.
+        """
+        with cls._lock:
+            cls._registros.clear()
+
+    @classmethod
+    def reporte(cls):
+        """
+        Devuelve todos los registros en memoria.
+
+        Devuelve
+        -------
+        DataFrame
+            Una fila por ejecución de una etapa, en orden de finalización.
+        """
+        with cls._lock:
+            registros = list(cls._registros)
+        columnas = ["inicio", "etapa", "funcion", "tiempo_s", "cpu_s", "filas_entrada", "filas_salida",
+                    "memoria_pico_bytes", "pid", "error"]
+        return pd.DataFrame(registros).reindex(columns=columnas)
+
+    @classmethod
+    def resumen(cls):
+        """
+        Devuelve los totales por etapa ordenados por tiempo total.
+
+        Devuelve
+        -------
+        DataFrame
+            Una fila por etapa con llamadas, tiempos total y máximo, CPU, filas y pico de memoria.
+        """
+        reporte = cls.reporte()
+        if reporte.empty:
+            return pd.DataFrame(columns=["etapa", "llamadas", "tiempo_total_s", "tiempo_max_s", "cpu_total_s",
+                                         "filas_entrada", "filas_salida", "memoria_pico_bytes"])
+        resumen = reporte.groupby("etapa").agg(
+            llamadas=("tiempo_s", "size"),
+            tiempo_total_s=("tiempo_s", "sum"),
+            tiempo_max_s=("tiempo_s", "max"),
+            cpu_total_s=("cpu_s", "sum"),
+            filas_entrada=("filas_entrada", "sum"),
+            filas_salida=("filas_salida", "sum"),
+            memoria_pico_bytes=("memoria_pico_bytes", "max"),
+        )
+        return resumen.sort_values("tiempo_total_s", ascending=False).reset_index()
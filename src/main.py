@@ -1,29 +1,47 @@
-import pandas as pd
+import argparse
+from analizador import Analizador
 from gestor_datos import GestorDatos
 from visualizador import Visualizador
 
-def main():
+def main(argv=None):
     """
     Función principal que inicializa la aplicación SNIES, carga los datos,
     muestra información de las columnas y genera gráficos de visualización.
+
+    Parámetros
+    ----------
+    argv : list, opcional
+        Argumentos de la línea de comandos (por defecto se leen de sys.argv).
     """
+    parser = argparse.ArgumentParser(description="Carga los archivos SNIES y genera las gráficas.")
+    parser.add_argument("directorio", nargs="?", default="../docs/inputs",
+                        help="Directorio con los archivos Excel de entrada (por defecto ../docs/inputs).")
+    args = parser.parse_args(argv)
+
     print("Inicializando la aplicación SNIES...")
 
     # Ruta del directorio donde se encuentran los archivos de entrada
-    ruta_directorio = "C:/Users/Lenovo/Desktop/GIT/proyecto-3-biosnies/docs/inputs"
+    ruta_directorio = args.directorio
 
     # Inicializa la instancia de GestorDatos con la ruta del directorio
-    gestor = GestorDatos(ruta_directorio)
+    gestor = GestorDatos(ruta_directorio, cache_dir="../docs/cache")
+
+    # Declara las columnas que usan las gráficas y el análisis para no cargar el resto
+    gestor.require_columns(Visualizador.COLUMNAS_REQUERIDAS)
+    gestor.require_columns(Analizador.COLUMNAS_REQUERIDAS)
 
     # Carga los datos de los archivos Excel en el directorio especificado
-    datos = gestor.load_data()
+    datos = gestor.load_data(parallel=True)
 
-    # Consolida los datos cargados en un solo DataFrame
-    datos_consolidados = pd.concat(datos.values(), ignore_index=True)
+    # Obtiene la tabla maestra consolidada durante la carga
+    datos_consolidados = gestor.get_master_table()
 
     # Muestra información de las columnas de los DataFrames cargados
     gestor.show_column_info(datos)
 
+    # Muestra la memoria ocupada por cada archivo antes y después del esquema de tipos
+    print(gestor.get_memory_report().to_string(index=False))
+
     # Inicializa la instancia de Visualizador
     visualizador = Visualizador()
 
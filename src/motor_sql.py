@@ -0,0 +1,263 @@
+import sqlite3
+import threading
+import numpy as np
+import pandas as pd
+
+try:
+    import duckdb
+    MOTOR_POR_DEFECTO = "duckdb"
+except ImportError:
+    duckdb = None
+    MOTOR_POR_DEFECTO = "sqlite"
+
+
+def citar(identificador):
+    """
+    Devuelve un identificador SQL entre comillas dobles.
+    """
+    return '"' + str(identificador).replace('"', '""') + '"'
+
+
+class MotorSQL:
+    """
+    Motor SQL embebido sobre los datos SNIES cargados.
+
+    Con DuckDB los DataFrames se registran sin copiarlos y los archivos Parquet de la
+    caché columnar se consultan directamente desde el disco, de modo que los filtros y
+    agregaciones se ejecutan en varios núcleos sin pasar los datos por pandas. Si DuckDB
+    no está instalado se usa SQLite en memoria, copiando las tablas.
+
+    Atributos
+    ----------
+    motor : str
+        "duckdb" o "sqlite".
+
+    Métodos
+    -------
+    registrar_tabla(nombre, df)
+        Registra un DataFrame como tabla.
+    registrar_parquet(nombre, rutas)
+        Registra uno o varios archivos Parquet como una sola tabla.
+    tablas()
+        Devuelve los nombres de las tablas registradas.
+    columnas(tabla)
+        Devuelve las columnas de una tabla.
+    consultar(sql, parametros=None)
+        Ejecuta una consulta SQL y devuelve un DataFrame.
+    reporte_agrupado(tabla, dimensiones, metricas, filtros=None, agregacion="sum", orden=None, limite=None)
+        Agrupa y agrega una tabla sin escribir SQL.
+    """
+
+    AGREGACIONES = {"sum", "avg", "min", "max", "count"}
+    # Nombre con el que GestorDatos registra la tabla maestra
+    TABLA_DATOS = "snies"
+
+    def __init__(self, motor=None):
+        """
+        Abre una conexión en memoria.
+
+        Parámetros
+        ----------
+        motor : str, opcional
+            "duckdb" o "sqlite". Si es None se usa DuckDB cuando está instalado.
+        """
+        self.motor = motor or MOTOR_POR_DEFECTO
+        if self.motor == "duckdb":
+            if duckdb is None:
+                raise ImportError("El motor 'duckdb' requiere el paquete duckdb.")
+            self._conexion = duckdb.connect(":memory:")
+        elif self.motor == "sqlite":
+            self._conexion = sqlite3.connect(":memory:", check_same_thread=False)
+        else:
+            raise ValueError(f"Motor SQL no soportado: {self.motor}")
+        self._tablas = {}
+        self._lock = threading.Lock()
+
+    def registrar_tabla(self, nombre, df):
+        """
+        Registra un DataFrame como tabla (una vista sin copia en DuckDB).
+
+        Parámetros
+        ----------
+        nombre : str
+            Nombre de la tabla.
+        df : DataFrame
+            Datos a registrar.
+        """
+        with self._lock:
+            if self.motor == "duckdb":
+                self._conexion.register(nombre, df)
+            else:
+                df.to_sql(nombre, self._conexion, index=False, if_exists="replace")
+            self._tablas[nombre] = list(map(str, df.columns))
+
+    def registrar_parquet(self, nombre, rutas):
+        """
+        Registra uno o varios archivos Parquet como una sola tabla.
+
+        Con DuckDB la tabla es una vista que lee los archivos en cada consulta (fuera de
+        memoria); las columnas que faltan en algún archivo quedan nulas.
+
+        Parámetros
+        ----------
+        nombre : str
+            Nombre de la tabla.
+        rutas : dict
+            Diccionario {archivo_origen: ruta_parquet}; el archivo de origen se guarda en la
+            columna source_file.
+        """
+        if self.motor != "duckdb":
+            partes = [pd.read_parquet(ruta).assign(source_file=origen) for origen, ruta in rutas.items()]
+            self.registrar_tabla(nombre, pd.concat(partes, ignore_index=True) if partes else pd.DataFrame())
+            return
+
+        selecciones = [
+            f"SELECT *, '{origen.replace(chr(39), chr(39) * 2)}' AS source_file "
+            f"FROM read_parquet('{ruta.replace(chr(39), chr(39) * 2)}')"
+            for origen, ruta in rutas.items()
+        ]
+        with self._lock:
+            self._conexion.execute(f"CREATE OR REPLACE VIEW {citar(nombre)} AS "
+                                   + " UNION ALL BY NAME ".join(selecciones))
+            columnas = self._conexion.execute(f"SELECT * FROM {citar(nombre)} LIMIT 0").df().columns
+            self._tablas[nombre] = list(map(str, columnas))
+
+    def tablas(self):
+        """
+        Devuelve los nombres de las tablas registradas.
+        """
+        return list(self._tablas)
+
+    def columnas(self, tabla):
+        """
+        Devuelve las columnas de una tabla registrada.
+
+        Lanza
+        -----
+        KeyError
+            Si la tabla no está registrada.
+        """
+        if tabla not in self._tablas:
+            raise KeyError(f"La tabla '{tabla}' no está registrada en el motor SQL.")
+        return list(self._tablas[tabla])
+
+    def consultar(self, sql, parametros=None):
+        """
+        Ejecuta una consulta SQL y devuelve el resultado.
+
+        Parámetros
+        ----------
+        sql : str
+            Consulta con marcadores "?" para los parámetros.
+        parametros : list, opcional
+            Valores de los marcadores.
+
+        Devuelve
+        -------
+        DataFrame
+            Resultado de la consulta.
+        """
+        parametros = list(parametros or [])
+        with self._lock:
+            if self.motor == "duckdb":
+                return self._conexion.execute(sql, parametros).df()
+            return pd.read_sql_query(sql, self._conexion, params=parametros)
+
+    @staticmethod
+    def _valor(valor):
+        return valor.item() if isinstance(valor, np.generic) else valor
+
+    def _condiciones(self, filtros):
+        """
+        Traduce un diccionario de filtros a una cláusula WHERE con parámetros.
+        """
+        condiciones = []
+        parametros = []
+        for columna, valor in (filtros or {}).items():
+            if valor is None:
+                condiciones.append(f"{citar(columna)} IS NULL")
+            elif isinstance(valor, tuple) and len(valor) == 2:
+                condiciones.append(f"{citar(columna)} BETWEEN ? AND ?")
+                parametros.extend(self._valor(v) for v in valor)
+            elif isinstance(valor, (list, set, frozenset, np.ndarray, pd.Index, pd.Series)):
+                valores = [self._valor(v) for v in pd.unique(np.asarray(list(valor), dtype=object))]
+                if not valores:
+                    condiciones.append("1 = 0")
+                    continue
+                condiciones.append(f"{citar(columna)} IN ({', '.join('?' * len(valores))})")
+                parametros.extend(valores)
+            else:
+                condiciones.append(f"{citar(columna)} = ?")
+                parametros.append(self._valor(valor))
+        where = (" WHERE " + " AND ".join(condiciones)) if condiciones else ""
+        return where, parametros
+
+    def reporte_agrupado(self, tabla, dimensiones, metricas, filtros=None, agregacion="sum", orden=None, limite=None):
+        """
+        Agrupa y agrega una tabla registrada; el filtrado y la agregación los hace el motor.
+
+        Parámetros
+        ----------
+        tabla : str
+            Nombre de la tabla registrada.
+        dimensiones : list
+            Columnas por las que se agrupa (puede ser vacía para un total general).
+        metricas : list or dict
+            Columnas a agregar, o diccionario {columna: agregación}.
+        filtros : dict, opcional
+            {columna: valor}. Un valor escalar filtra por igualdad, una lista por pertenencia,
+            una tupla (mínimo, máximo) por rango inclusivo y None por nulos.
+        agregacion : str, opcional
+            Agregación de las métricas dadas como lista: "sum", "avg", "min", "max" o "count"
+            (por defecto es "sum").
+        orden : list, opcional
+            Columnas de orden del resultado. Si es None se ordena por las dimensiones.
+        limite : int, opcional
+            Número máximo de filas.
+
+        Devuelve
+        -------
+        DataFrame
+            Una fila por combinación de dimensiones con las métricas agregadas.
+
+        Lanza
+        -----
+        KeyError
+            Si alguna columna no existe en la tabla.
+        ValueError
+            Si la agregación no está soportada.
+        """
+        disponibles = set(self.columnas(tabla))
+        if not isinstance(metricas, dict):
+            metricas = {metrica: agregacion for metrica in metricas}
+        faltantes = [c for c in list(dimensiones) + list(metricas) + list(filtros or {}) if c not in disponibles]
+        if faltantes:
+            raise KeyError(f"La tabla '{tabla}' no tiene las columnas: {faltantes}")
+
+        expresiones = [citar(dimension) for dimension in dimensiones]
+        for metrica, funcion in metricas.items():
+            funcion = funcion.lower()
+            if funcion not in self.AGREGACIONES:
+                raise ValueError(f"Agregación no soportada: {funcion}")
+            expresion = f"{funcion.upper()}({citar(metrica)})"
+            if funcion in ("sum", "count"):
+                expresion = f"CAST({expresion} AS BIGINT)"
+            expresiones.append(f"{expresion} AS {citar(metrica)}")
+
+        where, parametros = self._condiciones(filtros)
+        sql = f"SELECT {', '.join(expresiones)} FROM {citar(tabla)}{where}"
+        if dimensiones:
+            sql += " GROUP BY " + ", ".join(citar(dimension) for dimension in dimensiones)
+        orden = dimensiones if orden is None else orden
+        if orden:
+            sql += " ORDER BY " + ", ".join(citar(columna) for columna in orden)
+        if limite is not None:
+            sql += f" LIMIT {int(limite)}"
+        return self.consultar(sql, parametros)
+
+    def cerrar(self):
+        """
+        Cierra la conexión.
+        """
+        with self._lock:
+            self._conexion.close()
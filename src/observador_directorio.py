@@ -0,0 +1,194 @@
+import os
+import threading
+import time
+from gestor_datos import GestorDatos
+
+
+class InstantaneaDatos:
+    """
+    Versión publicada de los datos cargados por ObservadorDirectorio.
+
+    Atributos
+    ----------
+    version : int
+        Número de versión, creciente en cada recarga publicada.
+    gestor : GestorDatos
+        Copia de solo lectura del gestor (ver GestorDatos.snapshot).
+    archivos : list
+        Archivos incluidos en esta versión.
+    cargada_en : str
+        Fecha y hora en que se publicó la versión.
+    """
+
+    def __init__(self, version, gestor):
+        self.version = version
+        self.gestor = gestor
+        self.archivos = sorted(gestor.data)
+        self.cargada_en = time.strftime("%Y-%m-%d %H:%M:%S")
+
+    def __repr__(self):
+        return (f"InstantaneaDatos(version={self.version}, archivos={len(self.archivos)}, "
+                f"cargada_en={self.cargada_en})")
+
+
+class ObservadorDirectorio:
+    """
+    Servicio en segundo plano que vigila el directorio de entradas y recarga los datos.
+
+    Un hilo revisa periódicamente el tamaño y la fecha de modificación de los archivos
+    .xlsx del directorio. Cuando detecta un cambio, carga solo los archivos nuevos o
+    modificados (GestorDatos.load_data con incremental=True) y publica una nueva
+    InstantaneaDatos reemplazando la anterior de forma atómica. Quien consume los datos
+    siempre ve una versión completa, nunca una carga a medias.
+
+    Con un AlmacenCompartido, la primera carga parte de la última versión publicada en
+    él (otros procesos la abren mapeada en memoria, sin leer los Excel) y cada versión
+    nueva se publica allí.
+
+    Atributos
+    ----------
+    gestor : GestorDatos
+        Gestor usado exclusivamente por el hilo de carga.
+    intervalo : float
+        Segundos entre revisiones del directorio.
+    progreso : dict
+        Estado de la carga en curso: estado, archivo, completados y total.
+    ultimo_error : Exception or None
+        Último error ocurrido durante una recarga.
+
+    Métodos
+    -------
+    iniciar()
+        Inicia el hilo de vigilancia.
+    detener(timeout=None)
+        Detiene el hilo de vigilancia.
+    recargar()
+        Carga los cambios del directorio y publica una nueva versión.
+    obtener_instantanea()
+        Devuelve la versión de los datos que se está sirviendo.
+    """
+
+    def __init__(self, ruta_directorio, intervalo=5.0, parallel=False, almacen=None, **opciones_gestor):
+        """
+        Inicializa el observador.
+
+        Parámetros
+        ----------
+        ruta_directorio : str
+            Directorio con los archivos Excel de entrada.
+        intervalo : float, opcional
+            Segundos entre revisiones del directorio (por defecto es 5.0).
+        parallel : bool, opcional
+            Si es True, los archivos se leen en un pool de procesos (por defecto es False).
+        almacen : AlmacenCompartido, opcional
+            Almacén compartido del que se parte en la primera carga (solo se leen los
+            archivos que cambiaron desde su publicación) y donde se publica cada versión nueva.
+        opciones_gestor : dict
+            Argumentos adicionales para GestorDatos (por ejemplo, cache_dir).
+        """
+        self.gestor = GestorDatos(ruta_directorio, **opciones_gestor)
+        self.intervalo = intervalo
+        self.parallel = parallel
+        self.almacen = almacen
+        self.progreso = {"estado": "inactivo", "archivo": None, "completados": 0, "total": 0}
+        self.ultimo_error = None
+        self._instantanea = None
+        self._lock = threading.Lock()
+        self._detener = threading.Event()
+        self._hilo = None
+
+    def iniciar(self):
+        """
+        Inicia el hilo de vigilancia si no está en ejecución.
+        """
+        if self._hilo is not None and self._hilo.is_alive():
+            return
+        self._detener.clear()
+        self._hilo = threading.Thread(target=self._ciclo, name="ObservadorDirectorio", daemon=True)
+        self._hilo.start()
+
+    def detener(self, timeout=None):
+        """
+        Detiene el hilo de vigilancia.
+
+        Parámetros
+        ----------
+        timeout : float, opcional
+            Segundos máximos de espera a que termine el hilo.
+        """
+        self._detener.set()
+        if self._hilo is not None:
+            self._hilo.join(timeout)
+
+    def _estado_directorio(self):
+        estado = {}
+        for file in os.listdir(self.gestor.ruta_directorio):
+            if file.endswith('.xlsx'):
+                stat = os.stat(os.path.join(self.gestor.ruta_directorio, file))
+                estado[file] = (stat.st_size, stat.st_mtime_ns)
+        return estado
+
+    def _ciclo(self):
+        ultimo_estado = None
+        while not self._detener.is_set():
+            try:
+                estado = self._estado_directorio()
+                if estado != ultimo_estado:
+                    self.recargar()
+                    ultimo_estado = estado
+            except Exception as e:
+                self.ultimo_error = e
+                self.progreso = {**self.progreso, "estado": "error"}
+                print(f"Error al recargar {self.gestor.ruta_directorio}: {e}")
+            self._detener.wait(self.intervalo)
+
+    def _actualizar_progreso(self, archivo, completados, total):
+        self.progreso = {"estado": "cargando", "archivo": archivo, "completados": completados, "total": total}
+
+    def recargar(self):
+        """
+        Carga los cambios del directorio y publica una nueva versión de los datos.
+
+        Devuelve
+        -------
+        InstantaneaDatos
+            Versión publicada (la anterior si no hubo cambios).
+        """
+        self.progreso = {"estado": "cargando", "archivo": None, "completados": 0, "total": 0}
+        # Sin datos todavía se parte del almacén; load_data solo lee lo que cambió desde su publicación
+        if self._instantanea is None and self.almacen is not None and not self.gestor.data:
+            self.gestor.open_shared(self.almacen)
+        self.gestor.load_data(parallel=self.parallel, incremental=True,
+                              progress_callback=self._actualizar_progreso)
+        # El cubo y la dimensión de programas se mantienen en el gestor para que las
+        # siguientes recargas los actualicen por archivo
+        self.gestor.get_cube()
+        self.gestor.get_program_dimension()
+        hubo_cambios = any(self.gestor.last_changes.values())
+        if self.almacen is not None and hubo_cambios:
+            try:
+                self.gestor.publish_shared(self.almacen)
+            except Exception as e:
+                print(f"Advertencia: no se pudo publicar {self.gestor.ruta_directorio} en el almacén compartido: {e}")
+        # La copia se prepara fuera del candado; el reemplazo es solo un cambio de referencia
+        nuevos_datos = self.gestor.snapshot() if hubo_cambios or self._instantanea is None else None
+        with self._lock:
+            if nuevos_datos is not None:
+                version = 1 if self._instantanea is None else self._instantanea.version + 1
+                self._instantanea = InstantaneaDatos(version, nuevos_datos)
+            instantanea = self._instantanea
+        self.ultimo_error = None
+        self.progreso = {**self.progreso, "estado": "listo", "archivo": None}
+        return instantanea
+
+    def obtener_instantanea(self):
+        """
+        Devuelve la versión de los datos que se está sirviendo.
+
+        Devuelve
+        -------
+        InstantaneaDatos or None
+            Última versión publicada, o None si la primera carga no ha terminado.
+        """
+        with self._lock:
+            return self._instantanea
@@ -1,18 +1,197 @@
+import pandas as pd
+
+
 class Programa:
-    def __init__(self, nombre, universidad, codigo_snies, nivel, campus):
+    """
+    Registro compacto de un programa académico.
+
+    Usa __slots__ para que cada instancia ocupe solo sus atributos, sin diccionario.
+
+    Atributos
+    ----------
+    nombre : str
+        Nombre del programa académico.
+    universidad : str
+        Institución que lo ofrece.
+    codigo_snies : int
+        Código SNIES del programa.
+    nivel : str
+        Nivel de formación.
+    campus : str
+        Municipio de oferta del programa (también disponible como municipio).
+    metodologia : str
+        Metodología o modalidad del programa.
+    """
+
+    __slots__ = ("nombre", "universidad", "codigo_snies", "nivel", "campus", "metodologia")
+
+    def __init__(self, nombre, universidad, codigo_snies, nivel, campus, metodologia=None):
         self.nombre = nombre
         self.universidad = universidad
         self.codigo_snies = codigo_snies
         self.nivel = nivel
         self.campus = campus
+        self.metodologia = metodologia
+
+    @property
+    def municipio(self):
+        return self.campus
 
     def obtener_informacion(self):
         return (f"Programa: {self.nombre}\n"
                 f"Universidad: {self.universidad}\n"
                 f"Código SNIES: {self.codigo_snies}\n"
                 f"Nivel: {self.nivel}\n"
-                f"Campus: {self.campus}\n")
+                f"Campus: {self.campus}\n"
+                f"Metodología: {self.metodologia}\n")
+
+    def __eq__(self, otro):
+        return isinstance(otro, Programa) and self.codigo_snies == otro.codigo_snies
+
+    def __hash__(self):
+        return hash(self.codigo_snies)
 
     def __repr__(self):
         return (f"Programa(nombre={self.nombre}, universidad={self.universidad}, "
-                f"codigo_snies={self.codigo_snies}, nivel={self.nivel}, campus={self.campus})")
+                f"codigo_snies={self.codigo_snies}, nivel={self.nivel}, campus={self.campus}, "
+                f"metodologia={self.metodologia})")
+
+
+class DimensionProgramas:
+    """
+    Dimensión de programas: una entrada por codigo_snies, sin duplicados entre archivos.
+
+    Los datos SNIES repiten cada programa por año, semestre, sexo y archivo; la dimensión
+    conserva la primera aparición de cada código con sus atributos descriptivos. La tabla
+    está indexada por codigo_snies (un índice hash de pandas), de modo que seleccionar
+    programas por código no recorre las filas originales. Las instancias no se modifican:
+    agregar devuelve una dimensión nueva.
+
+    Atributos
+    ----------
+    tabla : DataFrame
+        Una fila por programa, indexada por codigo_snies, con las columnas de COLUMNAS presentes.
+
+    Métodos
+    -------
+    desde_dataframe(df)
+        Construye la dimensión a partir de datos SNIES con una fila por registro.
+    agregar(df)
+        Devuelve una dimensión con los programas nuevos de df agregados.
+    seleccionar(codigos)
+        Devuelve las filas de la dimensión de los códigos dados.
+    obtener(codigo)
+        Devuelve el Programa de un código.
+    etiqueta(codigo)
+        Devuelve un texto que identifica un programa en listas de selección.
+    """
+
+    # Columnas de la tabla maestra que describen un programa
+    COLUMNAS = ["programa_academico", "institucion", "nivel_formacion", "metodologia", "municipio_oferta_programa"]
+
+    def __init__(self, tabla):
+        self.tabla = tabla
+        self._programas = {}
+
+    @classmethod
+    def desde_dataframe(cls, df):
+        """
+        Construye la dimensión a partir de datos SNIES con una fila por registro.
+
+        Parámetros
+        ----------
+        df : DataFrame
+            Datos con la columna codigo_snies (por ejemplo, la tabla maestra de GestorDatos).
+
+        Devuelve
+        -------
+        DimensionProgramas
+            Dimensión con un programa por código SNIES.
+        """
+        columnas = [col for col in cls.COLUMNAS if col in df.columns]
+        if "codigo_snies" not in df.columns:
+            return cls(pd.DataFrame(columns=columnas, index=pd.Index([], name="codigo_snies")))
+        datos = df.loc[df["codigo_snies"].notna(), ["codigo_snies"] + columnas]
+        tabla = datos.drop_duplicates("codigo_snies").set_index("codigo_snies")
+        # Los categóricos conservan solo las categorías de los programas de la dimensión
+        for columna in tabla.columns:
+            if isinstance(tabla[columna].dtype, pd.CategoricalDtype):
+                tabla[columna] = tabla[columna].cat.remove_unused_categories()
+        return cls(tabla)
+
+    def agregar(self, df):
+        """
+        Devuelve una dimensión con los programas de df que aún no estaban.
+
+        Parámetros
+        ----------
+        df : DataFrame
+            Datos SNIES de un archivo nuevo.
+
+        Devuelve
+        -------
+        DimensionProgramas
+            Nueva dimensión; la actual no cambia.
+        """
+        nuevos = DimensionProgramas.desde_dataframe(df).tabla
+        nuevos = nuevos[~nuevos.index.isin(self.tabla.index)]
+        if nuevos.empty:
+            return self
+        if self.tabla.empty:
+            return DimensionProgramas(nuevos)
+        tabla = pd.concat([self.tabla, nuevos])
+        tabla.index.name = "codigo_snies"
+        return DimensionProgramas(tabla)
+
+    def __len__(self):
+        return len(self.tabla)
+
+    def __contains__(self, codigo):
+        return codigo in self.tabla.index
+
+    def codigos(self):
+        """
+        Devuelve los códigos SNIES de la dimensión.
+        """
+        return self.tabla.index
+
+    def seleccionar(self, codigos):
+        """
+        Devuelve las filas de la dimensión de los códigos dados, una por código.
+
+        Parámetros
+        ----------
+        codigos : iterable
+            Códigos SNIES; los repetidos y los que no están en la dimensión se ignoran.
+
+        Devuelve
+        -------
+        DataFrame
+            Filas con la columna codigo_snies y las columnas descriptivas.
+        """
+        posiciones = self.tabla.index.get_indexer(pd.unique(pd.Series(list(codigos), dtype=object)))
+        return self.tabla.iloc[posiciones[posiciones >= 0]].reset_index()
+
+    def obtener(self, codigo):
+        """
+        Devuelve el Programa de un código SNIES.
+
+        Lanza
+        -----
+        KeyError
+            Si el código no está en la dimensión.
+        """
+        if codigo not in self._programas:
+            fila = self.tabla.loc[codigo]
+            self._programas[codigo] = Programa(
+                fila.get("programa_academico"), fila.get("institucion"), codigo, fila.get("nivel_formacion"),
+                fila.get("municipio_oferta_programa"), fila.get("metodologia"))
+        return self._programas[codigo]
+
+    def etiqueta(self, codigo):
+        """
+        Devuelve "programa · institución · municipio (código)" para listas de selección.
+        """
+        fila = self.tabla.loc[codigo]
+        partes = [fila.get(col) for col in ("programa_academico", "institucion", "municipio_oferta_programa")]
+        return " · ".join(str(parte) for parte in partes if pd.notna(parte)) + f" ({codigo})"
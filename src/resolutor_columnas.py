@@ -0,0 +1,144 @@
+import json
+import re
+import unicodedata
+
+PATRON_ESPACIOS = re.compile(r"[\s_]+")
+
+
+def normalizar_encabezado(encabezado):
+    """
+    Normaliza un encabezado: sin tildes, espacios colapsados y en mayúsculas.
+
+    Los guiones bajos se tratan como espacios, de modo que "IES_PADRE" e "ies  padre"
+    se normalizan igual.
+
+    Parámetros
+    ----------
+    encabezado : str
+        Encabezado original de la columna.
+
+    Devuelve
+    -------
+    str
+        Encabezado normalizado.
+    """
+    texto = unicodedata.normalize("NFKD", str(encabezado))
+    texto = "".join(c for c in texto if not unicodedata.combining(c))
+    return PATRON_ESPACIOS.sub(" ", texto).strip().upper()
+
+
+def cargar_sinonimos(ruta):
+    """
+    Lee sinónimos adicionales de un archivo JSON.
+
+    El archivo debe contener un objeto {nombre_canonico: [sinonimo, ...]}.
+
+    Parámetros
+    ----------
+    ruta : str
+        Ruta del archivo JSON.
+
+    Devuelve
+    -------
+    dict
+        Diccionario de sinónimos leído.
+
+    Lanza
+    -----
+    ValueError
+        Si el archivo no tiene el formato esperado.
+    """
+    with open(ruta, encoding="utf-8") as archivo:
+        sinonimos = json.load(archivo)
+    if not isinstance(sinonimos, dict) or not all(isinstance(v, list) for v in sinonimos.values()):
+        raise ValueError(f"El archivo de sinónimos {ruta} debe ser un objeto {{columna: [sinónimos]}}.")
+    return sinonimos
+
+
+class ResolutorColumnas:
+    """
+    Resuelve encabezados de columnas a nombres canónicos mediante un mapa precompilado.
+
+    Todos los sinónimos se normalizan una sola vez al construir el resolutor; resolver
+    un encabezado es una búsqueda en un diccionario. Los encabezados ya resueltos se
+    recuerdan para los siguientes archivos y los que no tienen sinónimo se registran.
+
+    Atributos
+    ----------
+    no_mapeados : set
+        Encabezados que no coincidieron con ningún sinónimo.
+
+    Métodos
+    -------
+    resolver(encabezado)
+        Devuelve el nombre canónico de un encabezado o None.
+    renombres(columnas)
+        Devuelve el diccionario de renombres para una lista de columnas.
+    """
+
+    def __init__(self, column_synonyms):
+        """
+        Compila el mapa de encabezados normalizados a nombres canónicos.
+
+        Parámetros
+        ----------
+        column_synonyms : dict
+            Diccionario {nombre_canonico: [sinonimo, ...]}.
+        """
+        self._mapa = {}
+        for canonico, sinonimos in column_synonyms.items():
+            for sinonimo in [canonico] + list(sinonimos):
+                clave = normalizar_encabezado(sinonimo)
+                if self._mapa.setdefault(clave, canonico) != canonico:
+                    print(f"Advertencia: el sinónimo '{sinonimo}' ya corresponde a '{self._mapa[clave]}'.")
+        self._resueltos = {}
+        self.no_mapeados = set()
+
+    def resolver(self, encabezado):
+        """
+        Devuelve el nombre canónico de un encabezado.
+
+        Parámetros
+        ----------
+        encabezado : str
+            Encabezado original de la columna.
+
+        Devuelve
+        -------
+        str or None
+            Nombre canónico, o None si el encabezado no tiene sinónimo.
+        """
+        if encabezado not in self._resueltos:
+            canonico = self._mapa.get(normalizar_encabezado(encabezado))
+            if canonico is None:
+                self.no_mapeados.add(encabezado)
+            self._resueltos[encabezado] = canonico
+        return self._resueltos[encabezado]
+
+    def renombres(self, columnas):
+        """
+        Devuelve el diccionario de renombres para una lista de columnas.
+
+        Las columnas sin sinónimo se pasan a minúsculas con guiones bajos.
+
+        Parámetros
+        ----------
+        columnas : iterable
+            Encabezados originales.
+
+        Devuelve
+        -------
+        dict
+            Diccionario {encabezado_original: nuevo_nombre}.
+        """
+        nuevos = {}
+        for columna in columnas:
+            canonico = self.resolver(columna)
+            nuevos[columna] = canonico if canonico is not None else str(columna).lower().strip().replace(" ", "_")
+        return nuevos
+
+    def sin_mapear(self, columnas):
+        """
+        Devuelve las columnas de la lista que no tienen sinónimo.
+        """
+        return [columna for columna in columnas if self.resolver(columna) is None]
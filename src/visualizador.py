@@ -1,5 +1,29 @@
+import functools
+import hashlib
+import threading
+from collections import OrderedDict
 import plotly.express as px
 import pandas as pd
+from instrumentacion import Instrumentador
+
+
+def _memorizar_figura(metodo):
+    """
+    Decorador que reutiliza la figura de un método de Visualizador mientras la huella de
+    los datos analizados y la configuración no cambien (ver Visualizador.huella_datos).
+    """
+    @functools.wraps(metodo)
+    def wrapper(self):
+        configuracion = tuple(sorted((k, repr(v)) for k, v in self.configuracion_graficos.items()))
+        clave = (metodo.__name__, self.huella_datos(), configuracion)
+        entrada = Visualizador._obtener_de_cache(clave)
+        if entrada is not None:
+            return entrada[0]
+        fig = metodo(self)
+        if fig is not None:
+            Visualizador._guardar_en_cache(clave, fig)
+        return fig
+    return wrapper
 
 class Visualizador:
     """
@@ -8,16 +32,39 @@ class Visualizador:
     Atributos
     ----------
     configuracion_graficos : dict
-        Configuración opcional para los gráficos.
+        Configuración opcional para los gráficos: "max_categorias" (categorías que se
+        muestran antes de agrupar el resto en "Otros") y "umbral_webgl" (puntos a partir
+        de los cuales las líneas se dibujan con WebGL).
     datos_analizados : DataFrame
         DataFrame que contiene los datos analizados para la visualización.
 
     """
 
+    # Columnas canónicas de los datos crudos que usan las gráficas (ver GestorDatos.require_columns)
+    COLUMNAS_REQUERIDAS = ["programa_academico", "anio", "metodologia", "sexo", "inscritos", "graduados"]
+
+    # Nombres de los datos crudos que equivalen a las columnas que usan las gráficas
+    ALIAS_COLUMNAS = {"programa_academico": "programa", "metodologia": "modalidad"}
+
+    MAX_CATEGORIAS = 15
+    UMBRAL_WEBGL = 1000
+    ETIQUETA_OTROS = "Otros"
+
+    # Columnas que determinan las gráficas; solo ellas forman parte de la huella de los datos
+    COLUMNAS_HUELLA = ["anio", "programa", "programa_academico", "modalidad", "metodologia", "sexo",
+                       "inscritos", "graduados"]
+
+    # Caché LRU de figuras compartida por todas las instancias: {clave: (figura, json)}
+    max_bytes_cache = 64 * 1024 * 1024
+    _cache_figuras = OrderedDict()
+    _bytes_cache = 0
+    _lock_cache = threading.Lock()
+
     def __init__(self, configuracion_graficos=None):
 
         self.configuracion_graficos = configuracion_graficos or {}
         self.datos_analizados = pd.DataFrame()
+        self._huella = None
 
     def establecer_datos_analizados(self, datos):
         """
@@ -29,23 +76,188 @@ class Visualizador:
             DataFrame que contiene los datos analizados.
         """
         self.datos_analizados = datos
+        self._huella = None
         print("Datos analizados configurados para visualización.")
 
+    def huella_datos(self):
+        """
+        Devuelve la huella de los datos analizados.
+
+        La huella es el hash de los valores de las columnas que usan las gráficas
+        (COLUMNAS_HUELLA) y se calcula una vez por cada llamada a establecer_datos_analizados.
+
+        Devuelve
+        -------
+        str
+            Hash hexadecimal de los datos.
+        """
+        if self._huella is None:
+            datos = self.datos_analizados
+            columnas = [columna for columna in self.COLUMNAS_HUELLA if columna in datos.columns]
+            digest = hashlib.sha256(repr((columnas, len(datos))).encode("utf-8"))
+            if columnas and len(datos):
+                digest.update(pd.util.hash_pandas_object(datos[columnas], index=False).to_numpy().tobytes())
+            self._huella = digest.hexdigest()
+        return self._huella
+
+    @classmethod
+    def configurar_cache(cls, max_bytes):
+        """
+        Cambia el tamaño máximo de la caché de figuras, medido por el JSON de cada figura.
+
+        Parámetros
+        ----------
+        max_bytes : int
+            Bytes máximos; 0 desactiva la caché.
+        """
+        with cls._lock_cache:
+            cls.max_bytes_cache = max_bytes
+            cls._recortar_cache()
+
+    @classmethod
+    def limpiar_cache(cls):
+        """
+        Elimina todas las figuras de la caché.
+        """
+        with cls._lock_cache:
+            cls._cache_figuras.clear()
+            cls._bytes_cache = 0
+
+    @classmethod
+    def _obtener_de_cache(cls, clave):
+        with cls._lock_cache:
+            entrada = cls._cache_figuras.get(clave)
+            if entrada is not None:
+                cls._cache_figuras.move_to_end(clave)
+            return entrada
+
+    @classmethod
+    def _guardar_en_cache(cls, clave, fig):
+        contenido = fig.to_json()
+        with cls._lock_cache:
+            if clave in cls._cache_figuras or len(contenido) > cls.max_bytes_cache:
+                return
+            cls._cache_figuras[clave] = (fig, contenido)
+            cls._bytes_cache += len(contenido)
+            cls._recortar_cache()
+
+    @classmethod
+    def _recortar_cache(cls):
+        while cls._cache_figuras and cls._bytes_cache > cls.max_bytes_cache:
+            _, (_, contenido) = cls._cache_figuras.popitem(last=False)
+            cls._bytes_cache -= len(contenido)
+
+    def obtener_figura_json(self, nombre_grafica):
+        """
+        Devuelve el JSON de una figura ya construida para los datos analizados actuales.
+
+        Parámetros
+        ----------
+        nombre_grafica : str
+            Nombre del método que construye la figura (por ejemplo, "graficar_tendencias_inscripcion").
+
+        Devuelve
+        -------
+        str or None
+            JSON de la figura, o None si no está en la caché.
+        """
+        configuracion = tuple(sorted((k, repr(v)) for k, v in self.configuracion_graficos.items()))
+        entrada = self._obtener_de_cache((nombre_grafica, self.huella_datos(), configuracion))
+        return entrada[1] if entrada is not None else None
+
+    def establecer_datos_desde_cubo(self, cubo, nivel="programa", claves=None, anios=None):
+        """
+        Establece como datos analizados los totales de un nivel del cubo agregado.
+
+        La columna "programa" de los datos resultantes contiene la etiqueta del nivel
+        (nombre del programa, institución, departamento...), de modo que las gráficas
+        existentes funcionan en cualquier nivel.
+
+        Parámetros
+        ----------
+        cubo : CuboAgregado
+            Cubo de totales precalculados (ver GestorDatos.get_cube).
+        nivel : str, opcional
+            Nivel de agregación del cubo (por defecto es "programa").
+        claves : iterable, opcional
+            Claves del nivel a graficar. Si es None se grafican todas.
+        anios : iterable, opcional
+            Años a graficar. Si es None se grafican todos.
+        """
+        datos = cubo.consultar(nivel, claves=claves, anios=anios)
+        etiqueta = "programa_academico" if nivel == "programa" else cubo.NIVELES[nivel][-1]
+        self.establecer_datos_analizados(datos.assign(programa=datos[etiqueta].astype(str)))
+
+    def _datos(self, columnas):
+        """
+        Devuelve las columnas pedidas de los datos analizados, aceptando los nombres crudos
+        de ALIAS_COLUMNAS, o None si falta alguna.
+        """
+        datos = self.datos_analizados
+        disponibles = {}
+        for original, alias in self.ALIAS_COLUMNAS.items():
+            if alias not in datos.columns and original in datos.columns:
+                disponibles[alias] = original
+        origen = {columna: disponibles.get(columna, columna) for columna in columnas}
+        if any(columna not in datos.columns for columna in origen.values()):
+            return None
+        return pd.DataFrame({columna: datos[original] for columna, original in origen.items()})
+
+    def _agregar(self, datos, grano, valor):
+        """
+        Suma la métrica por el grano de la gráfica, con las categorías como texto.
+        """
+        for columna in grano:
+            # Los categóricos también cuentan como texto para is_string_dtype, pero no admiten ETIQUETA_OTROS
+            serie = datos[columna]
+            if columna != "anio" and (isinstance(serie.dtype, pd.CategoricalDtype)
+                                      or not pd.api.types.is_string_dtype(serie)):
+                datos[columna] = serie.astype(str)
+        datos[valor] = pd.to_numeric(datos[valor], errors="coerce")
+        return datos.groupby(grano, observed=True, as_index=False, sort=False)[valor].sum()
+
+    def _limitar_categorias(self, datos, columna, valor, grano):
+        """
+        Conserva las categorías con mayor total y agrupa las demás en ETIQUETA_OTROS.
+        """
+        maximo = self.configuracion_graficos.get("max_categorias", self.MAX_CATEGORIAS)
+        totales = datos.groupby(columna, sort=False)[valor].sum().sort_values(ascending=False)
+        if len(totales) > maximo:
+            principales = totales.index[:maximo]
+            datos = datos.assign(**{columna: datos[columna].where(datos[columna].isin(principales),
+                                                                  self.ETIQUETA_OTROS)})
+            datos = datos.groupby(grano, as_index=False, sort=False)[valor].sum()
+            orden = list(principales) + [self.ETIQUETA_OTROS]
+        else:
+            orden = list(totales.index)
+        return datos, orden
+
+    @Instrumentador.medir("plot", filas_entrada=lambda self: len(self.datos_analizados))
+    @_memorizar_figura
     def graficar_tendencias_inscripcion(self):
         """
         Genera un gráfico de líneas para mostrar las tendencias de inscripción por programa y año.
 
+        Los datos se suman por año y programa; si hay más programas que max_categorias, el
+        resto se agrupa en "Otros", y con más de umbral_webgl puntos se usa WebGL. Mientras
+        los datos no cambien se devuelve la misma figura, que debe tratarse como de solo lectura.
+
         Devuelve
         -------
         fig : plotly.graph_objs._figure.Figure or None
             Objeto de la figura de Plotly o None si faltan columnas necesarias.
         """
-        if 'anio' not in self.datos_analizados or 'inscritos' not in self.datos_analizados or 'programa' not in self.datos_analizados:
+        datos = self._datos(["anio", "programa", "inscritos"])
+        if datos is None:
             print("Advertencia: Faltan columnas necesarias para la gráfica.")
             return None
 
         # Agrupar datos por año y programa
-        datos_agrupados = self.datos_analizados.groupby(['anio', 'programa'], as_index=False)['inscritos'].sum()
+        datos_agrupados = self._agregar(datos, ["anio", "programa"], "inscritos")
+        datos_agrupados, orden = self._limitar_categorias(datos_agrupados, "programa", "inscritos",
+                                                          ["anio", "programa"])
+        datos_agrupados = datos_agrupados.sort_values("anio")
+        umbral = self.configuracion_graficos.get("umbral_webgl", self.UMBRAL_WEBGL)
 
         # Crear la gráfica
         fig = px.line(
@@ -53,52 +265,78 @@ class Visualizador:
             x="anio",
             y="inscritos",
             color="programa",  # Esto genera una línea por programa
+            category_orders={"programa": orden},
+            render_mode="webgl" if len(datos_agrupados) > umbral else "svg",
             title="Tendencias de Inscripción por Programa y Año",
             labels={"anio": "Año", "inscritos": "Número de Inscritos", "programa": "Programa"}
         )
         return fig
 
+    @Instrumentador.medir("plot", filas_entrada=lambda self: len(self.datos_analizados))
+    @_memorizar_figura
     def graficar_comparacion_genero(self):
         """
         Genera un gráfico de barras para comparar el número de graduados por programa.
 
+        Se dibuja una barra por programa (con más de max_categorias el resto se agrupa en
+        "Otros"); si los datos tienen la columna sexo, cada barra se divide por sexo.
+
         Devuelve
         -------
         fig : plotly.graph_objs._figure.Figure or None
             Objeto de la figura de Plotly o None si faltan columnas necesarias.
         """
-        if "programa" not in self.datos_analizados.columns or "graduados" not in self.datos_analizados.columns:
+        datos = self._datos(["programa", "graduados"])
+        if datos is None:
             print("Advertencia: Las columnas necesarias para la gráfica no están disponibles.")
             return None
 
+        grano = ["programa"]
+        if "sexo" in self.datos_analizados.columns:
+            datos["sexo"] = self.datos_analizados["sexo"]
+            grano.append("sexo")
+        datos_agrupados = self._agregar(datos, grano, "graduados")
+        datos_agrupados, orden = self._limitar_categorias(datos_agrupados, "programa", "graduados", grano)
+
         fig = px.bar(
-            self.datos_analizados,
+            datos_agrupados,
             x="programa",
             y="graduados",
+            color="sexo" if "sexo" in grano else None,
+            category_orders={"programa": orden},
             title="Comparación de Graduados por Programa",
-            labels={"programa": "Programa", "graduados": "Número de Graduados"}
+            labels={"programa": "Programa", "graduados": "Número de Graduados", "sexo": "Sexo"}
         )
         return fig
 
+    @Instrumentador.medir("plot", filas_entrada=lambda self: len(self.datos_analizados))
+    @_memorizar_figura
     def graficar_comparacion_modalidad(self):
         """
         Genera un gráfico de barras para comparar el número de graduados por modalidad (virtual/presencial).
 
+        Se dibuja una barra por modalidad con los graduados sumados.
+
         Devuelve
         -------
         fig : plotly.graph_objs._figure.Figure or None
             Objeto de la figura de Plotly o None si faltan columnas necesarias.
         """
-        if "modalidad" not in self.datos_analizados.columns or "graduados" not in self.datos_analizados.columns:
+        datos = self._datos(["modalidad", "graduados"])
+        if datos is None:
             print("Advertencia: Las columnas necesarias para la gráfica no están disponibles.")
             return None
 
+        datos_agrupados = self._agregar(datos, ["modalidad"], "graduados")
+        datos_agrupados, orden = self._limitar_categorias(datos_agrupados, "modalidad", "graduados", ["modalidad"])
+
         fig = px.bar(
-            self.datos_analizados,
+            datos_agrupados,
             x="modalidad",
             y="graduados",
             color="modalidad",
+            category_orders={"modalidad": orden},
             title="Comparación de Graduados por Modalidad (Virtual/Presencial)",
             labels={"modalidad": "Modalidad", "graduados": "Número de Graduados"}
         )
-        return fig
\ No newline at end of file
+        return fig